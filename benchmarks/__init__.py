@@ -0,0 +1 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
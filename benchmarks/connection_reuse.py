@@ -0,0 +1,77 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+"""Benchmark of connection reuse by `YahooAuction.session`.
+
+Usage::
+
+    $ python -m benchmarks.connection_reuse [--requests N]
+
+Requests are sent to a local keep-alive HTTP server, once with module-level
+`requests.get` and once through `YahooAuction.session`. The number of TCP
+connections the server accepted and the elapsed time are reported.
+"""
+import argparse
+import http.server
+import threading
+import time
+import typing as t
+
+import requests
+
+from yahoo_auction_auto import yahoo_auction
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self) -> None:
+        super().setup()
+        with self.lock:
+            type(self).connections += 1
+
+    def do_GET(self) -> None:
+        body = b"<html></html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: t.Any) -> None:
+        pass
+
+
+def measure(get: t.Callable[[str], requests.Response], url: str, n: int) -> tuple[int, float]:
+    """Send `n` requests with `get` and return (connections, seconds)."""
+    _Handler.connections = 0
+    start = time.perf_counter()
+    for _ in range(n):
+        get(url).raise_for_status()
+    return _Handler.connections, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="the number of requests")
+    args = parser.parse_args()
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/"
+    try:
+        with yahoo_auction.YahooAuction() as yah:
+            getters: list[tuple[str, t.Callable[[str], requests.Response]]] = [
+                ("requests.get", requests.get),
+                ("YahooAuction.session", yah.session.get),
+            ]
+            for name, get in getters:
+                connections, seconds = measure(get, url, args.requests)
+                print(f"{name:<24} connections={connections:<5} {seconds * 1000 / args.requests:.3f} ms/request")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+"""Benchmark of the time to import `yahoo_auction_auto`.
+
+Usage::
+
+    $ python -m benchmarks.importtime [--repeat N] [--top N] [--max-ms MS]
+
+`python -X importtime -c "import yahoo_auction_auto"` is run in fresh
+interpreters. The best cumulative time of the package and its slowest
+imports are reported. It exits with status 1 if Selenium is imported or
+the time exceeds `--max-ms`, so that it can guard against regressions.
+"""
+import argparse
+import re
+import subprocess
+import sys
+
+
+PACKAGE = "yahoo_auction_auto"
+FORBIDDEN = ("selenium", "chromedriver_binary")
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def importtime() -> dict[str, int]:
+    """Get the cumulative import time of each module in microsecond."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {PACKAGE}"],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if match := _LINE.match(line):
+            times[match[4]] = int(match[2])
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="the number of runs")
+    parser.add_argument("--top", type=int, default=10, help="the number of slowest imports to show")
+    parser.add_argument("--max-ms", type=float, default=None, help="the maximum import time in millisecond")
+    args = parser.parse_args()
+    runs = [importtime() for _ in range(args.repeat)]
+    best = min(runs, key=lambda times: times[PACKAGE])
+    total_ms = best[PACKAGE] / 1000
+    print(f"{PACKAGE}: {total_ms:.1f} ms (best of {args.repeat})")
+    for module, us in sorted(best.items(), key=lambda item: -item[1])[1:args.top + 1]:
+        print(f"  {module:<40} {us / 1000:8.1f} ms")
+    status = 0
+    if forbidden := sorted(module for module in best if module.split(".")[0] in FORBIDDEN):
+        print(f"Imported eagerly: {', '.join(forbidden)}")
+        status = 1
+    if args.max_ms is not None and total_ms > args.max_ms:
+        print(f"Import time exceeds {args.max_ms} ms")
+        status = 1
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+"""Micro-benchmarks of parsing Yahoo!Auction pages.
+
+Usage::
+
+    $ python -m benchmarks.parsing [--scales 1,10,100] [--repeat N] [--json FILE]
+    $ python -m benchmarks.parsing --compare BASE.json NEW.json
+
+The corpus is the recorded item page `tests/info/test_selling.html` and
+listing page `tests/test_mystatus_selling.html`, and synthetic pages scaled
+from them: item pages padded with description blocks and listing pages
+with rows repeated. For each parser backend it reports per-field
+extraction time, whole-page parse time, peak memory and pages/sec.
+
+Peak memory is of Python allocations traced by `tracemalloc`, so the C
+allocations of libxml2 are not included. Run it from the repository root.
+Results saved with `--json` on two commits can be compared with `--compare`.
+"""
+import argparse
+import functools
+import json
+import statistics
+import time
+import tracemalloc
+import typing as t
+
+import bs4
+
+from yahoo_auction_auto import parsing, yahoo_auction
+from yahoo_auction_auto.info import extraction, selling
+
+
+ITEM_PAGE = "tests/info/test_selling.html"
+LISTING_PAGE = "tests/test_mystatus_selling.html"
+
+_DESCRIPTION = (
+    '<div class="ProductExplanation__commentBody">'
+    '<p>説明文 description of the item.</p>'
+    '<table><tr><td>状態</td><td>中古</td></tr><tr><td>サイズ</td><td>M</td></tr></table>'
+    '<img src="https://auctions.c.yimg.jp/images.auctions.yahoo.co.jp/image/x.jpg" alt="image">'
+    '</div>\n'
+)
+_ROW_START = '<tr class="ItemTable__row">'
+_ROW_END = '</tr>'
+
+Result = dict[str, float]
+Results = dict[str, Result]
+
+
+def load(filename: str) -> bytes:
+    with open(filename, "rb") as f:
+        return f.read()
+
+
+def scale_item_page(content: bytes, scale: int) -> bytes:
+    """Pad an item page with `scale - 1` description blocks before the closing body."""
+    padding = (_DESCRIPTION * (scale - 1)).encode("utf-8")
+    return content.replace(b"</body>", padding + b"</body>")
+
+
+def scale_listing_page(content: bytes, scale: int) -> bytes:
+    """Repeat the rows of a listing page `scale` times."""
+    text = content.decode("utf-8")
+    start = text.index(_ROW_START)
+    end = text.rindex(_ROW_END) + len(_ROW_END)
+    return (text[:start] + text[start:end] * scale + text[end:]).encode("utf-8")
+
+
+def measure(func: t.Callable[[], object], repeat: int) -> Result:
+    """Measure time and peak memory of `func`.
+
+    Returns
+    -------
+    dict[str, float]
+        The median and minimum seconds, pages/sec from the median,
+        and the peak memory in byte.
+    """
+    func()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    median = statistics.median(times)
+    return {"median": median, "min": min(times), "pages_per_sec": 1 / median, "peak_bytes": float(peak)}
+
+
+def field_extractors(
+    content: bytes
+) -> dict[str, dict[str, t.Callable[[], object]]]:
+    """Get per-field extractors on pre-parsed trees of `content` for each backend.
+
+    The extractors are the field tables `InfoSelling.fromhtml` uses: the
+    bs4 ones read the index built in one walk of the soup, which is timed
+    as "(index)", and the lxml ones run the precompiled XPath on the tree.
+    """
+    soup = bs4.BeautifulSoup(content, "lxml")
+    index = extraction.index(soup)
+    tree = parsing.fromstring(content)
+    return {
+        "bs4": {
+            **{name: functools.partial(field.soup, index) for name, field in selling._FIELDS.items()},
+            "(index)": lambda: extraction.index(soup),
+        },
+        "lxml": {name: functools.partial(field.tree, tree) for name, field in selling._FIELDS.items()},
+    }
+
+
+def run(scales: list[int], repeat: int) -> Results:
+    """Run all benchmarks and get results keyed by benchmark name."""
+    results: Results = {}
+    item_page = load(ITEM_PAGE)
+    listing_page = load(LISTING_PAGE)
+    for parser, extractors in field_extractors(item_page).items():
+        for field, extractor in extractors.items():
+            results[f"field/{parser}/{field}"] = measure(extractor, repeat)
+    pattern = r"^rsec:itm;slk:tc;"
+    for scale in scales:
+        item = scale_item_page(item_page, scale)
+        listing = scale_listing_page(listing_page, scale)
+        for parser in parsing.PARSERS:
+            results[f"item/{parser}/x{scale}"] = measure(lambda: selling.InfoSelling.fromhtml(item, parser), repeat)
+            results[f"listing/{parser}/x{scale}"] = measure(
+                lambda: yahoo_auction._parse_listing(listing, pattern, parser), repeat
+            )
+        soup = bs4.BeautifulSoup(listing, "lxml")
+        tree = parsing.fromstring(listing)
+        results[f"next_page/bs4/x{scale}"] = measure(lambda: yahoo_auction._get_next_page(soup), repeat)
+        results[f"next_page/lxml/x{scale}"] = measure(lambda: yahoo_auction._get_next_page_tree(tree), repeat)
+    return results
+
+
+def report(results: Results) -> None:
+    print(f"{'benchmark':<36} {'median ms':>10} {'min ms':>10} {'pages/s':>10} {'peak KiB':>10}")
+    for name, result in results.items():
+        print(
+            f"{name:<36} {result['median'] * 1000:>10.3f} {result['min'] * 1000:>10.3f}"
+            f" {result['pages_per_sec']:>10.1f} {result['peak_bytes'] / 1024:>10.1f}"
+        )
+
+
+def compare(base: Results, new: Results) -> None:
+    """Print the ratio of the median time and peak memory of `new` to `base`."""
+    print(f"{'benchmark':<36} {'base ms':>10} {'new ms':>10} {'time':>8} {'memory':>8}")
+    for name in (name for name in base if name in new):
+        b, n = base[name], new[name]
+        print(
+            f"{name:<36} {b['median'] * 1000:>10.3f} {n['median'] * 1000:>10.3f}"
+            f" {n['median'] / b['median']:>7.2f}x {n['peak_bytes'] / max(b['peak_bytes'], 1):>7.2f}x"
+        )
+
+
+def load_results(filename: str) -> Results:
+    with open(filename) as f:
+        results: Results = json.load(f)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default="1,10,100", help="comma-separated scales of synthetic pages")
+    parser.add_argument("--repeat", type=int, default=20, help="the number of runs per benchmark")
+    parser.add_argument("--json", help="save results to the file")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="compare two saved results")
+    args = parser.parse_args()
+    if args.compare:
+        base, new = (load_results(filename) for filename in args.compare)
+        compare(base, new)
+        return
+    results = run([int(scale) for scale in args.scales.split(",")], args.repeat)
+    report(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+"""Benchmark of parsing item pages in a process pool.
+
+Usage::
+
+    $ python -m benchmarks.pipeline [--items N] [--scale N] [--processes 1,2,4] [--max-workers N]
+
+Item pages scaled from `tests/info/test_selling.html` are served by a local
+HTTP server and fetched by `YahooAuction.get_info_selling_many`, once parsed
+in the fetching threads and once per number of processes in a
+`ProcessPoolExecutor`. Pages/sec of each run is reported. Run it from the
+repository root.
+"""
+import argparse
+import concurrent.futures
+import http.server
+import threading
+import time
+import typing as t
+from unittest import mock
+
+from yahoo_auction_auto import yahoo_auction
+from benchmarks import parsing
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    body = b""
+
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format: str, *args: t.Any) -> None:
+        pass
+
+
+def measure(yah: yahoo_auction.YahooAuction, n: int) -> float:
+    """Get `n` items and return pages/sec."""
+    start = time.perf_counter()
+    for aID, result in yah.get_info_selling_many(str(i) for i in range(n)):
+        if isinstance(result, Exception):
+            raise result
+    return n / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=200, help="the number of items to get")
+    parser.add_argument("--scale", type=int, default=10, help="the scale of synthetic item pages")
+    parser.add_argument("--processes", default="1,2,4", help="comma-separated numbers of processes")
+    parser.add_argument("--max-workers", type=int, default=16, help="the number of fetching threads")
+    args = parser.parse_args()
+    _Handler.body = parsing.scale_item_page(parsing.load(parsing.ITEM_PAGE), args.scale)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/"
+    try:
+        with mock.patch("yahoo_auction_auto.urls.get_auction_url", lambda aID: url + aID):
+            with yahoo_auction.YahooAuction(max_workers=args.max_workers, pool_maxsize=args.max_workers) as yah:
+                print(f"{'threads':<12} {measure(yah, args.items):8.1f} pages/sec")
+            for processes in map(int, args.processes.split(",")):
+                with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+                    with yahoo_auction.YahooAuction(
+                        max_workers=args.max_workers,
+                        pool_maxsize=args.max_workers,
+                        parse_executor=executor
+                    ) as yah:
+                        print(f"{f'processes={processes}':<12} {measure(yah, args.items):8.1f} pages/sec")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+"""Benchmark of parsing item pages while streaming them.
+
+Usage::
+
+    $ python -m benchmarks.streaming [--scales 1,10,100] [--requests N] [--chunk-size N] [--bandwidth N]
+
+Item pages scaled from `tests/info/test_selling.html` are served by a local
+HTTP server, plain and gzip-compressed. Each page is fetched whole and
+parsed by `InfoSelling.fromhtml`, and streamed into `InfoSelling.fromchunks`
+which stops reading once all fields are found. Bytes read from the wire
+and milliseconds per page are reported. Run it from the repository root.
+
+Pages are served at full speed of the loopback, where the download costs
+almost nothing, and then at `--bandwidth` bytes per second, where the
+time saved by not downloading the rest of a large page shows.
+"""
+import argparse
+import gzip
+import http.server
+import statistics
+import threading
+import time
+import typing as t
+
+import requests
+
+from yahoo_auction_auto import info
+from benchmarks import parsing
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    pages: dict[str, tuple[bytes, dict[str, str]]] = {}
+    bandwidth: dict[str, int] = {}
+
+    def handle(self) -> None:
+        try:
+            super().handle()
+        except ConnectionError:
+            # The client closed the connection after reading all fields.
+            pass
+
+    def do_GET(self) -> None:
+        body, headers = self.pages[self.path]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        if (bandwidth := self.bandwidth.get(self.path)) is None:
+            self.wfile.write(body)
+            return
+        size = max(bandwidth // 1000, 1)
+        for i in range(0, len(body), size):
+            # Each slice arrives after the time to transmit it at `bandwidth`.
+            time.sleep(len(body[i:i + size]) / bandwidth)
+            self.wfile.write(body[i:i + size])
+
+    def log_message(self, format: str, *args: t.Any) -> None:
+        pass
+
+
+def fetch_whole(session: requests.Session, url: str, chunk_size: int) -> int:
+    response = session.get(url)
+    info.InfoSelling.fromhtml(response.content)
+    return int(response.raw.tell())
+
+
+def fetch_streaming(session: requests.Session, url: str, chunk_size: int) -> int:
+    with session.get(url, stream=True) as response:
+        info.InfoSelling.fromchunks(response.iter_content(chunk_size))
+        return int(response.raw.tell())
+
+
+def measure(
+    fetch: t.Callable[[requests.Session, str, int], int],
+    url: str,
+    n: int,
+    chunk_size: int
+) -> tuple[int, float]:
+    """Fetch `url` `n` times and return (bytes read, median milliseconds) per page."""
+    times = []
+    read = 0
+    with requests.Session() as session:
+        for _ in range(n):
+            start = time.perf_counter()
+            read = fetch(session, url, chunk_size)
+            times.append((time.perf_counter() - start) * 1000)
+    return read, statistics.median(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default="1,10,100", help="comma-separated scales of synthetic item pages")
+    parser.add_argument("--requests", type=int, default=50, help="the number of requests per benchmark")
+    parser.add_argument("--chunk-size", type=int, default=8192, help="the size of chunks to stream")
+    parser.add_argument("--bandwidth", type=int, default=1_000_000, help="bytes per second of the throttled server")
+    args = parser.parse_args()
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    item = parsing.load(parsing.ITEM_PAGE)
+    try:
+        print(
+            f"{'page':<12} {'encoding':<9} {'bandwidth':>10} {'size':>9}"
+            f" {'whole':>20} {'streaming':>20} {'saved':>16}"
+        )
+        for bandwidth in (None, args.bandwidth):
+            for scale in map(int, args.scales.split(",")):
+                body = parsing.scale_item_page(item, scale)
+                pages = {"identity": (body, {}), "gzip": (gzip.compress(body), {"Content-Encoding": "gzip"})}
+                for encoding, page in pages.items():
+                    path = f"/{scale}/{encoding}/{bandwidth}"
+                    _Handler.pages[path] = page
+                    if bandwidth is not None:
+                        _Handler.bandwidth[path] = bandwidth
+                    url = f"http://127.0.0.1:{server.server_port}{path}"
+                    whole, whole_ms = measure(fetch_whole, url, args.requests, args.chunk_size)
+                    streamed, streamed_ms = measure(fetch_streaming, url, args.requests, args.chunk_size)
+                    print(
+                        f"{f'scale={scale}':<12} {encoding:<9} {bandwidth or '-':>10} {len(body):>9}"
+                        f" {whole:>9} B {whole_ms:>6.2f} ms"
+                        f" {streamed:>9} B {streamed_ms:>6.2f} ms"
+                        f" {whole - streamed:>7} B {whole_ms - streamed_ms:>5.2f} ms"
+                    )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+"""Stand-in of clocks for tests."""
+
+
+class FakeClock:
+    """Clock which stands still until `now` is set or `sleep` is called."""
+
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
@@ -0,0 +1,41 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+"""Stand-in of Chrome driver for tests."""
+import typing as t
+
+
+class FakeElement:
+
+    def __init__(self, driver: "FakeDriver") -> None:
+        self.driver = driver
+
+    def click(self) -> None:
+        self.driver.current_url = self.driver.current_url + "&done=1"
+
+
+class FakeDriver:
+    """Chrome driver which navigates without a browser.
+
+    `find_element` fails on URLs containing one of `broken`.
+    """
+
+    def __init__(self, broken: t.Iterable[str] = ()) -> None:
+        self.current_url = "data:,"
+        self.cookies: list[dict[str, t.Any]] = []
+        self.visited: list[str] = []
+        self.broken = list(broken)
+        self.quitted = False
+
+    def get(self, url: str) -> None:
+        self.current_url = url
+        self.visited.append(url)
+
+    def add_cookie(self, cookie: dict[str, t.Any]) -> None:
+        self.cookies.append(cookie)
+
+    def find_element(self, by: str, value: str) -> FakeElement:
+        if any(broken in self.current_url for broken in self.broken):
+            raise LookupError(value)
+        return FakeElement(self)
+
+    def quit(self) -> None:
+        self.quitted = True
@@ -0,0 +1,124 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+from unittest import TestCase, skipUnless
+import csv
+import datetime
+import importlib.util
+import io
+import json
+import os
+import tempfile
+
+from yahoo_auction_auto.info import batch, selling
+
+
+def make_info(i: int) -> selling.InfoSelling:
+    return selling.InfoSelling(
+        aID=f"x{i}",
+        title=f"タイトル{i}",
+        seller_name="seller",
+        stock=1,
+        start_datetime=datetime.datetime(2022, 7, 1, 12),
+        end_datetime=datetime.datetime(2022, 7, 1 + i, 12, 30),
+        refundable=i % 2 == 0,
+        startprice="1,000円",
+        timeleft=f"{i}日",
+        count_bid=i,
+        count_access=i * 10,
+        count_watch=i % 3,
+    )
+
+
+class TestInfoSelling(TestCase):
+
+    def test_slots(self) -> None:
+        self.assertFalse(hasattr(make_info(0), "__dict__"))
+
+
+class TestInfoSellingBatch(TestCase):
+
+    def setUp(self) -> None:
+        self.infos = [make_info(i) for i in range(5)]
+        self.batch = batch.InfoSellingBatch(self.infos)
+
+    def test_roundtrip(self) -> None:
+        self.assertEqual(len(self.batch), 5)
+        self.assertEqual(list(self.batch), self.infos)
+        self.assertEqual(self.batch[2], self.infos[2])
+        self.assertEqual(list(self.batch.column("count_bid")), [0, 1, 2, 3, 4])
+
+    def test_filter(self) -> None:
+        active = self.batch.mask("count_bid", ">=", 2)
+        ending = self.batch.mask("end_datetime", "<", datetime.datetime(2022, 7, 5))
+        self.assertEqual([info.aID for info in self.batch.filter(batch.and_(active, ending))], ["x2", "x3"])
+        self.assertEqual(
+            [info.aID for info in self.batch.filter(batch.or_(self.batch.mask("aID", "==", "x0"), ending))],
+            ["x0", "x1", "x2", "x3"]
+        )
+        self.assertEqual(len(self.batch.filter(self.batch.mask("refundable", "==", True))), 3)
+
+    def test_aggregate(self) -> None:
+        self.assertEqual(self.batch.aggregate("count_access"), batch.Aggregate(5, 100, 0, 40, 20))
+        self.assertEqual(batch.InfoSellingBatch().aggregate("count_bid"), batch.Aggregate(0, 0, None, None, None))
+        with self.assertRaises(ValueError):
+            self.batch.aggregate("title")
+
+    def test_to_ndjson(self) -> None:
+        f = io.StringIO()
+        self.batch.to_ndjson(f)
+        lines = f.getvalue().splitlines()
+        self.assertEqual(len(lines), 5)
+        record = json.loads(lines[1])
+        self.assertEqual(record["title"], "タイトル1")
+        self.assertEqual(record["end_datetime"], "2022-07-02T12:30:00")
+        self.assertIs(record["refundable"], False)
+
+    def test_to_csv(self) -> None:
+        f = io.StringIO()
+        self.batch.to_csv(f)
+        f.seek(0)
+        rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[3]["count_access"], "30")
+        self.assertEqual(rows[3]["start_datetime"], "2022-07-01T12:00:00")
+
+    @skipUnless(importlib.util.find_spec("numpy"), "requires numpy")
+    def test_to_numpy(self) -> None:
+        columns = self.batch.to_numpy()
+        self.assertEqual(list(columns), [field for field in batch._FIELDS])
+        self.assertEqual(columns["count_access"].tolist(), [0, 10, 20, 30, 40])
+        self.assertEqual(columns["refundable"].tolist(), [True, False, True, False, True])
+        end = datetime.datetime(2022, 7, 2, 12, 30)
+        self.assertEqual(columns["end_datetime"][1], (end - batch._EPOCH).total_seconds())
+        self.assertEqual(columns["title"][1], "タイトル1")
+        with self.subTest("shared memory"):
+            self.batch.column("count_bid")[0] = 9
+            self.assertEqual(columns["count_bid"][0], 9)
+
+    @skipUnless(importlib.util.find_spec("numpy"), "requires numpy")
+    def test_append_exported(self) -> None:
+        columns = self.batch.to_numpy()
+        with self.assertRaises(BufferError):
+            self.batch.append(make_info(5))
+        self.assertEqual({len(self.batch.column(name)) for name in batch._FIELDS}, {5})
+        self.assertEqual(list(self.batch), self.infos)
+        del columns
+        self.batch.append(make_info(5))
+        self.assertEqual(self.batch[5], make_info(5))
+
+    @skipUnless(importlib.util.find_spec("pyarrow"), "requires pyarrow")
+    def test_to_arrow(self) -> None:
+        table = self.batch.to_arrow()
+        self.assertEqual(table.column_names, list(batch._FIELDS))
+        self.assertEqual(table.num_rows, 5)
+        self.assertEqual(table.column("count_access").to_pylist(), [0, 10, 20, 30, 40])
+        self.assertEqual(table.column("refundable").to_pylist(), [True, False, True, False, True])
+        self.assertEqual(table.column("end_datetime").to_pylist()[1], datetime.datetime(2022, 7, 2, 12, 30))
+        self.assertEqual(table.column("title").to_pylist()[1], "タイトル1")
+
+    @skipUnless(importlib.util.find_spec("pyarrow"), "requires pyarrow")
+    def test_to_parquet(self) -> None:
+        import pyarrow.parquet as pq
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "batch.parquet")
+            self.batch.to_parquet(path)
+            self.assertEqual(pq.read_table(path).to_pylist(), self.batch.to_arrow().to_pylist())
@@ -0,0 +1,38 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+from unittest import TestCase
+import datetime
+
+from yahoo_auction_auto import parsing
+from yahoo_auction_auto.info import closed_with_winner
+
+
+class TestInfoClosedWithWinner_fromhtml(TestCase):
+
+    def setUp(self) -> None:
+        with open("tests/info/test_closed_with_winner.html", "rb") as f:
+            self.content = f.read()
+
+    def test_fromhtml(self) -> None:
+        expected = closed_with_winner.InfoClosedWithWinner(
+            aID="10000000000",
+            title="title",
+            seller_name="seller_name",
+            start_datetime=datetime.datetime(2021, 10, 12, 19, 54),
+            end_datetime=datetime.datetime(2021, 10, 15, 19, 54),
+            startprice="10,000 円（税 0 円）",
+            price="12,000円",
+            winner_name="winner_name",
+            count_bid=1,
+            count_access=2,
+            count_watch=3,
+        )
+        for parser in parsing.PARSERS:
+            with self.subTest(parser):
+                self.assertEqual(closed_with_winner.InfoClosedWithWinner.fromhtml(self.content, parser), expected)
+
+    def test_empty(self) -> None:
+        for parser in parsing.PARSERS:
+            with self.subTest(parser):
+                info = closed_with_winner.InfoClosedWithWinner.fromhtml("", parser)
+                self.assertEqual((info.aID, info.price, info.winner_name), ("", "", ""))
+                self.assertEqual(info.end_datetime, datetime.datetime(1970, 1, 1))
@@ -0,0 +1,38 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+from unittest import TestCase
+
+import bs4
+
+from yahoo_auction_auto import parsing
+from yahoo_auction_auto.info import extraction
+
+
+CONTENT = (
+    '<html><head><meta charset="utf-8"></head><body><dl>'
+    "<dt>最高額入札者</dt>"
+    '<dd class="ProductDetail__description">：<a href="#">winner_name</a>'
+    '<span class="ProductDetail__rating">（評価<a href="#">120</a>）</span></dd>'
+    "<dt>個数</dt>"
+    '<dd class="Other">9</dd>'
+    '<dd class="ProductDetail__description">：1</dd>'
+    "</dl></body></html>"
+)
+
+
+class TestField(TestCase):
+
+    def test_detail(self) -> None:
+        fields = {
+            "winner_name": extraction.detail("最高額入札者", extraction.to_str, "", link=True),
+            "stock": extraction.detail("個数", extraction.to_int, 0),
+            "price": extraction.detail("落札価格", extraction.to_price, "", "Price__value"),
+        }
+        expected = {"winner_name": "winner_name", "stock": 1, "price": ""}
+        self.assertEqual(extraction.fromsoup(fields, bs4.BeautifulSoup(CONTENT, "lxml")), expected)
+        self.assertEqual(extraction.fromtree(fields, parsing.fromstring(CONTENT)), expected)
+        self.assertEqual(extraction.parse_chunks([CONTENT.encode()], fields), expected)
+
+    def test_target(self) -> None:
+        tag, matches = extraction.detail("個数", extraction.to_int, 0).target
+        tree = parsing.fromstring(CONTENT)
+        self.assertEqual([element.text_content() for element in tree.iter(tag) if matches(element)], ["：1"])
@@ -1,11 +1,14 @@
 # Copyright (c) 2022 Shuhei Nitta. All rights reserved.
 from unittest import TestCase
+import dataclasses
 import datetime
 import functools
+import typing as t
 
 import bs4
 
-from yahoo_auction_auto.info import selling
+from yahoo_auction_auto import parsing
+from yahoo_auction_auto.info import extraction, selling
 
 
 @functools.lru_cache(maxsize=32)
@@ -99,8 +102,8 @@ class TestInfoSelling_fromsoup(TestCase):
 
     def test_timeleft(self) -> None:
         with self.subTest(self.test_filename):
-            timeleft: str = selling._get_timeleft(self.soup)
-            self.assertEqual(timeleft, "19時間")
+            info = selling.InfoSelling.fromsoup(self.soup)
+            self.assertEqual(info.timeleft, "19時間")
         with self.subTest("empty"):
             info = selling.InfoSelling.fromsoup(self.soup_empty)
             self.assertEqual(info.timeleft, "")
@@ -128,3 +131,88 @@ class TestInfoSelling_fromsoup(TestCase):
         with self.subTest("empty"):
             info = selling.InfoSelling.fromsoup(self.soup_empty)
             self.assertEqual(info.count_watch, 0)
+
+
+class TestInfoSelling_fields(TestCase):
+
+    def setUp(self) -> None:
+        content = load_file("tests/info/test_selling.html")
+        self.index = extraction.index(bs4.BeautifulSoup(content, "lxml"))
+        self.tree = parsing.fromstring(content)
+        self.expected = selling.InfoSelling(
+            "10000000000", "title", "seller_name", 1,
+            datetime.datetime(2021, 10, 12, 19, 54),
+            datetime.datetime(2021, 10, 15, 19, 54),
+            True, "10,000 円（税 0 円）", "19時間", 1, 2, 3
+        )
+
+    def test_fields(self) -> None:
+        self.assertEqual(list(selling._FIELDS), [field.name for field in dataclasses.fields(selling.InfoSelling)])
+        for name, field in selling._FIELDS.items():
+            with self.subTest(name):
+                expected = getattr(self.expected, name)
+                self.assertEqual(field.soup(self.index), expected)
+                self.assertEqual(field.tree(self.tree), expected)
+                tag, matches = field.target
+                self.assertTrue(any(matches(element) for element in self.tree.iter(tag)))
+
+    def test_common_fields(self) -> None:
+        for name, field in extraction.COMMON_FIELDS.items():
+            with self.subTest(name):
+                self.assertIs(selling._FIELDS[name], field)
+
+
+class TestInfoSelling_fromhtml(TestCase):
+
+    def setUp(self) -> None:
+        self.test_filename = "tests/info/test_selling.html"
+        self.contents: dict[str, str | bytes] = {
+            self.test_filename: load_file(self.test_filename),
+            "bytes": load_file(self.test_filename).encode("utf-8"),
+            "empty": "",
+        }
+
+    def test_backends_agree(self) -> None:
+        for name, content in self.contents.items():
+            with self.subTest(name):
+                self.assertEqual(
+                    selling.InfoSelling.fromhtml(content, "lxml"),
+                    selling.InfoSelling.fromhtml(content, "bs4")
+                )
+
+    def test_fromtree(self) -> None:
+        tree = parsing.fromstring(load_file(self.test_filename))
+        soup = bs4.BeautifulSoup(load_file(self.test_filename), "lxml")
+        self.assertEqual(selling.InfoSelling.fromtree(tree), selling.InfoSelling.fromsoup(soup))
+
+    def test_unknown_parser(self) -> None:
+        with self.assertRaises(ValueError):
+            selling.InfoSelling.fromhtml("", "html5lib")  # type: ignore
+
+
+class TestInfoSelling_fromchunks(TestCase):
+
+    def setUp(self) -> None:
+        self.content = load_file("tests/info/test_selling.html").encode("utf-8")
+        self.read = 0
+
+    def chunks(self, content: bytes, size: int) -> t.Iterator[bytes]:
+        for i in range(0, len(content), size):
+            self.read = i + size
+            yield content[i:i + size]
+
+    def test_fromchunks(self) -> None:
+        expected = selling.InfoSelling.fromhtml(self.content)
+        for size in (1, 100, 4096, len(self.content)):
+            with self.subTest(size):
+                self.assertEqual(selling.InfoSelling.fromchunks(self.chunks(self.content, size)), expected)
+
+    def test_early_termination(self) -> None:
+        content = self.content.replace(b"</body>", b"<p>description</p>" * 10000 + b"</body>")
+        info = selling.InfoSelling.fromchunks(self.chunks(content, 1024))
+        self.assertEqual(info, selling.InfoSelling.fromhtml(self.content))
+        self.assertLess(self.read, len(self.content))
+
+    def test_empty(self) -> None:
+        self.assertEqual(selling.InfoSelling.fromchunks([]), selling.InfoSelling.fromhtml(""))
+        self.assertEqual(selling.InfoSelling.fromchunks([b"<html>"]), selling.InfoSelling.fromhtml("<html>"))
@@ -0,0 +1,47 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+from unittest import TestCase
+
+from yahoo_auction_auto import parsing
+from yahoo_auction_auto.info import summary
+
+
+PATTERN = r"^rsec:itm;slk:tc;"
+
+
+class Test_fromhtml(TestCase):
+
+    def setUp(self) -> None:
+        with open("tests/test_mystatus_selling.html", "rb") as f:
+            self.content = f.read()
+
+    def test_fromhtml(self) -> None:
+        for parser in parsing.PARSERS:
+            with self.subTest(parser):
+                self.assertEqual(summary.fromhtml(self.content, PATTERN, parser), [
+                    summary.InfoSummary(
+                        "x1000000001", "https://page.auctions.yahoo.co.jp/jp/auction/x1000000001",
+                        "title 1", "10,000 円", 1, "19 時間"
+                    ),
+                    summary.InfoSummary(
+                        "x1000000002", "https://page.auctions.yahoo.co.jp/jp/auction/x1000000002",
+                        "title 2", "1,500 円", 0, "2 日"
+                    ),
+                    summary.InfoSummary(
+                        "x1000000003", "https://page.auctions.yahoo.co.jp/jp/auction/x1000000003",
+                        "title 3", "300 円", 12, "45 分"
+                    ),
+                ])
+
+    def test_without_row(self) -> None:
+        content = '<a href="https://page.auctions.yahoo.co.jp/jp/auction/x0" data-ylk="rsec:itm;slk:tc;pos:1">t</a>'
+        for parser in parsing.PARSERS:
+            with self.subTest(parser):
+                self.assertEqual(
+                    summary.fromhtml(content, PATTERN, parser),
+                    [summary.InfoSummary("x0", "https://page.auctions.yahoo.co.jp/jp/auction/x0", "t", "", 0, "")]
+                )
+
+    def test_empty(self) -> None:
+        for parser in parsing.PARSERS:
+            with self.subTest(parser):
+                self.assertEqual(summary.fromhtml("", PATTERN, parser), [])
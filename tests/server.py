@@ -0,0 +1,111 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+"""Local stand-in HTTP server for tests."""
+import dataclasses
+import http.server
+import threading
+import types
+import typing as t
+from urllib import parse
+
+
+@dataclasses.dataclass(frozen=True)
+class Request:
+    method: str
+    path: str
+    """The path including the query."""
+    headers: dict[str, str]
+    body: bytes
+
+    @property
+    def query(self) -> dict[str, list[str]]:
+        return parse.parse_qs(parse.urlsplit(self.path).query)
+
+
+@dataclasses.dataclass()
+class Response:
+    status: int = 200
+    body: bytes = b""
+    headers: dict[str, str] = dataclasses.field(default_factory=dict)
+
+
+Route = t.Callable[[Request], Response]
+
+
+class LocalServer:
+    """HTTP server on localhost which answers with registered routes.
+
+    Routes are looked up by the path without the query.
+    Unknown paths are answered with 404.
+    """
+
+    def __init__(self) -> None:
+        self.routes: dict[str, Route] = {}
+        self.requests: list[Request] = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+
+    def route(self, path: str, response: Response | Route) -> None:
+        """Register `response` for `path`."""
+        if isinstance(response, Response):
+            fixed = response
+            self.routes[path] = lambda _: fixed
+        else:
+            self.routes[path] = response
+
+    def url(self, path: str = "/") -> str:
+        return f"http://127.0.0.1:{self._server.server_port}{path}"
+
+    def __enter__(self) -> "LocalServer":
+        self._thread.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: types.TracebackType | None
+    ) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self) -> type[http.server.BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self) -> None:
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def handle_request(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                request = Request(
+                    self.command,
+                    self.path,
+                    {key: value for key, value in self.headers.items()},
+                    self.rfile.read(length) if length else b""
+                )
+                with server._lock:
+                    server.requests.append(request)
+                route = server.routes.get(parse.urlsplit(self.path).path)
+                response = route(request) if route else Response(404)
+                self.send_response(response.status)
+                for key, value in response.headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(response.body)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(response.body)
+
+            do_GET = do_POST = do_HEAD = handle_request
+
+            def log_message(self, format: str, *args: t.Any) -> None:
+                pass
+
+        return Handler
@@ -0,0 +1,48 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+from unittest import TestCase
+
+from yahoo_auction_auto import cache
+from tests import fakeclock
+
+
+class TestTTLCache(TestCase):
+
+    def setUp(self) -> None:
+        self.clock = fakeclock.FakeClock()
+        self.cache: cache.TTLCache[str, int] = cache.TTLCache(self.clock)
+        self.calls = 0
+
+    def factory(self) -> int:
+        self.calls += 1
+        return self.calls
+
+    def test_hit(self) -> None:
+        self.assertEqual(self.cache.get_or_set("key", self.factory, 10), 1)
+        self.clock.now = 9.9
+        self.assertEqual(self.cache.get_or_set("key", self.factory, 10), 1)
+        self.assertEqual(self.cache.stats, cache.CacheStats(hits=1, misses=1))
+
+    def test_expire(self) -> None:
+        self.cache.get_or_set("key", self.factory, 10)
+        self.clock.now = 10
+        self.assertEqual(self.cache.get_or_set("key", self.factory, 10), 2)
+        self.assertEqual(self.cache.stats, cache.CacheStats(hits=0, misses=2))
+
+    def test_invalidate(self) -> None:
+        self.cache.get_or_set("a", self.factory, 10)
+        self.cache.get_or_set("b", self.factory, 10)
+        with self.subTest("key"):
+            self.cache.invalidate("a")
+            self.assertEqual(self.cache.get_or_set("a", self.factory, 10), 3)
+            self.assertEqual(self.cache.get_or_set("b", self.factory, 10), 2)
+        with self.subTest("all"):
+            self.cache.invalidate()
+            self.assertEqual(self.cache.get_or_set("b", self.factory, 10), 4)
+        self.assertEqual(self.cache.stats.invalidations, 3)
+
+    def test_invalidate_while_computing(self) -> None:
+        def factory() -> int:
+            self.cache.invalidate()
+            return 0
+        self.assertEqual(self.cache.get_or_set("key", factory, 10), 0)
+        self.assertEqual(self.cache.get_or_set("key", self.factory, 10), 1)
@@ -0,0 +1,100 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+from unittest import TestCase, mock
+import contextlib
+import csv
+import io
+import json
+import os
+import tempfile
+
+from yahoo_auction_auto import cli, cookie
+from tests import server
+from tests.test_yahoo_auction import make_listing_page
+
+
+class TestMain(TestCase):
+
+    def setUp(self) -> None:
+        self.server = server.LocalServer().__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        with open("tests/info/test_selling.html", "rb") as f:
+            self.body = f.read()
+        self.aIDs = [f"x{i}" for i in range(5)]
+        self.server.route("/selling", server.Response(body=make_listing_page(self.aIDs[:3], self.server.url("/p2"))))
+        self.server.route("/p2", server.Response(body=make_listing_page(self.aIDs[3:], None)))
+        for aID in self.aIDs:
+            self.server.route(f"/jp/auction/{aID}", server.Response(body=self.body))
+        self.server.route("/jp/auction/bad", server.Response(404))
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.cookies = os.path.join(tmpdir.name, "cookies.json")
+        cookie.CookieStore(self.cookies).save("username", [{"name": "B", "value": "b"}])
+        targets = [
+            ("urls.SELLING", self.server.url("/selling")),
+            ("urls.get_auction_url", lambda aID: self.server.url(f"/jp/auction/{aID}")),
+        ]
+        for target, new in targets:
+            patcher = mock.patch(f"yahoo_auction_auto.{target}", new)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def run_main(self, *argv: str, stdin: str = "", accounts: str = "") -> tuple[int, str]:
+        stdout = io.StringIO()
+        options = [arg for name in accounts for arg in ("--account", f"{name}={self.cookies}")]
+        with contextlib.redirect_stdout(stdout), mock.patch("sys.stdin", io.StringIO(stdin)):
+            status = cli.main([*(options or ["--cookies", self.cookies]), "--max-workers", "2", *argv])
+        return status, stdout.getvalue()
+
+    def test_list(self) -> None:
+        self.assertEqual(self.run_main("list"), (0, "".join(f"{aID}\n" for aID in self.aIDs)))
+        _, output = self.run_main("list", "--format", "ndjson")
+        self.assertEqual(json.loads(output.splitlines()[0]), {"aID": "x0", "category": "selling"})
+        _, output = self.run_main("list", "--format", "summary")
+        self.assertEqual(json.loads(output.splitlines()[4])["title"], "x4")
+
+    def test_dump(self) -> None:
+        with self.subTest("ndjson"):
+            status, output = self.run_main("dump", "--ordered")
+            self.assertEqual(status, 0)
+            records = [json.loads(line) for line in output.splitlines()]
+            self.assertEqual(len(records), 5)
+            self.assertEqual(records[0]["aID"], "10000000000")
+        with self.subTest("csv"):
+            status, output = self.run_main("dump", "--format", "csv", "x0", "x1")
+            self.assertEqual(status, 0)
+            self.assertEqual(len(list(csv.DictReader(io.StringIO(output)))), 2)
+        with self.subTest("closed"):
+            with open("tests/info/test_closed_with_winner.html", "rb") as f:
+                self.server.route("/jp/auction/c0", server.Response(body=f.read()))
+            status, output = self.run_main("dump", "--category", "closed_with_winner", "--format", "csv", "c0")
+            row, = csv.DictReader(io.StringIO(output))
+            self.assertEqual((row["price"], row["winner_name"]), ("12,000円", "winner_name"))
+        with self.subTest("processes"):
+            status, output = self.run_main("--processes", "2", "dump", "x0", "x1")
+            self.assertEqual(status, 0)
+            self.assertEqual(len(output.splitlines()), 2)
+        with self.subTest("stdin"):
+            with self.assertLogs("yahoo_auction_auto.cli", "WARNING"):
+                status, output = self.run_main("dump", "-", stdin="x0\nbad\n\nx1\n")
+            self.assertEqual(status, 1)
+            self.assertEqual(len(output.splitlines()), 2)
+
+    def test_accounts(self) -> None:
+        with self.subTest("list"):
+            status, output = self.run_main("list", accounts="ab")
+            self.assertEqual(status, 0)
+            expected = [f"{name}\t{aID}" for name in "ab" for aID in self.aIDs]
+            self.assertEqual(sorted(output.splitlines()), expected)
+        with self.subTest("shard"):
+            status, output = self.run_main("--shard", "1/2", "dump", accounts="abc")
+            self.assertEqual(status, 0)
+            records = [json.loads(line) for line in output.splitlines()]
+            self.assertEqual(len(records), 5)
+            self.assertEqual({record["account"] for record in records}, {"b"})
+        with self.subTest("csv"):
+            status, output = self.run_main("dump", "--format", "csv", accounts="a")
+            self.assertEqual([row["account"] for row in csv.DictReader(io.StringIO(output))], ["a"] * 5)
+        invalid = [(("--shard", "0/2", "list"), ""), (("--shard", "2/2", "list"), "ab"), (("dump", "x0"), "ab")]
+        for argv, accounts in invalid:
+            with self.subTest(argv=argv), contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+                self.run_main(*argv, accounts=accounts)
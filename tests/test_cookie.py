@@ -0,0 +1,57 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+from unittest import TestCase, mock
+import os
+import stat
+import tempfile
+
+from yahoo_auction_auto import cookie
+
+
+NOW = 1634000000.0
+
+
+class TestCookieStore(TestCase):
+
+    def setUp(self) -> None:
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, "cookies.json")
+        self.now = NOW
+        self.store = cookie.CookieStore(self.path, margin=60, clock=lambda: self.now)
+        self.cookies: list[cookie.Cookie] = [
+            {"name": "B", "value": "b", "domain": ".yahoo.co.jp", "expiry": int(NOW) + 3600},
+            {"name": "T", "value": "t", "domain": ".yahoo.co.jp"},
+        ]
+
+    def test_roundtrip(self) -> None:
+        self.store.save("username", self.cookies)
+        self.assertEqual(self.store.load(), ("username", self.cookies))
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+
+    def test_expired(self) -> None:
+        self.store.save("username", self.cookies)
+        self.now = NOW + 3600 - 60
+        self.assertIsNone(self.store.load())
+
+    def test_missing(self) -> None:
+        self.assertIsNone(self.store.load())
+        with open(self.path, "w") as f:
+            f.write("{")
+        self.assertIsNone(self.store.load())
+        self.store.clear()
+        self.assertFalse(os.path.exists(self.path))
+
+
+class Test_get_username_and_cookies(TestCase):
+
+    def test_reuse(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            store = cookie.CookieStore(os.path.join(directory, "cookies.json"))
+            store.save("username", [{"name": "B", "value": "b"}])
+            with mock.patch("yahoo_auction_auto.webdriver.chrome") as chrome:
+                self.assertEqual(
+                    cookie.get_username_and_cookies(store=store),
+                    ("username", [{"name": "B", "value": "b"}])
+                )
+                self.assertEqual(cookie.get_cookies(store=store), [{"name": "B", "value": "b"}])
+            chrome.assert_not_called()
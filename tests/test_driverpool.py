@@ -0,0 +1,104 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+from unittest import TestCase, mock
+import threading
+import time
+import typing as t
+
+from yahoo_auction_auto import driverpool, urls
+from tests import fakedriver
+
+
+class TestDriverPool(TestCase):
+
+    def setUp(self) -> None:
+        self.drivers: list[fakedriver.FakeDriver] = []
+
+        def start_chrome(options: t.Any) -> fakedriver.FakeDriver:
+            driver = fakedriver.FakeDriver()
+            self.drivers.append(driver)
+            return driver
+        for target, new in [("start_chrome", start_chrome), ("ChromeOptions", mock.Mock())]:
+            patcher = mock.patch(f"yahoo_auction_auto.webdriver.{target}", new)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.cookies = [{"name": "B", "value": "b"}]
+
+    def test_login(self) -> None:
+        with driverpool.DriverPool(self.cookies) as pool:
+            with pool.acquire() as driver:
+                self.assertEqual(driver.visited, [urls.HOME])  # type: ignore
+                self.assertEqual(driver.cookies, self.cookies)  # type: ignore
+
+    def test_reuse(self) -> None:
+        with driverpool.DriverPool(self.cookies, size=2) as pool:
+            for _ in range(3):
+                with pool.acquire():
+                    pass
+            self.assertEqual(len(self.drivers), 1)
+        self.assertTrue(self.drivers[0].quitted)
+
+    def test_max_uses(self) -> None:
+        with driverpool.DriverPool(self.cookies, size=1, max_uses=2) as pool:
+            for _ in range(5):
+                with pool.acquire():
+                    pass
+        self.assertEqual(len(self.drivers), 3)
+        self.assertTrue(all(driver.quitted for driver in self.drivers))
+
+    def test_crash(self) -> None:
+        with driverpool.DriverPool(self.cookies, size=1) as pool:
+            with self.assertRaises(RuntimeError):
+                with pool.acquire():
+                    raise RuntimeError()
+            self.assertTrue(self.drivers[0].quitted)
+            self.assertEqual(pool.started, 0)
+            with pool.acquire() as driver:
+                self.assertIs(driver, self.drivers[1])
+
+    def test_unhealthy(self) -> None:
+        with driverpool.DriverPool(self.cookies, size=1) as pool:
+            with pool.acquire():
+                pass
+            with mock.patch.object(driverpool, "_is_healthy", return_value=False):
+                with pool.acquire() as driver:
+                    self.assertIs(driver, self.drivers[1])
+            self.assertTrue(self.drivers[0].quitted)
+
+    def test_size(self) -> None:
+        lock = threading.Lock()
+        in_use: set[int] = set()
+        peak = 0
+
+        def use(pool: driverpool.DriverPool) -> None:
+            nonlocal peak
+            with pool.acquire() as driver:
+                with lock:
+                    in_use.add(id(driver))
+                    peak = max(peak, len(in_use))
+                time.sleep(0.01)
+                with lock:
+                    in_use.discard(id(driver))
+        with driverpool.DriverPool(self.cookies, size=2) as pool:
+            threads = [threading.Thread(target=use, args=(pool,)) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertLessEqual(peak, 2)
+        self.assertEqual(len(self.drivers), 2)
+
+    def test_warmup(self) -> None:
+        with driverpool.DriverPool(self.cookies, size=3) as pool:
+            pool.warmup()
+            self.assertEqual(pool.started, 3)
+            self.assertEqual(len(self.drivers), 3)
+            with pool.acquire():
+                pass
+            self.assertEqual(len(self.drivers), 3)
+
+    def test_closed(self) -> None:
+        pool = driverpool.DriverPool(self.cookies)
+        pool.close()
+        with self.assertRaises(RuntimeError):
+            with pool.acquire():
+                pass
@@ -0,0 +1,139 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+from unittest import TestCase, mock
+import pathlib
+import tempfile
+import threading
+
+import requests
+
+from yahoo_auction_auto import httpcache
+from tests import fakeclock, server
+
+
+class TestHTTPCache(TestCase):
+
+    def setUp(self) -> None:
+        self.server = server.LocalServer().__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.session = requests.Session()
+        self.addCleanup(self.session.close)
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.directory = tmpdir.name
+        self.clock = fakeclock.FakeClock()
+        self.body = b"<html>" + b"x" * 1000 + b"</html>"
+
+        def etag(request: server.Request) -> server.Response:
+            if request.headers.get("If-None-Match") == '"v1"':
+                return server.Response(304, headers={"ETag": '"v1"'})
+            return server.Response(body=self.body, headers={"ETag": '"v1"'})
+        self.server.route("/etag", etag)
+
+        def last_modified(request: server.Request) -> server.Response:
+            headers = {"Last-Modified": "Tue, 12 Oct 2021 10:54:00 GMT"}
+            if request.headers.get("If-Modified-Since") == headers["Last-Modified"]:
+                return server.Response(304, headers=headers)
+            return server.Response(body=self.body, headers=headers)
+        self.server.route("/last_modified", last_modified)
+        self.server.route("/plain", server.Response(body=self.body))
+        self.server.route("/max_age", server.Response(body=self.body, headers={"Cache-Control": "max-age=30"}))
+        self.server.route(
+            "/no_store",
+            server.Response(body=self.body, headers={"ETag": '"v1"', "Cache-Control": "no-store"})
+        )
+
+    def make_cache(self, max_bytes: int = 1024 * 1024, max_age: float = 0) -> httpcache.HTTPCache:
+        return httpcache.HTTPCache(self.directory, max_bytes, max_age, self.clock)
+
+    def test_etag(self) -> None:
+        _cache = self.make_cache()
+        for _ in range(3):
+            self.assertEqual(_cache.get(self.session, self.server.url("/etag")), self.body)
+        self.assertEqual([r.headers.get("If-None-Match") for r in self.server.requests], [None, '"v1"', '"v1"'])
+        self.assertEqual(_cache.stats, httpcache.HTTPCacheStats(0, 2, 1, 2 * len(self.body)))
+
+    def test_last_modified(self) -> None:
+        _cache = self.make_cache()
+        for _ in range(2):
+            self.assertEqual(_cache.get(self.session, self.server.url("/last_modified")), self.body)
+        self.assertEqual(_cache.stats.revalidated, 1)
+
+    def test_max_age(self) -> None:
+        with self.subTest("default"):
+            _cache = self.make_cache(max_age=10)
+            _cache.get(self.session, self.server.url("/plain"))
+            self.clock.now = 9
+            _cache.get(self.session, self.server.url("/plain"))
+            self.assertEqual(len(self.server.requests), 1)
+            self.clock.now = 10
+            _cache.get(self.session, self.server.url("/plain"))
+            self.assertEqual(len(self.server.requests), 2)
+        with self.subTest("Cache-Control"):
+            _cache.get(self.session, self.server.url("/max_age"))
+            self.clock.now = 39
+            _cache.get(self.session, self.server.url("/max_age"))
+            self.assertEqual(len(self.server.requests), 3)
+
+    def test_not_stored(self) -> None:
+        _cache = self.make_cache()
+        for path in ["/plain", "/no_store"]:
+            with self.subTest(path):
+                _cache.get(self.session, self.server.url(path))
+                _cache.get(self.session, self.server.url(path))
+                self.assertEqual(_cache.stats.bytes_saved, 0)
+                self.assertEqual(_cache.size, 0)
+
+    def test_persistent(self) -> None:
+        self.make_cache().get(self.session, self.server.url("/etag"))
+        _cache = self.make_cache()
+        self.assertEqual(_cache.get(self.session, self.server.url("/etag")), self.body)
+        self.assertEqual(_cache.stats.revalidated, 1)
+
+    def test_evict(self) -> None:
+        for path in ["/a", "/b", "/c"]:
+            self.server.route(path, server.Response(body=self.body, headers={"ETag": '"v1"'}))
+        _cache = self.make_cache(max_bytes=2 * len(self.body))
+        _cache.get(self.session, self.server.url("/a"))
+        _cache.get(self.session, self.server.url("/b"))
+        _cache.get(self.session, self.server.url("/a"))
+        _cache.get(self.session, self.server.url("/c"))
+        self.assertEqual(_cache.size, 2 * len(self.body))
+        self.server.requests.clear()
+        _cache.get(self.session, self.server.url("/b"))
+        self.assertEqual(self.server.requests[0].headers.get("If-None-Match"), None)
+
+    def test_error(self) -> None:
+        _cache = self.make_cache()
+        with self.assertRaises(requests.HTTPError):
+            _cache.get(self.session, self.server.url("/missing"))
+
+    def test_clear(self) -> None:
+        _cache = self.make_cache()
+        _cache.get(self.session, self.server.url("/etag"))
+        _cache.clear()
+        self.assertEqual(_cache.size, 0)
+        self.assertEqual(self.make_cache().size, 0)
+
+    def test_io_outside_lock(self) -> None:
+        _cache = self.make_cache()
+        writing, release = threading.Event(), threading.Event()
+        write_atomic = httpcache._write_atomic
+
+        def slow_write(path: pathlib.Path, data: bytes) -> None:
+            if path.stem == httpcache._key(self.server.url("/etag")):
+                writing.set()
+                release.wait(5)
+            write_atomic(path, data)
+        with mock.patch("yahoo_auction_auto.httpcache._write_atomic", slow_write):
+            session = requests.Session()
+            self.addCleanup(session.close)
+            thread = threading.Thread(target=_cache.get, args=(session, self.server.url("/etag")))
+            thread.start()
+            self.assertTrue(writing.wait(5))
+            for _ in range(2):
+                _cache.get(self.session, self.server.url("/last_modified"))
+            self.assertEqual(_cache.stats.revalidated, 1)
+            self.assertTrue(thread.is_alive())
+            release.set()
+            thread.join()
+        self.assertEqual(_cache.size, 2 * len(self.body))
@@ -0,0 +1,75 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+from unittest import TestCase
+
+from yahoo_auction_auto import instrument
+from tests import fakeclock
+
+
+class TestInstrumentation(TestCase):
+
+    def setUp(self) -> None:
+        self.clock = fakeclock.FakeClock()
+        self.events: list[instrument.Event] = []
+        self.instrumentation = instrument.Instrumentation([self.events.append], self.clock)
+
+    def test_span(self) -> None:
+        with self.instrumentation.span("http.item", url="u") as attributes:
+            self.clock.now = 1.5
+            attributes["status"] = 200
+        self.assertEqual(self.events, [instrument.Event("http.item", 1.5, {"url": "u", "status": 200})])
+
+    def test_error(self) -> None:
+        with self.assertRaises(ValueError):
+            with self.instrumentation.span("parse.item"):
+                raise ValueError()
+        event, = self.events
+        self.assertIsInstance(event.error, ValueError)
+
+    def test_disabled(self) -> None:
+        instrumentation = instrument.Instrumentation()
+        self.assertFalse(instrumentation.enabled)
+        with instrumentation.span("http.item", url="u") as attributes:
+            self.assertEqual(attributes, {"url": "u"})
+        instrumentation.add_hook(self.events.append)
+        with instrumentation.span("http.item"):
+            pass
+        instrumentation.remove_hook(self.events.append)
+        with instrumentation.span("http.item"):
+            pass
+        self.assertEqual(len(self.events), 1)
+
+    def test_broken_hook(self) -> None:
+        def hook(event: instrument.Event) -> None:
+            raise RuntimeError()
+        self.instrumentation.add_hook(hook)
+        with self.assertLogs("yahoo_auction_auto.instrument", "ERROR"):
+            with self.instrumentation.span("http.item"):
+                pass
+        self.assertEqual(len(self.events), 1)
+
+
+class TestAggregator(TestCase):
+
+    def test_summary(self) -> None:
+        aggregator = instrument.Aggregator()
+        for i in range(1, 101):
+            aggregator(instrument.Event("http.item", i / 100, {"bytes": 10}))
+        aggregator(instrument.Event("parse.item", 0.5, error=ValueError()))
+        summary = aggregator.summary()
+        self.assertEqual(set(summary), {"http.item", "parse.item"})
+        item = summary["http.item"]
+        self.assertEqual((item.count, item.errors, item.bytes), (100, 0, 1000))
+        self.assertEqual((item.p50, item.p95, item.p99, item.max), (0.5, 0.95, 0.99, 1.0))
+        self.assertAlmostEqual(item.total, 50.5)
+        self.assertEqual(summary["parse.item"].errors, 1)
+        self.assertEqual(aggregator.percentile("http.item", 95), 0.95)
+        self.assertIsNone(aggregator.percentile("http.listing", 95))
+        aggregator.reset()
+        self.assertEqual(aggregator.summary(), {})
+
+    def test_max_samples(self) -> None:
+        aggregator = instrument.Aggregator(max_samples=10)
+        for i in range(100):
+            aggregator(instrument.Event("http.item", float(i)))
+        summary = aggregator.summary()["http.item"]
+        self.assertEqual((summary.count, summary.p50, summary.max), (100, 94.0, 99.0))
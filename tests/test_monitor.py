@@ -0,0 +1,133 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+from unittest import TestCase, mock
+import dataclasses
+import datetime
+import typing as t
+
+from yahoo_auction_auto import info, instrument, monitor, sync, yahoo_auction
+from tests import fakeclock
+from tests.test_yahoo_auction import make_info_selling
+
+
+NOW = datetime.datetime(2021, 10, 15, 12, 0).replace(tzinfo=sync.JST).timestamp()
+
+
+def make_info(aID: str, ends_in: float, count_bid: int = 1) -> info.InfoSelling:
+    end = datetime.datetime.fromtimestamp(NOW + ends_in, sync.JST).replace(tzinfo=None)
+    return dataclasses.replace(make_info_selling(aID), end_datetime=end, count_bid=count_bid)
+
+
+class TestMonitor(TestCase):
+
+    def setUp(self) -> None:
+        self.clock = fakeclock.FakeClock(NOW)
+        self.items = {
+            "soon": make_info("soon", 120),
+            "later": make_info("later", 3 * 3600),
+            "days": make_info("days", 5 * 86400),
+        }
+        self.polled: list[str] = []
+        self.yah = mock.Mock(spec=yahoo_auction.YahooAuction)
+        self.yah.instrumentation = instrument.Instrumentation()
+        self.yah.iter_aIDs_selling.side_effect = lambda: iter(list(self.items))
+        self.yah.get_info_selling_many.side_effect = self.get_info_selling_many
+
+    def get_info_selling_many(self, aIDs: t.Iterable[str]) -> t.Iterator[tuple[str, info.InfoSelling | Exception]]:
+        for aID in aIDs:
+            self.polled.append(aID)
+            yield aID, self.items[aID] if aID in self.items else KeyError(aID)
+
+    def make_monitor(self, **kwargs: t.Any) -> monitor.Monitor:
+        return monitor.Monitor(self.yah, clock=self.clock, sleep=self.clock.sleep, **kwargs)
+
+    def test_interval(self) -> None:
+        mon = self.make_monitor(min_interval=30, max_interval=3600, ratio=0.1)
+        mon.step()
+        self.assertEqual(mon.interval("soon"), 30)
+        self.assertAlmostEqual(mon.interval("later"), 1080)
+        self.assertEqual(mon.interval("days"), 3600)
+
+    def test_events(self) -> None:
+        mon = self.make_monitor(min_interval=30, listing_interval=100)
+        events = mon.step()
+        self.assertEqual(sorted(event.aID for event in events if event.kind == "added"), sorted(self.items))
+        self.items["soon"] = dataclasses.replace(self.items["soon"], count_bid=2)
+        self.clock.sleep(30)
+        event, = mon.step()
+        self.assertEqual((event.kind, event.aID, event.changes), ("changed", "soon", {"count_bid": (1, 2)}))
+        self.assertEqual(mon.interval("soon"), 30)
+        del self.items["soon"]
+        self.clock.sleep(70)
+        event, = mon.step()
+        self.assertEqual((event.kind, event.aID), ("ended", "soon"))
+        self.assertEqual(len(mon), 2)
+
+    def test_empty_listing(self) -> None:
+        mon = self.make_monitor(listing_interval=100)
+        mon.step()
+        self.items = {}
+        with self.subTest("logged out"):
+            self.yah.check_login.return_value = False
+            self.clock.sleep(100)
+            self.assertEqual([event.kind for event in mon.step() if event.kind == "ended"], [])
+            self.assertEqual(len(mon), 3)
+        with self.subTest("sold out"):
+            self.yah.check_login.return_value = True
+            self.clock.sleep(100)
+            ended = sorted(event.aID for event in mon.step() if event.kind == "ended")
+            self.assertEqual(ended, ["days", "later", "soon"])
+            self.assertEqual(len(mon), 0)
+
+    def test_listing_pages(self) -> None:
+        def iter_aIDs_selling() -> t.Iterator[str]:
+            for _ in range(3):
+                self.yah.instrumentation.emit(instrument.Event("http.listing", 0.1, {}))
+            return iter(list(self.items))
+        self.yah.iter_aIDs_selling.side_effect = iter_aIDs_selling
+        mon = self.make_monitor(rate=0.5, burst=2, listing_interval=86400)
+        self.assertEqual([event.kind for event in mon.step()], [])
+        self.assertEqual(mon.requests, 3)
+        self.assertEqual(mon.next_due(), NOW + 4)
+        self.clock.sleep(4)
+        self.assertEqual(len(mon.step()), 1)
+        self.assertEqual(self.yah.instrumentation.hooks, ())
+
+    def test_failed(self) -> None:
+        mon = self.make_monitor()
+        self.yah.get_info_selling_many.side_effect = lambda aIDs: ((aID, RuntimeError()) for aID in aIDs)
+        events = mon.step()
+        self.assertEqual({event.kind for event in events}, {"failed"})
+        self.assertIsInstance(events[0].error, RuntimeError)
+
+    def test_active(self) -> None:
+        mon = self.make_monitor(min_interval=30, active_interval=60, active_window=600)
+        mon.step()
+        self.items["days"] = dataclasses.replace(self.items["days"], count_bid=5)
+        self.clock.sleep(3600)
+        mon.step()
+        self.assertEqual(mon.interval("days"), 60)
+        self.clock.sleep(601)
+        self.assertEqual(mon.interval("days"), 3600)
+
+    def test_priority(self) -> None:
+        mon = self.make_monitor(min_interval=30, listing_interval=86400)
+        mon.step()
+        self.polled.clear()
+        for _ in mon.run(stop=lambda: self.clock.now >= NOW + 1800):
+            pass
+        self.assertGreater(self.polled.count("soon"), 3)
+        self.assertGreater(self.polled.count("soon"), self.polled.count("later"))
+        self.assertEqual(self.polled.count("days"), 0)
+
+    def test_budget(self) -> None:
+        self.items.update({f"x{i}": make_info(f"x{i}", 60) for i in range(20)})
+        mon = self.make_monitor(rate=0.5, burst=4, min_interval=1, listing_interval=86400)
+        self.assertEqual(len(mon.step()), 3)
+        for _ in mon.run(stop=lambda: self.clock.now >= NOW + 600):
+            pass
+        self.assertLessEqual(mon.requests, 4 + 0.5 * 600 + 1)
+        self.assertEqual(len(self.polled) + 1, mon.requests)
+
+    def test_invalid_budget(self) -> None:
+        with self.assertRaises(ValueError):
+            self.make_monitor(rate=0)
@@ -0,0 +1,32 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+from unittest import TestCase
+
+from yahoo_auction_auto import parsing
+
+
+class Test_fromstring(TestCase):
+
+    def test_document(self) -> None:
+        tree = parsing.fromstring(b"<html><body><p>text</p></body></html>")
+        self.assertEqual(tree.tag, "html")
+        self.assertEqual(tree.findtext(".//p"), "text")
+
+    def test_empty(self) -> None:
+        contents: list[str | bytes] = ["", b"", " \n"]
+        for content in contents:
+            with self.subTest(content=content):
+                tree = parsing.fromstring(content)
+                self.assertEqual(tree.tag, "html")
+                self.assertEqual(len(tree), 0)
+
+
+class Test_check_parser(TestCase):
+
+    def test_known(self) -> None:
+        for parser in parsing.PARSERS:
+            with self.subTest(parser):
+                self.assertEqual(parsing.check_parser(parser), parser)
+
+    def test_unknown(self) -> None:
+        with self.assertRaises(ValueError):
+            parsing.check_parser("html5lib")
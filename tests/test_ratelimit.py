@@ -0,0 +1,109 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+from unittest import TestCase
+import threading
+import time
+import typing as t
+
+from yahoo_auction_auto import ratelimit
+from tests import fakeclock
+
+
+class TestRateLimiter(TestCase):
+
+    def setUp(self) -> None:
+        self.clock = fakeclock.FakeClock()
+
+    def send(self, limiter: ratelimit.RateLimiter, status: int = 200, elapsed: float = 0.0) -> None:
+        with limiter.acquire() as permit:
+            self.clock.now += elapsed
+            permit.status = status
+
+    def test_rate(self) -> None:
+        limiter = ratelimit.RateLimiter(rate=100, burst=1)
+        start = time.monotonic()
+        for _ in range(11):
+            with limiter.acquire():
+                pass
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_concurrency(self) -> None:
+        limiter = ratelimit.RateLimiter(rate=None, max_concurrency=2)
+        peak = 0
+        lock = threading.Lock()
+
+        def send() -> None:
+            nonlocal peak
+            with limiter.acquire():
+                with lock:
+                    peak = max(peak, limiter.in_flight)
+                time.sleep(0.01)
+        threads = [threading.Thread(target=send) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(peak, 2)
+
+    def test_aimd(self) -> None:
+        limiter = ratelimit.RateLimiter(rate=None, max_concurrency=8, slow=1, cooldown=10, clock=self.clock)
+        self.send(limiter, 429)
+        self.assertEqual(limiter.concurrency, 4)
+        with self.subTest("cooldown"):
+            self.send(limiter, 503)
+            self.assertEqual(limiter.concurrency, 4)
+        with self.subTest("increase"):
+            for _ in range(4):
+                self.send(limiter)
+            self.assertEqual(limiter.concurrency, 5)
+        with self.subTest("slow"):
+            self.send(limiter, elapsed=10)
+            self.assertEqual(limiter.concurrency, 2)
+        with self.subTest("failure"):
+            self.clock.now += 10
+            with self.assertRaises(ConnectionError):
+                with limiter.acquire():
+                    raise ConnectionError()
+            self.assertEqual(limiter.concurrency, 1)
+        with self.subTest("floor"):
+            self.clock.now += 10
+            self.send(limiter, 429)
+            self.assertEqual(limiter.concurrency, 1)
+        stats = limiter.stats
+        self.assertEqual((stats.throttled, stats.slow, stats.failed), (3, 1, 1))
+        self.assertEqual((stats.decreases, stats.increases), (4, 1))
+
+    def test_retry_after(self) -> None:
+        limiter = ratelimit.RateLimiter(rate=None)
+        with limiter.acquire() as permit:
+            permit.status = 429
+            permit.retry_after = 0.05
+        start = time.monotonic()
+        with limiter.acquire():
+            pass
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+
+    def test_throttled(self) -> None:
+        limiter = ratelimit.RateLimiter(rate=None, cooldown=10, clock=self.clock)
+        self.assertFalse(limiter.throttled)
+        with limiter.acquire() as permit:
+            permit.status = 429
+            permit.retry_after = 20
+        self.assertTrue(limiter.throttled)
+        self.clock.now += 10
+        self.assertTrue(limiter.throttled)
+        self.clock.now += 10
+        self.assertFalse(limiter.throttled)
+
+    def test_invalid(self) -> None:
+        invalid: list[dict[str, t.Any]] = [
+            {"min_concurrency": 4, "max_concurrency": 2},
+            {"min_concurrency": 0},
+            {"decrease": 1},
+            {"rate": 0},
+            {"rate": -1},
+            {"rate": float("nan")},
+            {"burst": 0},
+        ]
+        for kwargs in invalid:
+            with self.subTest(**kwargs), self.assertRaises(ValueError):
+                ratelimit.RateLimiter(**kwargs)
@@ -0,0 +1,138 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+from unittest import TestCase
+import io
+import threading
+import time
+import typing as t
+
+import requests
+
+from yahoo_auction_auto import ratelimit, retry
+
+
+def make_response(status: int) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.raw = io.BytesIO()
+    return response
+
+
+class TestRetryPolicy(TestCase):
+
+    def setUp(self) -> None:
+        self.sleeps: list[float] = []
+        self.policy = retry.RetryPolicy(max_retries=2, backoff=1, sleep=self.sleeps.append, random=lambda: 0.5)
+        self.addCleanup(self.policy.close)
+
+    def sequence(self, *outcomes: int | Exception) -> t.Callable[[], requests.Response]:
+        results = iter(outcomes)
+
+        def request() -> requests.Response:
+            outcome = next(results)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return make_response(outcome)
+        return request
+
+    def test_retry(self) -> None:
+        response = self.policy.send("http.item", self.sequence(503, requests.ConnectionError(), 200))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.sleeps, [0.5, 1.0])
+        self.assertEqual(self.policy.stats.retries, 2)
+
+    def test_max_retries(self) -> None:
+        with self.subTest("status"):
+            response = self.policy.send("http.item", self.sequence(500, 502, 504))
+            self.assertEqual(response.status_code, 504)
+        with self.subTest("error"):
+            with self.assertRaises(requests.Timeout):
+                self.policy.send("http.item", self.sequence(*[requests.Timeout()] * 3))
+
+    def test_not_retried(self) -> None:
+        self.assertEqual(self.policy.send("http.item", self.sequence(404)).status_code, 404)
+        with self.assertRaises(ValueError):
+            self.policy.send("http.item", self.sequence(ValueError()))
+        self.assertEqual(self.sleeps, [])
+
+    def test_budget(self) -> None:
+        policy = retry.RetryPolicy(budget=2, budget_ratio=0, sleep=self.sleeps.append)
+        for _ in range(3):
+            policy.send("http.item", self.sequence(503, 503, 503))
+        stats = policy.stats
+        self.assertEqual((stats.retries, stats.exhausted), (2, 2))
+
+    def hedged(
+        self, policy: retry.RetryPolicy, slow: int | Exception, delay: float = 0.2
+    ) -> t.Callable[[], requests.Response]:
+        """Get a request whose 6th call takes `delay` and results in `slow`."""
+        calls = 0
+        lock = threading.Lock()
+
+        def request() -> requests.Response:
+            nonlocal calls
+            with lock:
+                calls += 1
+                call = calls
+            time.sleep(delay if call == 6 else 0.01)
+            outcome = slow if call == 6 else 200
+            if isinstance(outcome, Exception):
+                raise outcome
+            return make_response(outcome)
+        self.assertIsNone(policy.hedge_delay("http.item"))
+        for _ in range(5):
+            policy.send("http.item", request)
+        self.assertIsNotNone(policy.hedge_delay("http.item"))
+        return request
+
+    def test_hedge(self) -> None:
+        policy = retry.RetryPolicy(hedge=True, min_samples=5, sleep=self.sleeps.append)
+        self.addCleanup(policy.close)
+        request = self.hedged(policy, requests.ConnectionError())
+        self.assertEqual(policy.send("http.item", request).status_code, 200)
+        self.assertEqual(self.sleeps, [])
+        stats = policy.stats
+        self.assertEqual((stats.retries, stats.hedges, stats.hedge_wins), (0, 1, 1))
+        self.assertAlmostEqual(stats.hedge_rate, 1 / 6)
+
+    def test_hedge_first(self) -> None:
+        policy = retry.RetryPolicy(hedge=True, min_samples=5)
+        self.addCleanup(policy.close)
+        request = self.hedged(policy, 201, delay=1)
+        start = time.monotonic()
+        self.assertEqual(policy.send("http.item", request).status_code, 200)
+        self.assertLess(time.monotonic() - start, 0.5)
+        stats = policy.stats
+        self.assertEqual((stats.hedges, stats.hedge_wins), (1, 1))
+
+    def test_hedge_throttled(self) -> None:
+        policy = retry.RetryPolicy(hedge=True, min_samples=5)
+        self.addCleanup(policy.close)
+        limiter = ratelimit.RateLimiter(rate=None, cooldown=10)
+        request = self.hedged(policy, 201)
+        with limiter.acquire() as permit:
+            permit.status = 429
+        self.assertTrue(limiter.throttled)
+        self.assertEqual(policy.send("http.item", request, limiter).status_code, 201)
+        self.assertEqual(policy.stats.hedges, 0)
+
+    def test_started(self) -> None:
+        policy = retry.RetryPolicy(hedge=True, min_samples=2)
+        self.addCleanup(policy.close)
+
+        def request() -> requests.Response:
+            time.sleep(0.2)
+            policy.started()
+            return make_response(200)
+        for _ in range(2):
+            policy.send("http.item", request)
+        delay = policy.hedge_delay("http.item")
+        assert delay is not None
+        self.assertLess(delay, 0.1)
+        with self.subTest("primary on the caller's thread before hedging"):
+            threads: list[threading.Thread] = []
+
+            def record() -> requests.Response:
+                threads.append(threading.current_thread())
+                return make_response(200)
+            policy.send("http.listing", record)
+            self.assertIn(threading.current_thread(), threads)
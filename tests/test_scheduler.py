@@ -0,0 +1,109 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+from unittest import TestCase, mock
+import collections
+import threading
+import time
+import typing as t
+
+from yahoo_auction_auto import scheduler, yahoo_auction
+
+
+def make_yah(max_workers: int) -> mock.Mock:
+    yah = mock.Mock(spec=yahoo_auction.YahooAuction)
+    yah.max_workers = max_workers
+    return yah
+
+
+class TestScheduler(TestCase):
+
+    def setUp(self) -> None:
+        self.accounts = {"a": make_yah(2), "b": make_yah(2), "c": make_yah(1)}
+        self.names = {id(yah): name for name, yah in self.accounts.items()}
+        self.running: collections.Counter[str] = collections.Counter()
+        self.peak: collections.Counter[str] = collections.Counter()
+        self.total_peak = 0
+        self.lock = threading.Lock()
+
+    def task(self, yah: t.Any, item: int) -> int:
+        name = self.names[id(yah)]
+        with self.lock:
+            self.running[name] += 1
+            self.peak[name] = max(self.peak[name], self.running[name])
+            self.total_peak = max(self.total_peak, sum(self.running.values()))
+        time.sleep(0.005)
+        with self.lock:
+            self.running[name] -= 1
+        if item < 0:
+            raise ValueError(item)
+        return item * 2
+
+    def test_map(self) -> None:
+        items = {"a": range(20), "b": range(3), "c": [-1, 1]}
+        results = [result for result in scheduler.Scheduler(self.accounts, max_workers=4).map(self.task, items)]
+        self.assertEqual(len(results), 25)
+        self.assertEqual(
+            sorted((name, item, result) for name, item, result in results if not isinstance(result, Exception)),
+            sorted([("a", i, i * 2) for i in range(20)] + [("b", i, i * 2) for i in range(3)] + [("c", 1, 2)])
+        )
+        self.assertTrue(any(name == "c" and isinstance(result, ValueError) for name, _, result in results))
+        self.assertLessEqual(self.total_peak, 4)
+        self.assertEqual((self.peak["a"], self.peak["b"], self.peak["c"]), (2, 2, 1))
+
+    def test_fair(self) -> None:
+        items = {"a": range(100), "b": range(3)}
+        results = scheduler.Scheduler(self.accounts, max_workers=2).map(self.task, items)
+        first = [name for name, _, _ in (next(results) for _ in range(8))]
+        self.assertEqual(first.count("b"), 3)
+        results.close()
+
+    def test_broken_items(self) -> None:
+        def broken() -> t.Iterator[int]:
+            yield 1
+            raise RuntimeError()
+        with self.assertLogs("yahoo_auction_auto.scheduler", "WARNING"):
+            results = [
+                result for result in scheduler.Scheduler(self.accounts).map(self.task, {"a": broken(), "b": [1]})
+            ]
+        self.assertEqual(len(results), 3)
+        failed, = [(name, item) for name, item, result in results if isinstance(result, RuntimeError)]
+        self.assertEqual(failed, ("a", None))
+
+    def test_concurrent_items(self) -> None:
+        barrier = threading.Barrier(2, timeout=5)
+
+        def crawl() -> t.Iterator[int]:
+            barrier.wait()
+            yield 1
+        items = {"a": crawl(), "b": crawl()}
+        results = [result for result in scheduler.Scheduler(self.accounts).map(self.task, items)]
+        self.assertEqual(sorted(t.cast(list[int], [result for _, _, result in results])), [2, 2])
+
+    def test_each(self) -> None:
+        for yah in self.accounts.values():
+            yah.aIDs_selling = ["x0"]
+        results = scheduler.Scheduler(self.accounts).each(lambda yah: yah.aIDs_selling)
+        self.assertEqual(results, {"a": ["x0"], "b": ["x0"], "c": ["x0"]})
+
+    def test_unknown_account(self) -> None:
+        with self.assertRaises(KeyError):
+            for _ in scheduler.Scheduler(self.accounts).map(self.task, {"x": [1]}):
+                pass
+
+
+class Test_shard(TestCase):
+
+    def test_shard(self) -> None:
+        names = [f"account{i}" for i in range(10)]
+        shards = [scheduler.shard(reversed(names), i, 3) for i in range(3)]
+        self.assertEqual(sorted(name for names in shards for name in names), names)
+        self.assertEqual([len(names) for names in shards], [4, 3, 3])
+        self.assertEqual(scheduler.shard(names, 1, 3), shards[1])
+        for index, count in [(3, 3), (-1, 3), (0, 0)]:
+            with self.assertRaises(ValueError):
+                scheduler.shard(names, index, count)
+
+    def test_scheduler(self) -> None:
+        accounts = {name: make_yah(1) for name in "abc"}
+        shard = scheduler.Scheduler(accounts, max_workers=4).shard(1, 2)
+        self.assertEqual(shard.accounts, {"b": accounts["b"]})
+        self.assertEqual(shard.max_workers, 4)
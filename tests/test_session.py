@@ -0,0 +1,25 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+from unittest import TestCase
+
+from requests import adapters
+
+from yahoo_auction_auto import session
+
+
+class Test_create_session(TestCase):
+
+    def test_cookies(self) -> None:
+        cookies = [
+            {"name": "B", "value": "b", "domain": ".yahoo.co.jp", "path": "/"},
+            {"name": "T", "value": "t"},
+        ]
+        _session = session.create_session(cookies)
+        self.assertEqual(_session.cookies.get("B", domain=".yahoo.co.jp"), "b")
+        self.assertEqual(_session.cookies.get("T"), "t")
+
+    def test_pool_maxsize(self) -> None:
+        _session = session.create_session([], pool_maxsize=32)
+        adapter = _session.get_adapter("https://auctions.yahoo.co.jp")
+        self.assertIsInstance(adapter, adapters.HTTPAdapter)
+        assert isinstance(adapter, adapters.HTTPAdapter)
+        self.assertEqual(adapter._pool_maxsize, 32)  # type: ignore
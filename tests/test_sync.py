@@ -0,0 +1,152 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+from unittest import TestCase, mock
+import dataclasses
+import datetime
+import os
+import tempfile
+import typing as t
+
+from yahoo_auction_auto import sync, info, yahoo_auction
+
+
+def make_info_selling(aID: str, **changes: t.Any) -> info.InfoSelling:
+    snapshot = info.InfoSelling(
+        aID, "title", "seller_name", 1,
+        datetime.datetime(2021, 10, 12, 19, 54),
+        datetime.datetime(2021, 10, 15, 19, 54),
+        True, "10,000 円（税 0 円）", "19時間", 1, 2, 3
+    )
+    return dataclasses.replace(snapshot, **changes)
+
+
+# 2021-10-12 20:00 JST, about three days before the end of the auctions.
+NOW = datetime.datetime(2021, 10, 12, 20, 0, tzinfo=sync.JST).timestamp()
+
+
+class TestSnapshotStore(TestCase):
+
+    def test_roundtrip(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "snapshots.sqlite3")
+            with sync.SnapshotStore(path) as store:
+                store.put([(make_info_selling("x0"), NOW), (make_info_selling("x1"), NOW + 1)])
+            with sync.SnapshotStore(path) as store:
+                self.assertEqual(len(store), 2)
+                self.assertEqual(store.get("x0"), (make_info_selling("x0"), NOW))
+                self.assertEqual(store.get("x2"), None)
+                store.delete(["x0"])
+                self.assertEqual(list(store.items()), ["x1"])
+
+
+class TestSync(TestCase):
+
+    def setUp(self) -> None:
+        self.store = sync.SnapshotStore()
+        self.addCleanup(self.store.close)
+        self.yah = mock.Mock(spec=yahoo_auction.YahooAuction)
+        self.now = NOW
+        self.sync = sync.Sync(self.yah, self.store, max_age=3600, ending_within=3600, clock=lambda: self.now)
+        self.remote: dict[str, info.InfoSelling | Exception] = {}
+        self.yah.iter_aIDs_selling.side_effect = lambda: iter(self.remote)
+        self.yah.get_info_selling_many.side_effect = lambda aIDs: ((aID, self.remote[aID]) for aID in aIDs)
+
+    def fetched(self) -> list[str]:
+        return list(self.yah.get_info_selling_many.call_args.args[0])
+
+    def test_first_run(self) -> None:
+        self.remote = {"x0": make_info_selling("x0"), "x1": make_info_selling("x1")}
+        changes = self.sync.run()
+        self.assertEqual(changes.added, self.remote)
+        self.assertEqual(len(self.store), 2)
+
+    def test_incremental(self) -> None:
+        self.remote = {"x0": make_info_selling("x0"), "x1": make_info_selling("x1")}
+        self.sync.run()
+        self.now += 60
+        self.remote = {"x1": make_info_selling("x1", count_bid=2), "x2": make_info_selling("x2")}
+        changes = self.sync.run()
+        self.assertEqual(self.fetched(), ["x2"])
+        self.assertEqual(changes.added, {"x2": self.remote["x2"]})
+        self.assertEqual(changes.removed, {"x0": make_info_selling("x0")})
+        self.assertEqual(changes.changed, {})
+        self.assertEqual(self.store.get("x0"), None)
+
+    def test_stale(self) -> None:
+        self.remote = {"x0": make_info_selling("x0")}
+        self.sync.run()
+        self.now += 3600
+        self.remote = {"x0": make_info_selling("x0", count_bid=2)}
+        changes = self.sync.run()
+        self.assertEqual(self.fetched(), ["x0"])
+        self.assertEqual(changes.changed, {"x0": {"count_bid": (1, 2)}})
+        self.assertEqual(self.store.get("x0"), (self.remote["x0"], self.now))
+
+    def test_ending(self) -> None:
+        end = datetime.datetime(2021, 10, 12, 20, 30)
+        self.remote = {"x0": make_info_selling("x0", end_datetime=end)}
+        self.sync.run()
+        self.now += 60
+        self.sync.run()
+        self.assertEqual(self.fetched(), ["x0"])
+
+    def test_failed(self) -> None:
+        self.remote = {"x0": make_info_selling("x0")}
+        self.sync.run()
+        self.now += 3600
+        error = RuntimeError("x0")
+        self.remote = {"x0": error}
+        changes = self.sync.run()
+        self.assertEqual(changes.failed, {"x0": error})
+        self.assertFalse(changes)
+        self.assertEqual(self.store.get("x0"), (make_info_selling("x0"), NOW))
+
+    def test_empty_listing(self) -> None:
+        self.remote = {"x0": make_info_selling("x0")}
+        self.sync.run()
+        self.remote = {}
+        with self.subTest("logged out"):
+            self.yah.check_login.return_value = False
+            with self.assertRaises(RuntimeError):
+                self.sync.run()
+            self.assertEqual(self.store.get("x0"), (make_info_selling("x0"), NOW))
+        with self.subTest("sold out"):
+            self.yah.check_login.return_value = True
+            for _ in range(2):
+                changes = self.sync.run()
+            self.assertEqual(changes.removed, {})
+            self.assertEqual(len(self.store), 0)
+
+    def test_delete_after_fetch(self) -> None:
+        self.remote = {"x0": make_info_selling("x0"), "x1": make_info_selling("x1")}
+        self.sync.run()
+        self.remote = {"x1": make_info_selling("x1"), "x2": make_info_selling("x2")}
+        stored: list[int] = []
+
+        def get_info_selling_many(aIDs: list[str]) -> t.Iterator[tuple[str, info.InfoSelling | Exception]]:
+            for aID in aIDs:
+                stored.append(len(self.store))
+                yield aID, self.remote[aID]
+        self.yah.get_info_selling_many.side_effect = get_info_selling_many
+        self.sync.run()
+        self.assertEqual(stored, [2])
+        self.assertEqual(sorted(self.store.items()), ["x1", "x2"])
+
+
+class Test_is_stale(TestCase):
+
+    def setUp(self) -> None:
+        store = sync.SnapshotStore()
+        self.addCleanup(store.close)
+        self.sync = sync.Sync(mock.Mock(), store, clock=lambda: NOW)
+
+    def test_timeleft(self) -> None:
+        epoch = datetime.datetime(1970, 1, 1)
+        with self.subTest("far"):
+            snapshot = make_info_selling("x0", end_datetime=epoch, timeleft="2日")
+            self.assertFalse(self.sync.is_stale(snapshot, NOW))
+        with self.subTest("near"):
+            snapshot = make_info_selling("x0", end_datetime=epoch, timeleft="45分")
+            self.assertTrue(self.sync.is_stale(snapshot, NOW))
+        with self.subTest("unknown"):
+            snapshot = make_info_selling("x0", end_datetime=epoch, timeleft="")
+            self.assertTrue(self.sync.is_stale(snapshot, NOW))
@@ -0,0 +1,21 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+from unittest import TestCase
+import subprocess
+import sys
+
+from yahoo_auction_auto import webdriver
+
+
+class Test_lazy_import(TestCase):
+
+    def test_import_package(self) -> None:
+        code = (
+            "import sys, yahoo_auction_auto; "
+            "print(sorted(m for m in sys.modules if m.split('.')[0] in ('selenium', 'chromedriver_binary')))"
+        )
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), "[]")
+
+    def test_unknown_attribute(self) -> None:
+        with self.assertRaises(AttributeError):
+            webdriver.Firefox
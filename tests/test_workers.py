@@ -0,0 +1,122 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+from unittest import TestCase
+import concurrent.futures
+import threading
+import time
+import typing as t
+
+from yahoo_auction_auto import workers
+
+
+class Test_bounded_map(TestCase):
+
+    def test_ordered(self) -> None:
+        def func(x: int) -> int:
+            time.sleep(0.01 * (5 - x))
+            return x * 2
+        results = list(workers.bounded_map(func, range(5), 3, ordered=True))
+        self.assertEqual(results, [(x, x * 2) for x in range(5)])
+
+    def test_unordered(self) -> None:
+        results = dict(workers.bounded_map(lambda x: x * 2, range(10), 4))
+        self.assertEqual(results, {x: x * 2 for x in range(10)})
+
+    def test_failure(self) -> None:
+        def func(x: int) -> int:
+            if x == 2:
+                raise ValueError(x)
+            return x
+        results = dict(workers.bounded_map(func, range(5), 2, ordered=True))
+        self.assertIsInstance(results.pop(2), ValueError)
+        self.assertEqual(results, {0: 0, 1: 1, 3: 3, 4: 4})
+
+    def test_max_workers(self) -> None:
+        lock = threading.Lock()
+        running = 0
+        peak = 0
+
+        def func(x: int) -> int:
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.01)
+            with lock:
+                running -= 1
+            return x
+        list(workers.bounded_map(func, range(20), 3))
+        self.assertLessEqual(peak, 3)
+
+    def test_lazy(self) -> None:
+        consumed: list[int] = []
+
+        def items() -> t.Iterator[int]:
+            for x in range(100):
+                consumed.append(x)
+                yield x
+        iterator = workers.bounded_map(lambda x: x, items(), 2, ordered=True)
+        next(iterator)
+        iterator.close()
+        self.assertLessEqual(len(consumed), 3)
+
+    def test_invalid_max_workers(self) -> None:
+        with self.assertRaises(ValueError):
+            list(workers.bounded_map(lambda x: x, range(3), 0))
+
+
+class Test_pipeline(TestCase):
+
+    def setUp(self) -> None:
+        self.executor = concurrent.futures.ThreadPoolExecutor(2)
+        self.addCleanup(self.executor.shutdown)
+
+    def test_ordered(self) -> None:
+        def fetch(x: int) -> bytes:
+            time.sleep(0.01 * (5 - x))
+            return str(x).encode()
+        results = list(workers.pipeline(fetch, int, range(5), 3, self.executor, ordered=True))
+        self.assertEqual(results, [(x, x) for x in range(5)])
+
+    def test_unordered(self) -> None:
+        results = dict(workers.pipeline(lambda x: x * 2, str, range(10), 4, self.executor))
+        self.assertEqual(results, {x: str(x * 2) for x in range(10)})
+
+    def test_failure(self) -> None:
+        def fetch(x: int) -> int:
+            if x == 1:
+                raise ValueError(x)
+            return x
+        results = dict(workers.pipeline(fetch, lambda x: 1 // (x - 3), range(5), 2, self.executor))
+        self.assertIsInstance(results.pop(1), ValueError)
+        self.assertIsInstance(results.pop(3), ZeroDivisionError)
+        self.assertEqual(results, {0: -1, 2: -1, 4: 1})
+
+    def test_process_pool(self) -> None:
+        with concurrent.futures.ProcessPoolExecutor(2) as executor:
+            results = dict(workers.pipeline(lambda x: b"x" * x, len, range(10), 4, executor))
+        self.assertEqual(results, {x: x for x in range(10)})
+
+    def test_back_pressure(self) -> None:
+        fetched: list[int] = []
+        release = threading.Event()
+
+        def fetch(x: int) -> int:
+            fetched.append(x)
+            return x
+
+        def parse(x: int) -> int:
+            release.wait()
+            return x
+        iterator = workers.pipeline(fetch, parse, range(100), 2, self.executor, max_pending=3)
+        thread = threading.Thread(target=next, args=(iterator,))
+        thread.start()
+        time.sleep(0.05)
+        # 3 values being parsed and 2 fetches in flight.
+        self.assertLessEqual(len(fetched), 5)
+        release.set()
+        thread.join()
+        iterator.close()
+
+    def test_invalid_max_pending(self) -> None:
+        with self.assertRaises(ValueError):
+            list(workers.pipeline(lambda x: x, str, range(3), 2, self.executor, max_pending=-1))
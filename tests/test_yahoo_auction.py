@@ -0,0 +1,598 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+from unittest import TestCase, mock
+import concurrent.futures
+import datetime
+import gzip
+import random
+import tempfile
+import threading
+import time
+import typing as t
+from urllib import parse
+
+import requests
+
+from yahoo_auction_auto import yahoo_auction, info, parsing, urls, httpcache, instrument, ratelimit, retry
+from tests import server, fakedriver
+
+
+def make_info_selling(aID: str) -> info.InfoSelling:
+    return info.InfoSelling(
+        aID, "title", "seller_name", 1,
+        datetime.datetime(2021, 10, 12, 19, 54),
+        datetime.datetime(2021, 10, 15, 19, 54),
+        True, "10,000 円（税 0 円）", "19時間", 1, 2, 3
+    )
+
+
+class TestYahooAuction_get_info_selling_many(TestCase):
+
+    def setUp(self) -> None:
+        self.yah = yahoo_auction.YahooAuction(max_workers=2)
+
+    def test_ordered(self) -> None:
+        aIDs = [str(i) for i in range(10)]
+        with mock.patch.object(self.yah, "get_info_selling", side_effect=make_info_selling):
+            results = list(self.yah.get_info_selling_many(aIDs, ordered=True))
+        self.assertEqual(results, [(aID, make_info_selling(aID)) for aID in aIDs])
+
+    def test_failure(self) -> None:
+        def get_info_selling(aID: str) -> info.InfoSelling:
+            if aID == "1":
+                raise RuntimeError(aID)
+            return make_info_selling(aID)
+        with mock.patch.object(self.yah, "get_info_selling", side_effect=get_info_selling):
+            results = dict(self.yah.get_info_selling_many(["0", "1", "2"]))
+        self.assertIsInstance(results["1"], RuntimeError)
+        self.assertEqual(results["0"], make_info_selling("0"))
+        self.assertEqual(results["2"], make_info_selling("2"))
+
+
+class TestYahooAuction_session(TestCase):
+
+    def test_reuse(self) -> None:
+        yah = yahoo_auction.YahooAuction()
+        self.assertIs(yah.session, yah.session)
+
+    def test_close(self) -> None:
+        yah = yahoo_auction.YahooAuction()
+        _session = yah.session
+        yah.close()
+        self.assertIsNot(yah.session, _session)
+
+    def test_context_manager(self) -> None:
+        with mock.patch("requests.Session.close") as close:
+            with yahoo_auction.YahooAuction() as yah:
+                yah.session
+            close.assert_called_once()
+
+    def test_warmup(self) -> None:
+        yah = yahoo_auction.YahooAuction(pool_maxsize=4)
+        with mock.patch.object(yah, "_head") as head:
+            yah.warmup()
+        self.assertEqual(head.call_count, 8)
+
+
+class Test_parse_listing(TestCase):
+
+    def setUp(self) -> None:
+        self.test_filename = "tests/test_mystatus_selling.html"
+        with open(self.test_filename, encoding="utf-8") as f:
+            self.content = f.read()
+
+    def test_selling(self) -> None:
+        expected = [f"https://page.auctions.yahoo.co.jp/jp/auction/x100000000{i}" for i in range(1, 4)]
+        next_page = "https://auctions.yahoo.co.jp/openuser/jp/show/mystatus?select=selling&apg=2"
+        for parser in parsing.PARSERS:
+            with self.subTest(parser):
+                self.assertEqual(
+                    yahoo_auction._parse_listing(self.content, r"^rsec:itm;slk:tc;", parser),
+                    (expected, next_page)
+                )
+
+    def test_empty(self) -> None:
+        for parser in parsing.PARSERS:
+            with self.subTest(parser):
+                self.assertEqual(yahoo_auction._parse_listing("", r"^rsec:itm;slk:tc;", parser), ([], None))
+
+
+def make_listing_page(aIDs: list[str], next_page: str | None, slk: str = "tc") -> bytes:
+    links = "".join(
+        f'<a href="https://page.auctions.yahoo.co.jp/jp/auction/{aID}" data-ylk="rsec:itm;slk:{slk};pos:1">{aID}</a>'
+        for aID in aIDs
+    )
+    if next_page:
+        links += f'<a href="{next_page}" data-ylk="rsec:pagination;slk:next;pos:1">次へ</a>'
+    return f"<html><body>{links}</body></html>".encode("utf-8")
+
+
+class TestYahooAuction_iter_urls(TestCase):
+
+    def setUp(self) -> None:
+        self.server = server.LocalServer().__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.yah = yahoo_auction.YahooAuction(timeout=5)
+        self.addCleanup(self.yah.close)
+        self.pages = [[f"x{page}{i}" for i in range(3)] for page in range(3)]
+        for page, aIDs in enumerate(self.pages):
+            next_page = self.server.url(f"/page{page + 1}") if page + 1 < len(self.pages) else None
+            self.server.route(f"/page{page}", server.Response(body=make_listing_page(aIDs, next_page)))
+
+    def test_all_pages(self) -> None:
+        aIDs = list(yahoo_auction._to_aIDs(self.yah._iter_urls(self.server.url("/page0"), r"^rsec:itm;slk:tc;")))
+        self.assertEqual(aIDs, [aID for aIDs in self.pages for aID in aIDs])
+        self.assertEqual([request.path for request in self.server.requests], ["/page0", "/page1", "/page2"])
+
+    def test_loop(self) -> None:
+        self.server.route("/page2", server.Response(body=make_listing_page(self.pages[2], self.server.url("/page2"))))
+        with self.assertLogs("yahoo_auction_auto.yahoo_auction", "WARNING"):
+            aIDs = list(yahoo_auction._to_aIDs(self.yah._iter_urls(self.server.url("/page0"), r"^rsec:itm;slk:tc;")))
+        self.assertEqual(aIDs, [aID for aIDs in self.pages for aID in aIDs])
+        self.assertEqual([request.path for request in self.server.requests], ["/page0", "/page1", "/page2"])
+
+    def test_streaming(self) -> None:
+        released = threading.Event()
+        body = make_listing_page(self.pages[1], None)
+
+        def page1(request: server.Request) -> server.Response:
+            released.wait(5)
+            return server.Response(body=body)
+        self.server.route("/page1", page1)
+        iterator = yahoo_auction._to_aIDs(self.yah._iter_urls(self.server.url("/page0"), r"^rsec:itm;slk:tc;"))
+        self.assertEqual([next(iterator) for _ in range(3)], self.pages[0])
+        for _ in range(50):
+            if len(self.server.requests) == 2:
+                break
+            time.sleep(0.01)
+        self.assertEqual([request.path for request in self.server.requests], ["/page0", "/page1"])
+        released.set()
+        self.assertEqual(list(iterator), self.pages[1])
+
+    def test_error(self) -> None:
+        self.server.route("/page1", server.Response(500))
+        with self.assertRaises(requests.HTTPError):
+            list(self.yah._iter_urls(self.server.url("/page0"), r"^rsec:itm;slk:tc;"))
+
+    def test_summaries(self) -> None:
+        with open("tests/test_mystatus_selling.html", "rb") as f:
+            self.server.route("/page2", server.Response(body=f.read().replace(b"slk:next;", b"")))
+        with mock.patch("yahoo_auction_auto.urls.SELLING", self.server.url("/page0")):
+            summaries = list(self.yah.iter_summaries_selling())
+        self.assertEqual([summary.aID for summary in summaries[:6]], self.pages[0] + self.pages[1])
+        self.assertEqual(summaries[0].title, "x00")
+        self.assertEqual(
+            [(summary.aID, summary.price, summary.count_bid) for summary in summaries[6:]],
+            [("x1000000001", "10,000 円", 1), ("x1000000002", "1,500 円", 0), ("x1000000003", "300 円", 12)]
+        )
+        self.assertEqual(len(self.server.requests), 3)
+
+
+class TestYahooAuction_listing_cache(TestCase):
+
+    def setUp(self) -> None:
+        self.urls = [f"https://page.auctions.yahoo.co.jp/jp/auction/x{i}" for i in range(3)]
+        self.iter_urls = mock.Mock(side_effect=lambda: iter(self.urls))
+
+    def test_disabled(self) -> None:
+        yah = yahoo_auction.YahooAuction()
+        with mock.patch.object(yah, "iter_urls_selling", self.iter_urls):
+            yah.urls_selling
+            yah.urls_selling
+        self.assertEqual(self.iter_urls.call_count, 2)
+
+    def test_enabled(self) -> None:
+        yah = yahoo_auction.YahooAuction(listing_ttl=60)
+        with mock.patch.object(yah, "iter_urls_selling", self.iter_urls):
+            self.assertEqual(yah.urls_selling, self.urls)
+            self.assertEqual(yah.aIDs_selling, ["x0", "x1", "x2"])
+        self.assertEqual(self.iter_urls.call_count, 1)
+        self.assertEqual((yah.listing_cache_stats.hits, yah.listing_cache_stats.misses), (1, 1))
+
+    def test_copy(self) -> None:
+        yah = yahoo_auction.YahooAuction(listing_ttl=60)
+        with mock.patch.object(yah, "iter_urls_selling", self.iter_urls):
+            yah.urls_selling.clear()
+            self.assertEqual(yah.urls_selling, self.urls)
+
+    def test_refresh(self) -> None:
+        yah = yahoo_auction.YahooAuction(listing_ttl=60)
+        with mock.patch.object(yah, "iter_urls_selling", self.iter_urls):
+            yah.urls_selling
+            yah.refresh()
+            yah.urls_selling
+        self.assertEqual(self.iter_urls.call_count, 2)
+
+    def test_cancel(self) -> None:
+        yah = yahoo_auction.YahooAuction(listing_ttl=60, cancel_backend="browser")
+        driver = mock.MagicMock()
+        type(driver).current_url = mock.PropertyMock(side_effect=[urls.HOME, urls.HOME, urls.MYPAGE])
+        chrome = mock.MagicMock()
+        chrome.return_value.__enter__.return_value = driver
+        with mock.patch.object(yah, "iter_urls_selling", self.iter_urls), \
+                mock.patch("yahoo_auction_auto.webdriver.chrome", chrome), \
+                mock.patch("yahoo_auction_auto.webdriver.ChromeOptions"):
+            yah.urls_selling
+            yah.cancel("x0")
+            yah.urls_selling
+        self.assertEqual(self.iter_urls.call_count, 2)
+
+
+class TestYahooAuction_get_info_selling(TestCase):
+
+    def setUp(self) -> None:
+        self.server = server.LocalServer().__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        with open("tests/info/test_selling.html", "rb") as f:
+            self.body = f.read()
+
+        def item(request: server.Request) -> server.Response:
+            if request.headers.get("If-None-Match") == '"v1"':
+                return server.Response(304)
+            return server.Response(body=self.body, headers={"ETag": '"v1"'})
+        self.server.route("/jp/auction/10000000000", item)
+        patcher = mock.patch(
+            "yahoo_auction_auto.urls.get_auction_url",
+            lambda aID: self.server.url(f"/jp/auction/{aID}")
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_get_info_selling(self) -> None:
+        for parser in parsing.PARSERS:
+            with self.subTest(parser), yahoo_auction.YahooAuction(parser=parser) as yah:
+                self.assertEqual(yah.get_info_selling("10000000000"), info.InfoSelling.fromhtml(self.body))
+
+    def test_not_found(self) -> None:
+        with yahoo_auction.YahooAuction() as yah:
+            with self.assertRaises(requests.HTTPError):
+                yah.get_info_selling("x0")
+
+    def test_instrumentation(self) -> None:
+        aggregator = instrument.Aggregator()
+        with yahoo_auction.YahooAuction(instrumentation=instrument.Instrumentation([aggregator])) as yah:
+            yah.get_info_selling("10000000000")
+        summary = aggregator.summary()
+        self.assertLessEqual(
+            {"get_info_selling", "http.item", "parse.item", "parse.field.(tree)", "parse.field.aID"},
+            set(summary)
+        )
+        self.assertEqual(summary["http.item"].bytes, len(self.body))
+        self.assertEqual(summary["parse.field.count_watch"].count, 1)
+
+    def test_rate_limiter(self) -> None:
+        in_flight = peak = 0
+        lock = threading.Lock()
+
+        def item(request: server.Request) -> server.Response:
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+                if in_flight >= 2:
+                    return server.Response(503, headers={"Retry-After": "0"})
+            return server.Response(body=self.body)
+        aIDs = [f"x{i}" for i in range(40)]
+        for aID in aIDs:
+            self.server.route(f"/jp/auction/{aID}", item)
+        limiter = ratelimit.RateLimiter(rate=None, max_concurrency=4)
+        with yahoo_auction.YahooAuction(rate_limiter=limiter) as yah:
+            results = dict(yah.get_info_selling_many(aIDs, max_workers=8))
+        self.assertEqual(set(results), set(aIDs))
+        self.assertLessEqual(peak, 4)
+        self.assertGreater(limiter.stats.throttled, 0)
+        self.assertGreater(limiter.stats.decreases, 0)
+        self.assertEqual(limiter.stats.requests, 40)
+
+    def test_retry_policy(self) -> None:
+        statuses = iter([503, 200])
+        self.server.route(
+            "/jp/auction/10000000000",
+            lambda request: server.Response(next(statuses), body=self.body)
+        )
+        policy = retry.RetryPolicy(backoff=0)
+        with yahoo_auction.YahooAuction(retry_policy=policy) as yah:
+            self.assertEqual(yah.get_info_selling("10000000000"), info.InfoSelling.fromhtml(self.body))
+        self.assertEqual(policy.stats.retries, 1)
+        with mock.patch.object(policy, "close") as close:
+            yahoo_auction.YahooAuction(retry_policy=policy).close()
+        close.assert_called_once_with()
+
+    def test_stream_items(self) -> None:
+        # Incompressible padding after the fields, which a streamed read should never reach.
+        padding = b"<p>" + random.Random(0).randbytes(50000).hex().encode() + b"</p>"
+        body = self.body.replace(b"</body>", padding + b"</body>")
+        for encoding, content in [("gzip", gzip.compress(body)), ("identity", body)]:
+            with self.subTest(encoding):
+                self.server.route(
+                    "/jp/auction/10000000000",
+                    server.Response(body=content, headers={"Content-Encoding": encoding})
+                )
+                aggregator = instrument.Aggregator()
+                with yahoo_auction.YahooAuction(
+                    stream_items=True,
+                    stream_chunk_size=1024,
+                    instrumentation=instrument.Instrumentation([aggregator])
+                ) as yah:
+                    self.assertEqual(yah.get_info_selling("10000000000"), info.InfoSelling.fromhtml(self.body))
+                    with self.assertRaises(requests.HTTPError):
+                        yah.get_info_selling("x0")
+                self.assertIn("gzip", self.server.requests[-2].headers["Accept-Encoding"])
+                self.assertLess(aggregator.summary()["get_info_selling"].bytes, len(content) // 10)
+
+    def test_parse_executor(self) -> None:
+        self.server.route("/jp/auction/10000000001", lambda request: server.Response(404))
+        with concurrent.futures.ProcessPoolExecutor(2) as executor:
+            with yahoo_auction.YahooAuction(parse_executor=executor) as yah:
+                results = dict(yah.get_info_selling_many(["10000000000", "10000000001"]))
+        self.assertEqual(results["10000000000"], info.InfoSelling.fromhtml(self.body))
+        self.assertIsInstance(results["10000000001"], requests.HTTPError)
+
+    def test_http_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            http_cache = httpcache.HTTPCache(directory)
+            with yahoo_auction.YahooAuction(http_cache=http_cache) as yah:
+                first = yah.get_info_selling("10000000000")
+                self.assertEqual(yah.get_info_selling("10000000000"), first)
+            self.assertEqual(http_cache.stats.revalidated, 1)
+            self.assertEqual(http_cache.stats.bytes_saved, len(self.body))
+
+
+class TestYahooAuction_snapshot(TestCase):
+
+    def setUp(self) -> None:
+        self.server = server.LocalServer().__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        # The first pages are answered only when all three are requested at once.
+        barrier = threading.Barrier(3, timeout=5)
+        pages = {
+            "selling": (make_listing_page(["s0", "s1", "c0"], self.server.url("/selling2")), "tc"),
+            "with_winner": (make_listing_page(["c0", "c1", "c1"], None, "ttlc"), "ttlc"),
+            "without_winner": (make_listing_page(["n0"], None, "ttlc"), "ttlc"),
+        }
+        for name, (body, _) in pages.items():
+            def page(request: server.Request, body: bytes = body) -> server.Response:
+                barrier.wait()
+                return server.Response(body=body)
+            self.server.route(f"/{name}", page)
+        self.server.route("/selling2", server.Response(body=make_listing_page(["s2"], None)))
+        targets = [
+            ("urls.SELLING", self.server.url("/selling")),
+            ("urls.CLOSED_WITH_WINNER", self.server.url("/with_winner")),
+            ("urls.CLOSED_WITHOUT_WINNER", self.server.url("/without_winner")),
+        ]
+        for target, new in targets:
+            patcher = mock.patch(f"yahoo_auction_auto.{target}", new)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.yah = yahoo_auction.YahooAuction(listing_ttl=60)
+        self.addCleanup(self.yah.close)
+
+    def test_snapshot(self) -> None:
+        before = datetime.datetime.now(datetime.timezone.utc)
+        snapshot = self.yah.snapshot()
+        self.assertLessEqual(before, snapshot.timestamp)
+        self.assertEqual(snapshot.selling, ["s0", "s1", "s2"])
+        self.assertEqual(snapshot.closed_with_winner, ["c0", "c1"])
+        self.assertEqual(snapshot.closed_without_winner, ["n0"])
+        self.assertEqual(sorted(snapshot.aIDs), ["c0", "c1", "n0", "s0", "s1", "s2"])
+        self.assertEqual(len(self.server.requests), 4)
+
+    def test_error(self) -> None:
+        self.server.route("/selling2", server.Response(500))
+        with self.assertRaises(requests.HTTPError):
+            self.yah.snapshot()
+
+
+class TestYahooAuction_get_info_closed(TestCase):
+
+    def setUp(self) -> None:
+        self.server = server.LocalServer().__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.bodies: dict[str, bytes] = {}
+        for kind in ("with_winner", "without_winner"):
+            with open(f"tests/info/test_closed_{kind}.html", "rb") as f:
+                self.bodies[kind] = f.read()
+            aIDs = [f"{kind}{i}" for i in range(5)]
+            self.server.route(f"/{kind}", server.Response(body=make_listing_page(aIDs, None, "ttlc")))
+            for aID in aIDs:
+                self.server.route(f"/jp/auction/{aID}", server.Response(body=self.bodies[kind]))
+        targets: list[tuple[str, t.Any]] = [
+            ("urls.CLOSED_WITH_WINNER", self.server.url("/with_winner")),
+            ("urls.CLOSED_WITHOUT_WINNER", self.server.url("/without_winner")),
+            ("urls.get_auction_url", lambda aID: self.server.url(f"/jp/auction/{aID}")),
+        ]
+        for target, new in targets:
+            patcher = mock.patch(f"yahoo_auction_auto.{target}", new)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.yah = yahoo_auction.YahooAuction(max_workers=4)
+        self.addCleanup(self.yah.close)
+
+    def test_with_winner(self) -> None:
+        expected = info.InfoClosedWithWinner.fromhtml(self.bodies["with_winner"])
+        self.assertEqual(self.yah.get_info_closed_with_winner("with_winner0"), expected)
+        results = dict(self.yah.get_info_closed_with_winner_many())
+        self.assertEqual(results, {f"with_winner{i}": expected for i in range(5)})
+
+    def test_without_winner(self) -> None:
+        expected = info.InfoClosedWithoutWinner.fromhtml(self.bodies["without_winner"])
+        self.assertEqual(self.yah.get_info_closed_without_winner("without_winner0"), expected)
+        results = list(self.yah.get_info_closed_without_winner_many(["without_winner1", "x"], ordered=True))
+        self.assertEqual(results[0], ("without_winner1", expected))
+        self.assertIsInstance(results[1][1], requests.HTTPError)
+
+
+class TestYahooAuction_cancel_many(TestCase):
+
+    def setUp(self) -> None:
+        self.drivers: list[fakedriver.FakeDriver] = []
+
+        def start_chrome(options: t.Any) -> fakedriver.FakeDriver:
+            driver = fakedriver.FakeDriver(broken=["aID=bad"])
+            self.drivers.append(driver)
+            return driver
+        for target, new in [("start_chrome", start_chrome), ("ChromeOptions", mock.Mock())]:
+            patcher = mock.patch(f"yahoo_auction_auto.webdriver.{target}", new)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_cancel_many(self) -> None:
+        yah = yahoo_auction.YahooAuction(driver_pool_size=2, cancel_backend="browser")
+        results = yah.cancel_many(["x0", "bad", "x1", "x2"])
+        self.assertEqual(set(results), {"x0", "bad", "x1", "x2"})
+        self.assertIsInstance(results.pop("bad"), LookupError)
+        self.assertEqual(set(results.values()), {None})
+        self.assertLessEqual(len(self.drivers), 3)
+        self.assertTrue(all(driver.quitted for driver in self.drivers))
+        visited = {url for driver in self.drivers for url in driver.visited}
+        self.assertLessEqual({urls.get_cancel_url(aID) for aID in ["x0", "x1", "x2"]}, visited)
+
+
+class TestYahooAuction_cancel_http(TestCase):
+
+    def setUp(self) -> None:
+        self.server = server.LocalServer().__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        with open("tests/test_cancelauction.html", "rb") as f:
+            self.server.route("/jp/show/cancelauction", server.Response(body=f.read()))
+        self.done = server.Response(
+            body='<html><head><meta charset="utf-8"></head><body><p>オークションを取り消しました。</p></body></html>'.encode()
+        )
+        self.server.route("/jp/config/cancelauction", self.done)
+        self.drivers: list[fakedriver.FakeDriver] = []
+
+        def start_chrome(options: t.Any) -> fakedriver.FakeDriver:
+            driver = fakedriver.FakeDriver()
+            self.drivers.append(driver)
+            return driver
+        targets: list[tuple[str, t.Any]] = [
+            ("urls.get_cancel_url", lambda aID: self.server.url(f"/jp/show/cancelauction?aID={aID}")),
+            ("webdriver.start_chrome", start_chrome),
+            ("webdriver.ChromeOptions", mock.Mock()),
+        ]
+        for target, new in targets:
+            patcher = mock.patch(f"yahoo_auction_auto.{target}", new)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.yah = yahoo_auction.YahooAuction(cookies=[{"name": "B", "value": "b"}])
+        self.addCleanup(self.yah.close)
+
+    def test_post(self) -> None:
+        self.yah.cancel("x1000000001")
+        self.assertEqual(self.drivers, [])
+        get, post = self.server.requests
+        self.assertEqual((get.method, post.method), ("GET", "POST"))
+        self.assertEqual(post.path, "/jp/config/cancelauction")
+        self.assertEqual(post.headers.get("Cookie"), "B=b")
+        self.assertEqual(
+            parse.parse_qs(post.body.decode(), keep_blank_values=True),
+            {
+                "aID": ["x1000000001"],
+                ".crumb": ["b6c3c78b06777858bd0058eb60bfa2c6"],
+                "cancel_fee": ["0"],
+                "cancel_reason": [""],
+                "confirm": ["取り消す"],
+            }
+        )
+
+    def test_fallback(self) -> None:
+        with self.subTest("not confirmed"):
+            with open("tests/test_cancelauction.html", "rb") as f:
+                self.server.route("/jp/config/cancelauction", server.Response(body=f.read()))
+            with self.assertLogs("yahoo_auction_auto.yahoo_auction", "WARNING"):
+                self.yah.cancel("x1000000001")
+            self.assertEqual(len(self.drivers), 1)
+        with self.subTest("error"):
+            self.server.route("/jp/config/cancelauction", server.Response(500))
+            with self.assertLogs("yahoo_auction_auto.yahoo_auction", "WARNING"):
+                self.yah.cancel("x1000000001")
+            self.assertEqual(len(self.drivers), 2)
+        with self.subTest("error page"):
+            error = '<html><head><meta charset="utf-8"></head><body><p>エラーが発生しました。</p></body></html>'
+            self.server.route("/jp/config/cancelauction", server.Response(body=error.encode()))
+            with self.assertLogs("yahoo_auction_auto.yahoo_auction", "WARNING"):
+                self.yah.cancel("x1000000001")
+            self.assertEqual(len(self.drivers), 3)
+        with self.subTest("login"):
+            self.server.route(
+                "/jp/config/cancelauction",
+                server.Response(302, headers={"Location": self.server.url("/login/config/login")})
+            )
+            self.server.route("/login/config/login", server.Response(body=b"<html><body></body></html>"))
+            with mock.patch("yahoo_auction_auto.urls.LOGIN", self.server.url("/login/")):
+                with self.assertLogs("yahoo_auction_auto.yahoo_auction", "WARNING") as logs:
+                    self.yah.cancel("x1000000001")
+            self.assertIn("login", "\n".join(logs.output))
+            self.assertEqual(len(self.drivers), 4)
+
+    def test_no_form(self) -> None:
+        self.server.route("/jp/show/cancelauction", self.done)
+        with self.assertRaises(RuntimeError):
+            self.yah._cancel_http("x1000000001")
+        with self.subTest("error"):
+            self.server.route("/jp/show/cancelauction", server.Response(500))
+            with self.assertLogs("yahoo_auction_auto.yahoo_auction", "WARNING"):
+                self.yah.cancel("x1000000001")
+            self.assertEqual(len(self.drivers), 1)
+            self.assertEqual([request.method for request in self.server.requests], ["GET", "GET"])
+
+    def test_lost_response(self) -> None:
+        def post(request: server.Request) -> server.Response:
+            self.server.route("/jp/show/cancelauction", self.done)
+            return server.Response(502)
+        self.server.route("/jp/config/cancelauction", post)
+        with self.assertRaisesRegex(RuntimeError, "may have taken effect"):
+            self.yah.cancel("x1000000001")
+        self.assertEqual(self.drivers, [])
+        self.assertEqual([request.method for request in self.server.requests], ["GET", "POST", "GET"])
+
+    def test_cancel_many(self) -> None:
+        results = self.yah.cancel_many([f"x{i}" for i in range(5)])
+        self.assertEqual(results, {f"x{i}": None for i in range(5)})
+        self.assertEqual(self.drivers, [])
+
+
+class TestYahooAuction_is_login(TestCase):
+
+    def setUp(self) -> None:
+        self.server = server.LocalServer().__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        patcher = mock.patch("yahoo_auction_auto.urls.MYPAGE", self.server.url("/mystatus"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_login(self) -> None:
+        self.server.route("/mystatus", server.Response(body=b"x" * 1024 * 1024))
+        with yahoo_auction.YahooAuction() as yah:
+            self.assertTrue(yah.is_login)
+
+    def test_redirect(self) -> None:
+        self.server.route("/mystatus", server.Response(302, headers={"Location": self.server.url("/login")}))
+        self.server.route("/login", server.Response(body=b"login"))
+        with yahoo_auction.YahooAuction() as yah:
+            self.assertFalse(yah.is_login)
+        self.assertEqual([request.path for request in self.server.requests], ["/mystatus"])
+
+    def test_error(self) -> None:
+        self.server.route("/mystatus", server.Response(500))
+        with yahoo_auction.YahooAuction() as yah:
+            self.assertFalse(yah.is_login)
+
+    def test_cache(self) -> None:
+        self.server.route("/mystatus", server.Response())
+        with yahoo_auction.YahooAuction(login_ttl=60) as yah:
+            self.assertTrue(yah.is_login)
+            self.assertTrue(yah.is_login)
+        with yahoo_auction.YahooAuction(login_ttl=0) as yah:
+            self.assertTrue(yah.is_login)
+        self.assertEqual(len(self.server.requests), 2)
+        with yahoo_auction.YahooAuction(login_ttl=60) as yah:
+            self.assertTrue(yah.is_login)
+            self.server.route("/mystatus", server.Response(302, headers={"Location": "/login"}))
+            self.assertTrue(yah.is_login)
+            self.assertFalse(yah.check_login())
+            self.assertFalse(yah.is_login)
+        self.assertEqual(len(self.server.requests), 4)
@@ -4,11 +4,21 @@ __version__ = "0.0.0"
 from .yahoo_auction import YahooAuction  # noqa
 from .info import (  # noqa
     InfoSelling,
+    InfoSellingBatch,
     InfoClosedWithWinner,
-    InfoClosedWithoutWinner
+    InfoClosedWithoutWinner,
+    InfoSummary
 )
 from .cookie import (  # noqa
     Cookie,
+    CookieStore,
     get_cookies,
     get_username_and_cookies
 )
+from .instrument import (  # noqa
+    Instrumentation,
+    Aggregator
+)
+from .ratelimit import RateLimiter  # noqa
+from .retry import RetryPolicy  # noqa
+from .scheduler import Scheduler  # noqa
@@ -0,0 +1,7 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+import sys
+
+from yahoo_auction_auto import cli
+
+
+sys.exit(cli.main())
@@ -0,0 +1,85 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+import dataclasses
+import threading
+import time
+import typing as t
+
+
+K = t.TypeVar("K")
+V = t.TypeVar("V")
+
+
+@dataclasses.dataclass()
+class CacheStats:
+    hits: int = 0
+    """The number of lookups answered from the cache."""
+    misses: int = 0
+    """The number of lookups which computed a value."""
+    invalidations: int = 0
+    """The number of entries dropped before they expired."""
+
+
+class TTLCache(t.Generic[K, V]):
+    """Thread-safe cache whose entries expire after a time to live.
+
+    Parameters
+    ----------
+    clock : Callable[[], float]
+        The clock in second to expire entries.
+    """
+
+    def __init__(self, clock: t.Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._entries: dict[K, tuple[float, V]] = {}
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+        self._generation = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        """A copy of the statistics of the cache."""
+        with self._lock:
+            return dataclasses.replace(self._stats)
+
+    def get_or_set(self, key: K, factory: t.Callable[[], V], ttl: float) -> V:
+        """Get the value of `key`, computing it by `factory` if missing or expired.
+
+        Parameters
+        ----------
+        key : K
+            The key of the entry.
+        factory : Callable[[], V]
+            The function to compute the value.
+            It is called without holding the lock, and its value is not
+            stored if the cache is invalidated meanwhile.
+        ttl : float
+            The time to live of a new entry in second.
+
+        Returns
+        -------
+        V
+        """
+        with self._lock:
+            if (entry := self._entries.get(key)) is not None:
+                expires, value = entry
+                if self._clock() < expires:
+                    self._stats.hits += 1
+                    return value
+                del self._entries[key]
+            self._stats.misses += 1
+            generation = self._generation
+        value = factory()
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = (self._clock() + ttl, value)
+        return value
+
+    def invalidate(self, key: K | None = None) -> None:
+        """Drop the entry of `key`, or all entries if `key` is None."""
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._stats.invalidations += len(self._entries)
+                self._entries.clear()
+            elif self._entries.pop(key, None) is not None:
+                self._stats.invalidations += 1
@@ -0,0 +1,253 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+"""Command line interface.
+
+Usage::
+
+    $ yahoo-auction-auto --cookies cookies.json list [--category selling] [--format text|ndjson|summary]
+    $ yahoo-auction-auto --cookies cookies.json dump [--category selling] [--format ndjson|csv] [AID ...]
+    $ yahoo-auction-auto --cookies cookies.json list | yahoo-auction-auto --cookies cookies.json dump -
+    $ yahoo-auction-auto --account a=a.json --account b=b.json [--shard 0/2] dump
+
+Records are written as soon as they are fetched, so memory use does not
+grow with the number of items.
+
+With --account, the command runs for each account through a Scheduler and
+each record is written with the name of its account. --shard runs only
+one shard of the accounts, so several processes given the same accounts
+can split them.
+"""
+import argparse
+import concurrent.futures
+import csv
+import dataclasses
+import json
+import logging
+import os
+import sys
+import typing as t
+
+from yahoo_auction_auto import cookie, info, parsing, ratelimit, retry, scheduler, yahoo_auction
+
+
+logger = logging.getLogger(__name__)
+
+CATEGORIES = ("selling", "closed_with_winner", "closed_without_winner")
+INFO_CLASSES: dict[str, type[t.Any]] = {
+    "selling": info.InfoSelling,
+    "closed_with_winner": info.InfoClosedWithWinner,
+    "closed_without_winner": info.InfoClosedWithoutWinner,
+}
+
+
+def main(argv: t.Sequence[str] | None = None) -> int:
+    """Run the command with `argv` and get the exit status."""
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.shard is not None and not args.account:
+        parser.error("--shard requires --account")
+    if args.account and getattr(args, "aIDs", None):
+        parser.error("AID cannot be given with --account")
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s: %(message)s")
+    parse_executor = concurrent.futures.ProcessPoolExecutor(args.processes) if args.processes else None
+    target: yahoo_auction.YahooAuction | scheduler.Scheduler
+    if args.account:
+        paths = dict(args.account)
+        names = scheduler.shard(paths, *args.shard) if args.shard is not None else list(paths)
+        target = scheduler.Scheduler(
+            {name: _create(args, paths[name], parse_executor) for name in names}, args.max_workers
+        )
+        command = args.accounts_command
+    else:
+        target = _create(args, args.cookies, parse_executor)
+        command = args.command
+    try:
+        status: int = command(target, args)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # The reader such as `head` quit. Silence the error on closing stdout.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    finally:
+        target.close()
+        if parse_executor is not None:
+            parse_executor.shutdown(cancel_futures=True)
+    return status
+
+
+def list_aIDs(yah: yahoo_auction.YahooAuction, args: argparse.Namespace) -> int:
+    if args.format == "summary":
+        summaries: t.Iterator[info.InfoSummary] = getattr(yah, f"iter_summaries_{args.category}")()
+        for summary in summaries:
+            sys.stdout.write(json.dumps(info.batch.asrecord(summary), ensure_ascii=False) + "\n")
+        return 0
+    aIDs: t.Iterator[str] = getattr(yah, f"iter_aIDs_{args.category}")()
+    if args.format == "ndjson":
+        for aID in aIDs:
+            sys.stdout.write(json.dumps({"aID": aID, "category": args.category}) + "\n")
+    else:
+        for aID in aIDs:
+            sys.stdout.write(aID + "\n")
+    return 0
+
+
+def dump(yah: yahoo_auction.YahooAuction, args: argparse.Namespace) -> int:
+    aIDs: t.Iterable[str]
+    if args.aIDs == ["-"]:
+        aIDs = (line.strip() for line in sys.stdin if line.strip())
+    elif args.aIDs:
+        aIDs = args.aIDs
+    else:
+        aIDs = getattr(yah, f"iter_aIDs_{args.category}")()
+    write = _writer(args.format, _fieldnames(INFO_CLASSES[args.category]))
+    failed = 0
+    get_info_many = getattr(yah, f"get_info_{args.category}_many")
+    for aID, result in get_info_many(aIDs, args.max_workers, args.ordered):
+        if isinstance(result, Exception):
+            failed += 1
+            logger.warning("Failed to get %s: %s", aID, result)
+        else:
+            write(info.batch.asrecord(result))
+    return 1 if failed else 0
+
+
+def list_accounts(accounts: scheduler.Scheduler, args: argparse.Namespace) -> int:
+    method = "iter_summaries" if args.format == "summary" else "iter_aIDs"
+    failed = 0
+    for name, result in accounts.each(lambda yah: list(getattr(yah, f"{method}_{args.category}")())).items():
+        if isinstance(result, Exception):
+            failed += 1
+            logger.warning("Failed to list %s: %s", name, result)
+            continue
+        for record in result:
+            if args.format == "summary":
+                line = json.dumps({"account": name, **info.batch.asrecord(record)}, ensure_ascii=False)
+            elif args.format == "ndjson":
+                line = json.dumps({"account": name, "aID": record, "category": args.category})
+            else:
+                line = f"{name}\t{record}"
+            sys.stdout.write(line + "\n")
+    return 1 if failed else 0
+
+
+def dump_accounts(accounts: scheduler.Scheduler, args: argparse.Namespace) -> int:
+    write = _writer(args.format, ["account", *_fieldnames(INFO_CLASSES[args.category])])
+    failed = 0
+    items = {name: getattr(yah, f"iter_aIDs_{args.category}")() for name, yah in accounts.accounts.items()}
+    get_info = getattr(yahoo_auction.YahooAuction, f"get_info_{args.category}")
+    for name, aID, result in accounts.map(get_info, items):
+        if isinstance(result, Exception):
+            failed += 1
+            logger.warning("Failed to get %s of %s: %s", aID or "the listing", name, result)
+        else:
+            write({"account": name, **info.batch.asrecord(result)})
+    return 1 if failed else 0
+
+
+def _fieldnames(cls: type[t.Any]) -> list[str]:
+    return [field.name for field in dataclasses.fields(cls)]
+
+
+def _writer(format: str, fieldnames: list[str]) -> t.Callable[[dict[str, t.Any]], None]:
+    """Get the function to write a record with `fieldnames` to stdout in `format`."""
+    if format == "ndjson":
+        def write_ndjson(record: dict[str, t.Any]) -> None:
+            sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return write_ndjson
+    writer = csv.DictWriter(sys.stdout, fieldnames)
+    writer.writeheader()
+
+    def write_csv(record: dict[str, t.Any]) -> None:
+        writer.writerow(record)
+    return write_csv
+
+
+def _create(
+    args: argparse.Namespace,
+    cookies_path: str | None,
+    parse_executor: concurrent.futures.Executor | None
+) -> yahoo_auction.YahooAuction:
+    store = None if cookies_path is None else cookie.CookieStore(cookies_path)
+    cookies = cookie.get_cookies(args.chrome_arg, store)
+    rate_limiter = None
+    if args.rate is not None or args.max_concurrency is not None:
+        rate_limiter = ratelimit.RateLimiter(
+            args.rate,
+            burst=max(int(args.rate or 1), 1),
+            max_concurrency=args.max_concurrency or args.max_workers
+        )
+    return yahoo_auction.YahooAuction(
+        cookies,
+        timeout=args.timeout,
+        chrome_args=args.chrome_arg,
+        max_workers=args.max_workers,
+        pool_maxsize=args.max_workers,
+        parser=args.parser,
+        rate_limiter=rate_limiter,
+        retry_policy=None if args.retries == 0 else retry.RetryPolicy(args.retries, hedge=args.hedge),
+        parse_executor=parse_executor
+    )
+
+
+def _account(value: str) -> tuple[str, str]:
+    name, separator, path = value.partition("=")
+    if not name or not separator or not path:
+        raise argparse.ArgumentTypeError(f"expected NAME=COOKIES: {value!r}")
+    return name, path
+
+
+def _shard(value: str) -> tuple[int, int]:
+    try:
+        index, count = map(int, value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected INDEX/COUNT: {value!r}") from None
+    if not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"INDEX must be in [0, COUNT): {value!r}")
+    return index, count
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="yahoo-auction-auto",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    accounts = parser.add_mutually_exclusive_group()
+    accounts.add_argument("--cookies", help="JSON file to reuse and save cookies (see CookieStore)")
+    accounts.add_argument(
+        "--account",
+        type=_account,
+        action="append",
+        metavar="NAME=COOKIES",
+        help="name and cookie file of an account; repeat to run the command for many accounts"
+    )
+    parser.add_argument(
+        "--shard", type=_shard, metavar="INDEX/COUNT", help="run only the INDEX-th of COUNT shards of the accounts"
+    )
+    parser.add_argument("--chrome-arg", action="append", default=[], help="argument for Chrome to log in")
+    parser.add_argument("--max-workers", type=int, default=8, help="maximum number of concurrent requests")
+    parser.add_argument("--rate", type=float, help="maximum requests per second")
+    parser.add_argument("--max-concurrency", type=int, help="upper bound of the adaptive concurrency")
+    parser.add_argument("--retries", type=int, default=2, help="retries of a failed page fetch")
+    parser.add_argument("--hedge", action="store_true", help="hedge requests slower than p95")
+    parser.add_argument("--timeout", type=int, default=60, help="time to wait for a response in second")
+    parser.add_argument("--parser", choices=parsing.PARSERS, default="lxml", help="backend to parse pages")
+    parser.add_argument("--processes", type=int, help="parse item pages in this many processes")
+    subparsers = parser.add_subparsers(dest="subcommand", metavar="COMMAND", required=True)
+
+    list_parser = subparsers.add_parser("list", help="stream auction IDs of a listing")
+    list_parser.add_argument("--category", choices=CATEGORIES, default="selling")
+    list_parser.add_argument(
+        "--format",
+        choices=("text", "ndjson", "summary"),
+        default="text",
+        help="'summary' writes the title, price, bids and time left in each row of the listing as NDJSON"
+    )
+    list_parser.set_defaults(command=list_aIDs, accounts_command=list_accounts)
+
+    dump_parser = subparsers.add_parser("dump", help="stream information of items of a listing")
+    dump_parser.add_argument("aIDs", nargs="*", metavar="AID", help="auction IDs, '-' for stdin, all if omitted")
+    dump_parser.add_argument("--category", choices=CATEGORIES, default="selling")
+    dump_parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    dump_parser.add_argument("--ordered", action="store_true", help="write in the order of auction IDs")
+    dump_parser.set_defaults(command=dump, accounts_command=dump_accounts)
+    return parser
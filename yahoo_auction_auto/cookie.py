@@ -1,38 +1,119 @@
 # Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+import contextlib
+import json
+import os
+import pathlib
 import time
 import typing as t
 
-from selenium.webdriver.common import by
-
-from yahoo_auction_auto import urls, webdriver
+from yahoo_auction_auto import instrument, urls, webdriver
 
 
 Cookie = dict[str, t.Any]
 
 
-def get_cookies(chrome_args: t.Iterable[str] | None = None) -> list[Cookie]:
+class CookieStore:
+    """JSON file of a username and cookies to reuse them across processes.
+
+    Parameters
+    ----------
+    path : str | os.PathLike[str]
+        The file to store cookies.
+    margin : float
+        Time in second before `expiry` of a cookie from which it is treated as expired.
+    clock : Callable[[], float]
+        The clock in epoch second.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        margin: float = 60,
+        clock: t.Callable[[], float] = time.time
+    ) -> None:
+        self.path = pathlib.Path(path)
+        self.margin = margin
+        self._clock = clock
+
+    def load(self) -> tuple[str, list[Cookie]] | None:
+        """Load the username and cookies.
+
+        Returns
+        -------
+        tuple[str, list[yahoo_auction_auto.cookie.Cookie]] | None
+            The username and cookies, or None if the file is missing, broken,
+            or any cookie with `expiry` has expired.
+        """
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            username, cookies = str(data["username"]), list(data["cookies"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if not cookies:
+            return None
+        now = self._clock()
+        for _cookie in cookies:
+            if "expiry" in _cookie and _cookie["expiry"] - self.margin <= now:
+                return None
+        return username, cookies
+
+    def save(self, username: str, cookies: t.Iterable[Cookie]) -> None:
+        """Save the username and cookies. The file is readable only by the owner."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"username": username, "cookies": list(cookies)}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def clear(self) -> None:
+        """Remove the file."""
+        self.path.unlink(missing_ok=True)
+
+
+def get_cookies(
+    chrome_args: t.Iterable[str] | None = None,
+    store: CookieStore | None = None,
+    instrumentation: instrument.Instrumentation | None = None
+) -> list[Cookie]:
     """Get cookies of Yahoo!Auction.
 
     Parameters
     ----------
     chrome_args : Iterable[str] | None
         Arguments of Chrome.
+    store : yahoo_auction_auto.cookie.CookieStore | None
+        The store to reuse cookies from without launching Chrome.
+    instrumentation : yahoo_auction_auto.instrument.Instrumentation | None
+        Reports "browser.start" and "browser.navigate" spans if given.
 
     Returns
     -------
     list[yahoo_auction_auto.cookie.Cookie]
     """
-    _, cookies = get_username_and_cookies(chrome_args)
+    _, cookies = get_username_and_cookies(chrome_args, store, instrumentation)
     return cookies
 
 
-def get_username_and_cookies(chrome_args: t.Iterable[str] | None = None) -> tuple[str, list[Cookie]]:
+def get_username_and_cookies(
+    chrome_args: t.Iterable[str] | None = None,
+    store: CookieStore | None = None,
+    instrumentation: instrument.Instrumentation | None = None
+) -> tuple[str, list[Cookie]]:
     """Get username and cookies of Yahoo!Auction.
 
+    If `store` has unexpired cookies, they are returned without launching
+    Chrome. Otherwise cookies are taken from Chrome and saved in `store`.
+
     Parameters
     ----------
     chrome_args : Iterable[str] | None
         Arguments of Chrome.
+    store : yahoo_auction_auto.cookie.CookieStore | None
+        The store to reuse and save cookies.
+    instrumentation : yahoo_auction_auto.instrument.Instrumentation | None
+        Reports "browser.start" and "browser.navigate" spans if given.
+        The navigation includes the time waiting for the user to log in.
 
     Returns
     -------
@@ -41,16 +122,24 @@ def get_username_and_cookies(chrome_args: t.Iterable[str] | None = None) -> tupl
     cookies : list[yahoo_auction_auto.cookie.Cookie]
         The cookies
     """
+    if store is not None and (loaded := store.load()) is not None:
+        return loaded
     chrome_options = webdriver.ChromeOptions()
     for arg in chrome_args or []:
         chrome_options.add_argument(arg)
-    with webdriver.chrome(chrome_options) as driver:
-        driver.get(urls.MYPAGE)
-        while driver.current_url != urls.MYPAGE:
-            time.sleep(1)
+    instrumentation = instrumentation or instrument.Instrumentation()
+    with contextlib.ExitStack() as stack:
+        with instrumentation.span("browser.start"):
+            driver = stack.enter_context(webdriver.chrome(chrome_options))
+        with instrumentation.span("browser.navigate", url=urls.MYPAGE):
+            driver.get(urls.MYPAGE)
+            while driver.current_url != urls.MYPAGE:
+                time.sleep(1)
         username = driver \
-            .find_element(by.By.CLASS_NAME, "yjmthloginarea") \
-            .find_element(by.By.TAG_NAME, "strong") \
+            .find_element(webdriver.By.CLASS_NAME, "yjmthloginarea") \
+            .find_element(webdriver.By.TAG_NAME, "strong") \
             .text
         cookies = driver.get_cookies()  # type: ignore
+    if store is not None:
+        store.save(str(username), cookies)
     return str(username), list(cookies)
@@ -0,0 +1,181 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+import contextlib
+import dataclasses
+import threading
+import types
+import typing as t
+
+from yahoo_auction_auto import cookie, instrument, urls, webdriver, workers
+
+
+@dataclasses.dataclass()
+class _PooledDriver:
+    driver: "webdriver.Chrome"
+    uses: int = 0
+
+
+class DriverPool:
+    """Pool of Chrome drivers logged in Yahoo!Auction.
+
+    Drivers are started on demand up to `size` and reused. A driver is
+    quit and replaced after `max_uses` uses, when its health check fails,
+    or when an exception is raised while it is used.
+
+    Parameters
+    ----------
+    cookies : Iterable[yahoo_auction_auto.cookie.Cookie]
+        Cookies to log in.
+    chrome_args : Iterable[str]
+        Arguments for Chrome.
+    size : int
+        Maximum number of drivers.
+    max_uses : int
+        The number of uses after which a driver is replaced.
+    instrumentation : yahoo_auction_auto.instrument.Instrumentation | None
+        Reports "browser.start" and "browser.login" spans of new drivers if given.
+    """
+
+    def __init__(
+        self,
+        cookies: t.Iterable[cookie.Cookie],
+        chrome_args: t.Iterable[str] = (),
+        size: int = 2,
+        max_uses: int = 20,
+        instrumentation: instrument.Instrumentation | None = None
+    ) -> None:
+        if size < 1:
+            raise ValueError(f"size must be positive: {size}")
+        self.cookies = list(cookies)
+        self.chrome_args = list(chrome_args)
+        self.size = size
+        self.max_uses = max_uses
+        self.instrumentation = instrumentation or instrument.Instrumentation()
+        self._idle: list[_PooledDriver] = []
+        self._started = 0
+        self._condition = threading.Condition()
+        self._closed = False
+
+    def __enter__(self) -> "DriverPool":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: types.TracebackType | None
+    ) -> None:
+        self.close()
+
+    @property
+    def started(self) -> int:
+        """The number of drivers currently started."""
+        return self._started
+
+    def warmup(self, count: int | None = None) -> None:
+        """Start and log in drivers in advance.
+
+        Parameters
+        ----------
+        count : int | None
+            The number of drivers to have started. `size` is used if None.
+        """
+        with self._condition:
+            count = max(min(count or self.size, self.size) - self._started, 0)
+            self._started += count
+        for _, result in workers.bounded_map(lambda _: self._start(), range(count), max(count, 1)):
+            if isinstance(result, Exception):
+                self._forget()
+            else:
+                self._release(result)
+
+    @contextlib.contextmanager
+    def acquire(self) -> t.Iterator["webdriver.Chrome"]:
+        """Borrow a logged-in driver, waiting for one to be released if all are in use."""
+        pooled = self._get()
+        try:
+            yield pooled.driver
+        except BaseException:
+            self._discard(pooled)
+            raise
+        pooled.uses += 1
+        if pooled.uses >= self.max_uses:
+            self._discard(pooled)
+        else:
+            self._release(pooled)
+
+    def close(self) -> None:
+        """Quit idle drivers. Drivers in use are quit when released."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        for pooled in idle:
+            self._discard(pooled)
+
+    def _get(self) -> _PooledDriver:
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("DriverPool is closed")
+                    if self._idle:
+                        pooled: _PooledDriver | None = self._idle.pop()
+                        break
+                    if self._started < self.size:
+                        self._started += 1
+                        pooled = None
+                        break
+                    self._condition.wait()
+            if pooled is None:
+                try:
+                    return self._start()
+                except BaseException:
+                    self._forget()
+                    raise
+            if _is_healthy(pooled.driver):
+                return pooled
+            self._discard(pooled)
+
+    def _start(self) -> _PooledDriver:
+        options = webdriver.ChromeOptions()
+        for arg in self.chrome_args:
+            options.add_argument(arg)
+        with self.instrumentation.span("browser.start"):
+            driver = webdriver.start_chrome(options)
+        try:
+            with self.instrumentation.span("browser.login", url=urls.HOME):
+                webdriver.login(driver, self.cookies)
+        except BaseException:
+            driver.quit()
+            raise
+        return _PooledDriver(driver)
+
+    def _release(self, pooled: _PooledDriver) -> None:
+        with self._condition:
+            if not self._closed:
+                self._idle.append(pooled)
+                self._condition.notify()
+                return
+        self._discard(pooled)
+
+    def _discard(self, pooled: _PooledDriver) -> None:
+        self._forget()
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+
+    def _forget(self) -> None:
+        """Free the slot of a driver which is not started anymore."""
+        with self._condition:
+            self._started -= 1
+            self._condition.notify()
+
+
+def _is_healthy(driver: "webdriver.Chrome") -> bool:
+    """Whether `driver` still responds."""
+    try:
+        driver.current_url
+    except Exception:
+        return False
+    return True
@@ -0,0 +1,278 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+import collections
+import dataclasses
+import hashlib
+import json
+import os
+import pathlib
+import re
+import threading
+import time
+import typing as t
+
+import requests
+
+
+Send = t.Callable[[str, dict[str, str]], requests.Response]
+
+
+@dataclasses.dataclass()
+class HTTPCacheStats:
+    hits: int = 0
+    """The number of responses served from the cache without a request."""
+    revalidated: int = 0
+    """The number of responses served from the cache after `304 Not Modified`."""
+    misses: int = 0
+    """The number of responses downloaded."""
+    bytes_saved: int = 0
+    """The number of body bytes served from the cache instead of downloaded."""
+
+
+@dataclasses.dataclass()
+class _Entry:
+    url: str
+    stored: float
+    """When the body was stored or last validated."""
+    max_age: float
+    size: int
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def has_validator(self) -> bool:
+        return self.etag is not None or self.last_modified is not None
+
+
+class HTTPCache:
+    """On-disk cache of response bodies keyed by URL.
+
+    A cached response with `ETag` or `Last-Modified` is revalidated with a
+    conditional GET. Otherwise it is served without a request while it is
+    younger than its max-age, which is `Cache-Control: max-age` of the
+    response or `max_age`. Least recently used entries are evicted when the
+    total size of bodies exceeds `max_bytes`.
+
+    Responses are stored regardless of cookies, so use a directory per account.
+    A cache is thread-safe. Files are read and written outside its lock, and
+    a body is written to a temporary file and moved into place, so lookups
+    do not wait for the disk I/O of each other.
+
+    Parameters
+    ----------
+    directory : str | os.PathLike[str]
+        The directory to store responses.
+    max_bytes : int
+        The maximum total size of stored bodies in byte.
+    max_age : float
+        The default time in second to serve a response without validators.
+    clock : Callable[[], float]
+        The clock in second to age responses.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        max_bytes: int = 256 * 1024 * 1024,
+        max_age: float = 0,
+        clock: t.Callable[[], float] = time.time
+    ) -> None:
+        self.directory = pathlib.Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stats = HTTPCacheStats()
+        self._entries: collections.OrderedDict[str, _Entry] = collections.OrderedDict()
+        self._size = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    @property
+    def stats(self) -> HTTPCacheStats:
+        """A copy of the statistics of the cache."""
+        with self._lock:
+            return dataclasses.replace(self._stats)
+
+    @property
+    def size(self) -> int:
+        """The total size of stored bodies in byte."""
+        return self._size
+
+    def get(self, session: requests.Session, url: str, timeout: float | None = None) -> bytes:
+        """Get the body of `url` through the cache.
+
+        Parameters
+        ----------
+        session : requests.Session
+            The session to send a request.
+        url : str
+            The URL to get.
+        timeout : float | None
+            Time to wait for a response in second.
+
+        Returns
+        -------
+        bytes
+            The body of the response.
+        """
+        return self.fetch(url, lambda url, headers: session.get(url, headers=headers, timeout=timeout))
+
+    def fetch(self, url: str, send: Send) -> bytes:
+        """Get the body of `url` through the cache, sending requests by `send`.
+
+        Parameters
+        ----------
+        url : str
+            The URL to get.
+        send : Callable[[str, dict[str, str]], requests.Response]
+            The function to send a GET request of a URL with headers.
+
+        Returns
+        -------
+        bytes
+            The body of the response.
+        """
+        key = _key(url)
+        headers: dict[str, str] = {}
+        with self._lock:
+            entry = self._entries.get(key)
+            fresh = entry is not None and not entry.has_validator and self._clock() - entry.stored < entry.max_age
+            if entry is not None:
+                if entry.etag is not None:
+                    headers["If-None-Match"] = entry.etag
+                if entry.last_modified is not None:
+                    headers["If-Modified-Since"] = entry.last_modified
+        if fresh and entry is not None and (body := self._read(key, entry)) is not None:
+            with self._lock:
+                self._stats.hits += 1
+                self._stats.bytes_saved += len(body)
+            self._touch(key)
+            return body
+        response = send(url, headers)
+        if response.status_code == 304 and entry is not None and (body := self._read(key, entry)) is not None:
+            with self._lock:
+                self._stats.revalidated += 1
+                self._stats.bytes_saved += len(body)
+                current = self._entries.get(key) is entry
+                if current:
+                    entry.stored = self._clock()
+                    entry.etag = response.headers.get("ETag", entry.etag)
+                    entry.last_modified = response.headers.get("Last-Modified", entry.last_modified)
+                    record = dataclasses.asdict(entry)
+            if current:
+                _write_atomic(self._path(key, ".json"), json.dumps(record).encode("utf-8"))
+                self._touch(key)
+            return body
+        if response.status_code == 304:
+            response = send(url, {})
+        response.raise_for_status()
+        body = response.content
+        with self._lock:
+            self._stats.misses += 1
+        self._store(key, url, response, body)
+        return body
+
+    def clear(self) -> None:
+        """Remove all stored responses."""
+        with self._lock:
+            keys = list(self._entries)
+            self._entries.clear()
+            self._size = 0
+        for key in keys:
+            self._unlink(key)
+
+    def _store(self, key: str, url: str, response: requests.Response, body: bytes) -> None:
+        """Write `body` and its entry, and add the entry to the index.
+
+        The files are written before the lock is taken, and the files of
+        evicted entries are removed after it is released.
+        """
+        cache_control = response.headers.get("Cache-Control", "")
+        if "no-store" in cache_control:
+            return
+        max_age = self.max_age
+        if match := re.search(r"max-age=(\d+)", cache_control):
+            max_age = float(match[1])
+        entry = _Entry(
+            url,
+            self._clock(),
+            max_age,
+            len(body),
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified")
+        )
+        if (not entry.has_validator and entry.max_age <= 0) or entry.size > self.max_bytes:
+            return
+        _write_atomic(self._path(key, ".body"), body)
+        _write_atomic(self._path(key, ".json"), json.dumps(dataclasses.asdict(entry)).encode("utf-8"))
+        evicted: list[str] = []
+        with self._lock:
+            if (old := self._entries.pop(key, None)) is not None:
+                self._size -= old.size
+            self._entries[key] = entry
+            self._size += entry.size
+            while self._size > self.max_bytes:
+                evicted_key, evicted_entry = self._entries.popitem(last=False)
+                self._size -= evicted_entry.size
+                evicted.append(evicted_key)
+        for evicted_key in evicted:
+            self._unlink(evicted_key)
+
+    def _read(self, key: str, entry: _Entry) -> bytes | None:
+        """Read the body of `entry`, dropping the entry from the index if the body is gone."""
+        try:
+            return self._path(key, ".body").read_bytes()
+        except OSError:
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+                    self._size -= entry.size
+            return None
+
+    def _touch(self, key: str) -> None:
+        """Mark `key` as most recently used in the index and on disk."""
+        with self._lock:
+            if key not in self._entries:
+                return
+            self._entries.move_to_end(key)
+        try:
+            os.utime(self._path(key, ".json"))
+        except OSError:
+            pass
+
+    def _unlink(self, key: str) -> None:
+        for suffix in (".body", ".json"):
+            try:
+                self._path(key, suffix).unlink()
+            except OSError:
+                pass
+
+    def _load(self) -> None:
+        """Load entries stored by former instances in least recently used order."""
+        paths = sorted(self.directory.glob("*.json"), key=lambda path: path.stat().st_mtime)
+        for path in paths:
+            try:
+                entry = _Entry(**json.loads(path.read_bytes()))
+            except (OSError, ValueError, TypeError):
+                continue
+            key = path.stem
+            if self._path(key, ".body").is_file():
+                self._entries[key] = entry
+                self._size += entry.size
+        while self._size > self.max_bytes:
+            key, entry = self._entries.popitem(last=False)
+            self._size -= entry.size
+            self._unlink(key)
+
+    def _path(self, key: str, suffix: str) -> pathlib.Path:
+        return self.directory / f"{key}{suffix}"
+
+
+def _key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def _write_atomic(path: pathlib.Path, data: bytes) -> None:
+    tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
@@ -1,12 +1,16 @@
 # Copyright (c) 2022 Shuhei Nitta. All rights reserved.
 
 from .selling import InfoSelling
+from .batch import InfoSellingBatch
 from .closed_with_winner import InfoClosedWithWinner
 from .closed_without_winner import InfoClosedWithoutWinner
+from .summary import InfoSummary
 
 
 __all__ = [
     "InfoSelling",
+    "InfoSellingBatch",
     "InfoClosedWithWinner",
-    "InfoClosedWithoutWinner"
+    "InfoClosedWithoutWinner",
+    "InfoSummary"
 ]
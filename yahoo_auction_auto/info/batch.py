@@ -0,0 +1,255 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+import array
+import csv
+import dataclasses
+import datetime
+import itertools
+import json
+import operator
+import os
+import typing as t
+
+from .selling import InfoSelling
+
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_INT_FIELDS = ("stock", "count_bid", "count_access", "count_watch")
+_DATETIME_FIELDS = ("start_datetime", "end_datetime")
+_BOOL_FIELDS = ("refundable",)
+_FIELDS = tuple(field.name for field in dataclasses.fields(InfoSelling))
+_OPERATORS: dict[str, t.Callable[[t.Any, t.Any], bool]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">=": operator.ge,
+    ">": operator.gt,
+}
+
+Column = t.MutableSequence[t.Any]
+"""`array.array` of numbers or `list` of strings."""
+Operator = t.Literal["<", "<=", "==", "!=", ">=", ">"]
+
+
+@dataclasses.dataclass(frozen=True)
+class Aggregate:
+    """Aggregation of a column."""
+    count: int
+    sum: float
+    min: float | None
+    max: float | None
+    mean: float | None
+
+
+class InfoSellingBatch:
+    """Columnar container of many `InfoSelling`.
+
+    Integer fields are stored in `array("q")`, `refundable` in `array("b")`
+    and datetimes in `array("d")` as seconds from 1970-01-01 of the naive
+    datetimes, so a record costs a few machine words besides its strings.
+
+    Parameters
+    ----------
+    infos : Iterable[yahoo_auction_auto.info.InfoSelling]
+        The records to store.
+    """
+
+    def __init__(self, infos: t.Iterable[InfoSelling] = ()) -> None:
+        self._columns: dict[str, Column] = {}
+        for name in _FIELDS:
+            if name in _INT_FIELDS:
+                self._columns[name] = array.array("q")
+            elif name in _BOOL_FIELDS:
+                self._columns[name] = array.array("b")
+            elif name in _DATETIME_FIELDS:
+                self._columns[name] = array.array("d")
+            else:
+                self._columns[name] = []
+        self.extend(infos)
+
+    def __len__(self) -> int:
+        return len(self._columns["aID"])
+
+    def __getitem__(self, index: int) -> InfoSelling:
+        return InfoSelling(**{name: self._decode(name, column[index]) for name, column in self._columns.items()})
+
+    def __iter__(self) -> t.Iterator[InfoSelling]:
+        for values in zip(*self._columns.values()):
+            yield InfoSelling(**{name: self._decode(name, value) for name, value in zip(_FIELDS, values)})
+
+    def append(self, info: InfoSelling) -> None:
+        """Append `info`.
+
+        The batch is left unchanged if it fails, such as with `BufferError`
+        while arrays from `to_numpy` or `to_arrow` share memory with it.
+        """
+        row = [(column, self._encode(name, getattr(info, name))) for name, column in self._columns.items()]
+        appended = 0
+        try:
+            for column, value in row:
+                column.append(value)
+                appended += 1
+        except BaseException:
+            for column, _ in row[:appended]:
+                column.pop()
+            raise
+
+    def extend(self, infos: t.Iterable[InfoSelling]) -> None:
+        for info in infos:
+            self.append(info)
+
+    def column(self, name: str) -> Column:
+        """Get the column of the field `name` without copying it.
+
+        Datetimes are in seconds from 1970-01-01.
+        """
+        return self._columns[name]
+
+    def mask(self, name: str, op: Operator, value: t.Any) -> "array.array[int]":
+        """Compare each value of the field `name` with `value`.
+
+        Parameters
+        ----------
+        name : str
+            The name of a field.
+        op : Literal["<", "<=", "==", "!=", ">=", ">"]
+            The comparison.
+        value : Any
+            The value to compare with. A datetime is accepted for datetime fields.
+
+        Returns
+        -------
+        array.array[int]
+            1 for each record which satisfies the comparison, else 0.
+        """
+        compare = _OPERATORS[op]
+        value = self._encode(name, value)
+        return array.array("b", [compare(x, value) for x in self._columns[name]])
+
+    def filter(self, mask: t.Iterable[t.Any]) -> "InfoSellingBatch":
+        """Get a batch of the records whose `mask` is truthy.
+
+        Masks from `mask` can be combined by `and_` and `or_`.
+        """
+        mask = list(mask)
+        batch = InfoSellingBatch()
+        for name, column in self._columns.items():
+            batch._columns[name].extend(itertools.compress(column, mask))
+        return batch
+
+    def aggregate(self, name: str) -> Aggregate:
+        """Aggregate the integer or datetime field `name`.
+
+        Datetimes are aggregated in seconds from 1970-01-01.
+        """
+        if name not in _INT_FIELDS + _DATETIME_FIELDS:
+            raise ValueError(f"Not a numeric field: {name}")
+        column = self._columns[name]
+        if not column:
+            return Aggregate(0, 0, None, None, None)
+        total = float(sum(column))
+        return Aggregate(len(column), total, float(min(column)), float(max(column)), total / len(column))
+
+    def to_ndjson(self, file: t.TextIO) -> None:
+        """Write the records as newline-delimited JSON with ISO 8601 datetimes."""
+        for values in zip(*self._columns.values()):
+            record = {name: self._export(name, value) for name, value in zip(_FIELDS, values)}
+            file.write(json.dumps(record, ensure_ascii=False))
+            file.write("\n")
+
+    def to_csv(self, file: t.TextIO) -> None:
+        """Write the records as CSV with a header and ISO 8601 datetimes."""
+        writer = csv.writer(file)
+        writer.writerow(_FIELDS)
+        for values in zip(*self._columns.values()):
+            writer.writerow([self._export(name, value) for name, value in zip(_FIELDS, values)])
+
+    def to_numpy(self) -> dict[str, t.Any]:
+        """Get the columns as NumPy arrays. Requires `numpy`.
+
+        Integer, boolean and datetime columns share memory with the batch,
+        which cannot grow while they are alive. Datetimes are float seconds
+        from 1970-01-01.
+        """
+        import numpy as np
+        columns: dict[str, t.Any] = {}
+        for name, column in self._columns.items():
+            buffer = t.cast("array.array[t.Any]", column)
+            if name in _INT_FIELDS:
+                columns[name] = np.frombuffer(buffer, dtype=np.int64)
+            elif name in _BOOL_FIELDS:
+                columns[name] = np.frombuffer(buffer, dtype=np.int8).view(np.bool_)
+            elif name in _DATETIME_FIELDS:
+                columns[name] = np.frombuffer(buffer, dtype=np.float64)
+            else:
+                columns[name] = np.array(column, dtype=object)
+        return columns
+
+    def to_arrow(self) -> t.Any:
+        """Get the records as `pyarrow.Table`. Requires `pyarrow`.
+
+        Integer columns share memory with the batch, which cannot grow while they are alive.
+        """
+        import pyarrow as pa
+        arrays = []
+        for name, column in self._columns.items():
+            if name in _INT_FIELDS:
+                arrays.append(pa.Array.from_buffers(pa.int64(), len(column), [None, pa.py_buffer(column)]))
+            elif name in _BOOL_FIELDS:
+                arrays.append(pa.array([bool(x) for x in column], pa.bool_()))
+            elif name in _DATETIME_FIELDS:
+                arrays.append(pa.array([round(x) for x in column], pa.int64()).cast(pa.timestamp("s")))
+            else:
+                arrays.append(pa.array(column, pa.string()))
+        return pa.Table.from_arrays(arrays, names=list(_FIELDS))
+
+    def to_parquet(self, path: str | os.PathLike[str]) -> None:
+        """Write the records to a Parquet file. Requires `pyarrow`."""
+        import pyarrow.parquet as pq
+        pq.write_table(self.to_arrow(), path)
+
+    @staticmethod
+    def _encode(name: str, value: t.Any) -> t.Any:
+        if name in _DATETIME_FIELDS and isinstance(value, datetime.datetime):
+            return (value - _EPOCH).total_seconds()
+        if name in _BOOL_FIELDS:
+            return int(value)
+        return value
+
+    @staticmethod
+    def _decode(name: str, value: t.Any) -> t.Any:
+        if name in _DATETIME_FIELDS:
+            return _EPOCH + datetime.timedelta(seconds=value)
+        if name in _BOOL_FIELDS:
+            return bool(value)
+        return value
+
+    @classmethod
+    def _export(cls, name: str, value: t.Any) -> t.Any:
+        if name in _DATETIME_FIELDS:
+            return cls._decode(name, value).isoformat()
+        if name in _BOOL_FIELDS:
+            return bool(value)
+        return value
+
+
+def asrecord(info: t.Any) -> dict[str, t.Any]:
+    """Get the fields of `info` as a JSON-compatible dict with ISO 8601 datetimes.
+
+    `info` is an instance of the dataclasses in `yahoo_auction_auto.info`.
+    A record of `InfoSelling` is the same as written by `InfoSellingBatch.to_ndjson`.
+    """
+    return {
+        field.name: value.isoformat() if isinstance(value := getattr(info, field.name), datetime.datetime) else value
+        for field in dataclasses.fields(info)
+    }
+
+
+def and_(*masks: t.Iterable[t.Any]) -> "array.array[int]":
+    """Combine masks by logical AND."""
+    return array.array("b", [all(values) for values in zip(*masks)])
+
+
+def or_(*masks: t.Iterable[t.Any]) -> "array.array[int]":
+    """Combine masks by logical OR."""
+    return array.array("b", [any(values) for values in zip(*masks)])
@@ -1,4 +1,74 @@
 # Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+import datetime
+import dataclasses
 
+import bs4
+from lxml import html
+
+from yahoo_auction_auto import instrument, parsing
+from . import extraction
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
 class InfoClosedWithWinner:
-    pass
+    aID: str
+    """The auction ID."""
+    title: str
+    """The title of an auction."""
+    seller_name: str
+    """The seller name of an auction."""
+    start_datetime: datetime.datetime
+    """When an auction started."""
+    end_datetime: datetime.datetime
+    """When an auction ended."""
+    startprice: str
+    """The start price of an auction."""
+    price: str
+    """The winning price of an auction."""
+    winner_name: str
+    """The name of the winner."""
+    count_bid: int
+    """The number of bids."""
+    count_access: int
+    """The number of accesses."""
+    count_watch: int
+    """The number of watches"""
+
+    @classmethod
+    def fromsoup(cls, soup: bs4.BeautifulSoup) -> "InfoClosedWithWinner":
+        return cls(**extraction.fromsoup(_FIELDS, soup))
+
+    @classmethod
+    def fromtree(cls, tree: html.HtmlElement) -> "InfoClosedWithWinner":
+        return cls(**extraction.fromtree(_FIELDS, tree))
+
+    @classmethod
+    def fromhtml(
+        cls,
+        content: bytes | str,
+        parser: parsing.Parser = "lxml",
+        instrumentation: instrument.Instrumentation | None = None
+    ) -> "InfoClosedWithWinner":
+        """Parse an item page of an auction closed with a winner with `parser` backend.
+
+        Parameters
+        ----------
+        content : bytes | str
+            The HTML of a Yahoo!Auction item page.
+        parser : yahoo_auction_auto.parsing.Parser
+            The backend to parse `content`.
+        instrumentation : yahoo_auction_auto.instrument.Instrumentation | None
+            Reports "parse.item" and "parse.field.<name>" spans if given.
+
+        Returns
+        -------
+        yahoo_auction_auto.info.InfoClosedWithWinner
+        """
+        return cls(**extraction.parse(content, parser, _FIELDS, instrumentation))
+
+
+_FIELDS: dict[str, extraction.Field] = {
+    **extraction.COMMON_FIELDS,
+    "price": extraction.detail("落札価格", extraction.to_price, "", "Price__value"),
+    "winner_name": extraction.detail("最高額入札者", extraction.to_str, "", link=True),
+}
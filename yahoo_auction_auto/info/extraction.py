@@ -0,0 +1,360 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+"""Extraction of fields shared by the parsers of item pages.
+
+An item page is the same page whether the auction is selling or closed,
+so each of `selling`, `closed_with_winner` and `closed_without_winner`
+declares only its table of `Field` and extracts it with the functions here.
+"""
+import datetime
+import typing as t
+
+import bs4
+from lxml import etree, html
+
+from yahoo_auction_auto import instrument, parsing
+
+
+T = t.TypeVar("T")
+S = t.TypeVar("S")
+
+Index = dict[str, bs4.Tag]
+"""The first tag of each label of an item page, built by `index`."""
+
+Target = tuple[str, t.Callable[[html.HtmlElement], bool]]
+"""The tag and the predicate of the element which a field is extracted from."""
+
+
+class Field(t.NamedTuple):
+    """Extractors of a field of an item page."""
+    soup: t.Callable[[Index], t.Any]
+    """Extract the field from the index of a soup."""
+    tree: t.Callable[[html.HtmlElement], t.Any]
+    """Extract the field from an `lxml.html` tree."""
+    target: Target
+    """The element which `tree` reads, to find when the field is complete while streaming."""
+
+
+# Single-pass extraction
+# The index maps a label to the first tag of the label in document order,
+# so every field is looked up in the same tag as the XPath below.
+TITLE = "ProductTitle__text"
+SELLER_NAME = "rsec:seller;slk:slfinfo;"
+COUNT_ACCESS = "StatisticsInfo__term--access"
+COUNT_WATCH = "StatisticsInfo__term--watch"
+DESCRIPTION = "ProductDetail__description"
+EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def index(soup: bs4.BeautifulSoup) -> Index:
+    """Index the tags of fields in `soup` in one walk of the tree.
+
+    Parameters
+    ----------
+    soup : bs4.BeautifulSoup
+        A soup of a Yahoo!Auction page.
+
+    Returns
+    -------
+    dict[str, bs4.Tag]
+        The first tag for each label of `dt` and for the title,
+        the seller name and the statistics terms.
+    """
+    index: Index = {}
+    for tag in soup.descendants:
+        if not isinstance(tag, bs4.Tag):
+            continue
+        if tag.name == "dt":
+            if (label := tag.string) is not None:
+                index.setdefault(str(label), tag)
+        elif tag.name == "h1":
+            if TITLE in tag.get_attribute_list("class"):
+                index.setdefault(TITLE, tag)
+        elif tag.name == "a":
+            if str(tag.get("data-ylk", "")).startswith(SELLER_NAME):
+                index.setdefault(SELLER_NAME, tag)
+        elif tag.name == "span":
+            for key in tag.get_attribute_list("class"):
+                if key in (COUNT_ACCESS, COUNT_WATCH):
+                    index.setdefault(key, tag)
+    return index
+
+
+def _text(index: Index, key: str, default: str) -> str:
+    if tag := index.get(key):
+        return str(tag.text)
+    return default
+
+
+def _value(
+    index: Index,
+    label: str,
+    convert: t.Callable[[str], T],
+    default: T,
+    class_: str,
+    link: bool
+) -> T:
+    if tag := index.get(label):
+        value = tag.find_next_sibling("dd", {"class": class_})
+        if isinstance(value, bs4.Tag):
+            if link and isinstance(anchor := value.find("a"), bs4.Tag):
+                return convert(anchor.text)
+            return convert(value.text)
+    return default
+
+
+def _statistics(index: Index, key: str) -> int:
+    if tag := index.get(key):
+        value = tag.find_next_sibling("span", {"class": "StatisticsInfo__data"})
+        if isinstance(value, bs4.Tag):
+            return int(value.text)
+    return 0
+
+
+# XPath extraction
+# Each XPath selects the same tag as the index above.
+XPATH_TITLE = etree.XPath(f"(//h1[{parsing.has_class(TITLE)}])[1]")
+XPATH_SELLER_NAME = etree.XPath(f"(//a[starts-with(@data-ylk, '{SELLER_NAME}')])[1]")
+XPATH_DETAIL = etree.XPath(
+    "(//dt[. = $label])[1]"
+    "/following-sibling::dd[contains(concat(' ', normalize-space(@class), ' '), concat(' ', $class_, ' '))][1]"
+)
+XPATH_STATISTICS = etree.XPath(
+    "(//span[contains(concat(' ', normalize-space(@class), ' '), concat(' ', $key, ' '))])[1]"
+    f"/following-sibling::span[{parsing.has_class('StatisticsInfo__data')}][1]"
+)
+
+
+def _xpath_text(tree: html.HtmlElement, xpath: etree.XPath, default: str) -> str:
+    for tag in xpath(tree):
+        return str(tag.text_content())
+    return default
+
+
+def _xpath_value(
+    tree: html.HtmlElement,
+    label: str,
+    convert: t.Callable[[str], T],
+    default: T,
+    class_: str,
+    link: bool
+) -> T:
+    for tag in XPATH_DETAIL(tree, label=label, class_=class_):
+        if link and (anchor := tag.find(".//a")) is not None:
+            return convert(str(anchor.text_content()))
+        return convert(str(tag.text_content()))
+    return default
+
+
+def _xpath_statistics(tree: html.HtmlElement, key: str) -> int:
+    for tag in XPATH_STATISTICS(tree, key=key):
+        return int(tag.text_content())
+    return 0
+
+
+def _has_class(element: html.HtmlElement, class_: str) -> bool:
+    return class_ in str(element.get("class", "")).split()
+
+
+# Fields
+def detail(
+    label: str,
+    convert: t.Callable[[str], T],
+    default: T,
+    class_: str = DESCRIPTION,
+    link: bool = False
+) -> Field:
+    """Get the field in the first `dd` of `class_` following the `dt` of `label`.
+
+    Parameters
+    ----------
+    label : str
+        The text of the `dt`.
+    convert : Callable[[str], T]
+        The function to convert the text of the `dd`.
+    default : T
+        The value if the `dd` is not found.
+    class_ : str
+        The class of the `dd`.
+    link : bool
+        Whether to read only the first link in the `dd`, if any.
+    """
+    def matches(element: html.HtmlElement) -> bool:
+        if not _has_class(element, class_):
+            return False
+        for sibling in element.itersiblings(preceding=True):
+            if sibling.tag == "dd" and _has_class(sibling, class_):
+                return False
+            if sibling.tag == "dt" and sibling.text_content() == label:
+                return True
+        return False
+    return Field(
+        lambda index: _value(index, label, convert, default, class_, link),
+        lambda tree: _xpath_value(tree, label, convert, default, class_, link),
+        ("dd", matches),
+    )
+
+
+def statistics(key: str) -> Field:
+    """Get the count in the first data `span` following the `span` of `key`."""
+    def matches(element: html.HtmlElement) -> bool:
+        if not _has_class(element, "StatisticsInfo__data"):
+            return False
+        for sibling in element.itersiblings(preceding=True):
+            if sibling.tag == "span" and _has_class(sibling, "StatisticsInfo__data"):
+                return False
+            if sibling.tag == "span" and _has_class(sibling, key):
+                return True
+        return False
+    return Field(lambda index: _statistics(index, key), lambda tree: _xpath_statistics(tree, key), ("span", matches))
+
+
+def from_yahoo_datetime(datetimestr: str) -> datetime.datetime:
+    """Get datetime.datetime instance from format `YYYY.MM.DD（d）HH:MM`
+
+    Parameters
+    ----------
+    datetimestr : str
+        A string of datetime on a Yahoo!Auction page.
+
+    Returns
+    -------
+    datetime.datetime
+    """
+    year: int = int(datetimestr[:4])
+    month: int = int(datetimestr[5:7])
+    day: int = int(datetimestr[8:10])
+    hour: int = int(datetimestr[13:15])
+    min: int = int(datetimestr[16:18])
+    return datetime.datetime(year, month, day, hour, min)
+
+
+def to_str(text: str) -> str:
+    return str(text.strip("："))
+
+
+def to_int(text: str) -> int:
+    return int(text.strip("："))
+
+
+def to_datetime(text: str) -> datetime.datetime:
+    return from_yahoo_datetime(text.strip("："))
+
+
+def to_refundable(text: str) -> bool:
+    return bool(text.strip("：") != "返品不可")
+
+
+def to_timeleft(text: str) -> str:
+    return str(text.splitlines()[0])
+
+
+def to_count_bid(text: str) -> int:
+    return int(text[:-4])
+
+
+def to_price(text: str) -> str:
+    return str(text.strip().split("（")[0].strip())
+
+
+COMMON_FIELDS: dict[str, Field] = {
+    "aID": detail("オークションID", to_str, ""),
+    "title": Field(
+        lambda index: _text(index, TITLE, ""),
+        lambda tree: _xpath_text(tree, XPATH_TITLE, ""),
+        ("h1", lambda element: _has_class(element, TITLE)),
+    ),
+    "seller_name": Field(
+        lambda index: _text(index, SELLER_NAME, ""),
+        lambda tree: _xpath_text(tree, XPATH_SELLER_NAME, ""),
+        ("a", lambda element: str(element.get("data-ylk", "")).startswith(SELLER_NAME)),
+    ),
+    "start_datetime": detail("開始日時", to_datetime, EPOCH),
+    "end_datetime": detail("終了日時", to_datetime, EPOCH),
+    "startprice": detail("開始価格", to_str, ""),
+    "count_bid": detail("入札件数", to_count_bid, 0, "Count__number"),
+    "count_access": statistics(COUNT_ACCESS),
+    "count_watch": statistics(COUNT_WATCH),
+}
+"""Fields of every item page."""
+
+
+# Parsing
+def fromsoup(fields: t.Mapping[str, Field], soup: bs4.BeautifulSoup) -> dict[str, t.Any]:
+    """Extract `fields` from `soup` of an item page."""
+    return _extract({name: field.soup for name, field in fields.items()}, index(soup))
+
+
+def fromtree(fields: t.Mapping[str, Field], tree: html.HtmlElement) -> dict[str, t.Any]:
+    """Extract `fields` from `tree` of an item page."""
+    return _extract({name: field.tree for name, field in fields.items()}, tree)
+
+
+def parse(
+    content: bytes | str,
+    parser: parsing.Parser,
+    fields: t.Mapping[str, Field],
+    instrumentation: instrument.Instrumentation | None = None
+) -> dict[str, t.Any]:
+    """Parse an item page with `parser` backend and extract `fields`.
+
+    Reports "parse.item" and "parse.field.<name>" spans if `instrumentation` is enabled.
+    """
+    if instrumentation is None or not instrumentation.enabled:
+        if parsing.check_parser(parser) == "lxml":
+            return fromtree(fields, parsing.fromstring(content))
+        return fromsoup(fields, bs4.BeautifulSoup(content, "lxml"))
+    with instrumentation.span("parse.item", parser=parser, bytes=len(content)):
+        if parsing.check_parser(parser) == "lxml":
+            with instrumentation.span("parse.field.(tree)", parser=parser):
+                tree = parsing.fromstring(content)
+            tree_fields = {name: field.tree for name, field in fields.items()}
+            return _extract(tree_fields, tree, instrumentation, parser)
+        with instrumentation.span("parse.field.(tree)", parser=parser):
+            soup = bs4.BeautifulSoup(content, "lxml")
+        with instrumentation.span("parse.field.(index)", parser=parser):
+            soup_index = index(soup)
+        soup_fields = {name: field.soup for name, field in fields.items()}
+        return _extract(soup_fields, soup_index, instrumentation, parser)
+
+
+def parse_chunks(chunks: t.Iterable[bytes], fields: t.Mapping[str, Field]) -> dict[str, t.Any]:
+    """Parse an item page fed in `chunks` with lxml and extract `fields`
+    as soon as an element matching the target of each field is closed."""
+    parser = etree.HTMLPullParser(events=("end",))
+    parser.set_element_class_lookup(html.HtmlElementClassLookup())
+    pending: dict[str, list[tuple[str, t.Callable[[html.HtmlElement], bool]]]] = {}
+    for name, field in fields.items():
+        tag, matches = field.target
+        pending.setdefault(tag, []).append((name, matches))
+    for chunk in chunks:
+        parser.feed(chunk)
+        for _, element in parser.read_events():
+            if (candidates := pending.get(element.tag)) is None:
+                continue
+            if remaining := [(name, matches) for name, matches in candidates if not matches(element)]:
+                pending[element.tag] = remaining
+                continue
+            del pending[element.tag]
+            if not pending:
+                return fromtree(fields, element.getroottree().getroot())
+    try:
+        root = parser.close()
+    except etree.XMLSyntaxError:
+        root = html.Element("html")
+    return fromtree(fields, root)
+
+
+def _extract(
+    fields: t.Mapping[str, t.Callable[[S], t.Any]],
+    source: S,
+    instrumentation: instrument.Instrumentation | None = None,
+    parser: parsing.Parser = "lxml"
+) -> dict[str, t.Any]:
+    """Extract `fields` from `source`, reporting a span per field if `instrumentation` is given."""
+    if instrumentation is None:
+        return {name: extract(source) for name, extract in fields.items()}
+    values: dict[str, t.Any] = {}
+    for name, extract in fields.items():
+        with instrumentation.span(f"parse.field.{name}", parser=parser):
+            values[name] = extract(source)
+    return values
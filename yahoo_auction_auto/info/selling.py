@@ -1,12 +1,16 @@
 # Copyright (c) 2022 Shuhei Nitta. All rights reserved.
-import re
 import datetime
 import dataclasses
+import typing as t
 
 import bs4
+from lxml import html
 
+from yahoo_auction_auto import instrument, parsing
+from . import extraction
 
-@dataclasses.dataclass(frozen=True)
+
+@dataclasses.dataclass(frozen=True, slots=True)
 class InfoSelling:
     aID: str
     """The auction ID."""
@@ -35,288 +39,67 @@ class InfoSelling:
 
     @classmethod
     def fromsoup(cls, soup: bs4.BeautifulSoup) -> "InfoSelling":
-        return cls(
-            _get_aID(soup),
-            _get_title(soup),
-            _get_seller_name(soup),
-            _get_stock(soup),
-            _get_start_datetime(soup),
-            _get_end_datetime(soup),
-            _get_refundable(soup),
-            _get_startprice(soup),
-            _get_timeleft(soup),
-            _get_count_bid(soup),
-            _get_count_access(soup),
-            _get_count_watch(soup),
-        )
-
-
-# Scraping functions
-# The soup is from YahooAuctionURL.AUCTION()
-def _get_aID(soup: bs4.BeautifulSoup) -> str:
-    """Get the auction ID of an auction from `soup`.
-
-    Parameters
-    ----------
-    soup : bs4.BeautifulSoup
-        A soup of a Yahoo!Auction page.
-
-    Returns
-    -------
-    str
-        The auction ID of the auction.
-    """
-    if tag := soup.find("dt", string="オークションID"):
-        if isinstance(tag, bs4.Tag):
-            tag = tag.find_next_sibling("dd", {"class": "ProductDetail__description"})
-            if isinstance(tag, bs4.Tag):
-                return str(tag.text.strip("："))
-    return ""
-
-
-def _get_title(soup: bs4.BeautifulSoup) -> str:
-    """Get the title of an auction from `soup`.
-
-    Parameters
-    ----------
-    soup : bs4.BeautifulSoup
-        A soup of a Yahoo!Auction page.
-
-    Returns
-    -------
-    str
-        The title of the auction.
-    """
-    if title := soup.find("h1", {"class": "ProductTitle__text"}):
-        if isinstance(title, bs4.Tag):
-            return str(title.text)
-    return ""
-
-
-def _get_seller_name(soup: bs4.BeautifulSoup) -> str:
-    """Get the seller name of an auction from `soup`.
-
-    Parameters
-    ----------
-    soup : bs4.BeautifulSoup
-        A soup of a Yahoo!Auction page.
-
-    Returns
-    -------
-    str
-        The seller name of the auction.
-    """
-    pattern = re.compile(r'^rsec:seller;slk:slfinfo;')
-    if seller_name := soup.find("a", {"data-ylk": pattern}):
-        if isinstance(seller_name, bs4.Tag):
-            return str(seller_name.text)
-    return ""
-
-
-def _get_stock(soup: bs4.BeautifulSoup) -> int:
-    """Get the stock count of an auction from `soup`.
-
-    Parameters
-    ----------
-    soup : bs4.BeautifulSoup
-        A soup of a Yahoo!Auction page.
-
-    Returns
-    -------
-    int
-        The stock count of the auction.
-    """
-    if tag := soup.find("dt", string="個数"):
-        if isinstance(tag, bs4.Tag):
-            tag = tag.find_next_sibling("dd", {"class": "ProductDetail__description"})
-            if isinstance(tag, bs4.Tag):
-                return int(tag.text.strip("："))
-    return 0
-
-
-def _from_yahoo_datetime(datetimestr: str) -> datetime.datetime:
-    """Get datetime.datetime instance from format `YYYY.MM.DD（d）HH:MM`
-
-    Parameters
-    ----------
-    datetimestr : str
-        A string of datetime on a Yahoo!Auction page.
-
-    Returns
-    -------
-    datetime.datetime
-    """
-    year: int = int(datetimestr[:4])
-    month: int = int(datetimestr[5:7])
-    day: int = int(datetimestr[8:10])
-    hour: int = int(datetimestr[13:15])
-    min: int = int(datetimestr[16:18])
-    return datetime.datetime(year, month, day, hour, min)
-
-
-def _get_start_datetime(soup: bs4.BeautifulSoup) -> datetime.datetime:
-    """Get start datetime of an auction from `soup`.
-
-    Parameters
-    ----------
-    soup : bs4.BeautifulSoup
-        A soup of a Yahoo!Auction page.
-
-    Returns
-    -------
-    datetime.datetime
-        The start datetime of the auction.
-    """
-    if tag := soup.find("dt", string="開始日時"):
-        if isinstance(tag, bs4.Tag):
-            tag = tag.find_next_sibling("dd", {"class": "ProductDetail__description"})
-            if isinstance(tag, bs4.Tag):
-                return _from_yahoo_datetime(tag.text.strip("："))
-    return datetime.datetime(1970, 1, 1)
-
-
-def _get_end_datetime(soup: bs4.BeautifulSoup) -> datetime.datetime:
-    """Get start datetime of an auction from `soup`.
+        return cls(**extraction.fromsoup(_FIELDS, soup))
 
-    Parameters
-    ----------
-    soup : bs4.BeautifulSoup
-        A soup of a Yahoo!Auction page.
-
-    Returns
-    -------
-    datetime.datetime
-        The end datetime of the auction.
-    """
-    if tag := soup.find("dt", string="終了日時"):
-        if isinstance(tag, bs4.Tag):
-            tag = tag.find_next_sibling("dd", {"class": "ProductDetail__description"})
-            if isinstance(tag, bs4.Tag):
-                return _from_yahoo_datetime(tag.text.strip("："))
-    return datetime.datetime(1970, 1, 1)
-
-
-def _get_refundable(soup: bs4.BeautifulSoup) -> bool:
-    """Return true if an auction from `soup` is refundable.
-
-    Parameters
-    ----------
-    soup : bs4.BeautifulSoup
-        A soup of a Yahoo!Auction page.
-
-    Returns
-    -------
-    bool
-        Return true if the auction is refundable.
-    """
-    if tag := soup.find("dt", string="返品"):
-        if isinstance(tag, bs4.Tag):
-            tag = tag.find_next_sibling("dd", {"class": "ProductDetail__description"})
-            if isinstance(tag, bs4.Tag):
-                return bool(tag.text.strip("：") != "返品不可")
-    return False
-
-
-def _get_startprice(soup: bs4.BeautifulSoup) -> str:
-    """Get the start price of an auction from `soup`.
-
-    Parameters
-    ----------
-    soup : bs4.BeautifulSoup
-        A soup of a Yahoo!Auction page.
-
-    Returns
-    -------
-    str
-        The start price of the auction. e.g. 10,000 円（税 0 円）
-    """
-    if tag := soup.find("dt", string="開始価格"):
-        if isinstance(tag, bs4.element.Tag):
-            tag = tag.find_next_sibling("dd", {"class": "ProductDetail__description"})
-            if isinstance(tag, bs4.Tag):
-                return str(tag.text.strip("："))
-    return ""
-
-
-def _get_timeleft(soup: bs4.BeautifulSoup) -> str:
-    """Get the timeleft of an auction from `soup`.
-
-    Parameters
-    ----------
-    soup : bs4.BeautifulSoup
-        A soup of a Yahoo!Auction page.
-
-    Returns
-    -------
-    str
-        A string of timeleft of the auction.
-    """
-    if tag := soup.find("dt", string="残り時間"):
-        if isinstance(tag, bs4.element.Tag):
-            tag = tag.find_next_sibling("dd", {"class": "Count__number"})
-            if isinstance(tag, bs4.Tag):
-                return str(tag.text.splitlines()[0])
-    return ""
-
-
-def _get_count_bid(soup: bs4.BeautifulSoup) -> int:
-    """Get the bidding count of an auction from `soup`.
-
-    Parameters
-    ----------
-    soup : bs4.BeautifulSoup
-        A soup of a Yahoo!Auction page.
-
-    Returns
-    -------
-    int
-        The total count of bidding for the auction.
-    """
-    if tag := soup.find("dt", string="入札件数"):
-        if isinstance(tag, bs4.element.Tag):
-            tag = tag.find_next_sibling("dd", {"class": "Count__number"})
-            if isinstance(tag, bs4.Tag):
-                return int(tag.text[:-4])
-    return 0
-
-
-def _get_count_access(soup: bs4.BeautifulSoup) -> int:
-    """Get the access count of an auction from `soup`.
-
-    Parameters
-    ----------
-    soup : bs4.BeautifulSoup
-        A soup of a Yahoo!Auction page.
-
-    Returns
-    -------
-    int
-        The total count of access of the auction.
-    """
-    if tag := soup.find("span", {"class": "StatisticsInfo__term--access"}):
-        if isinstance(tag, bs4.element.Tag):
-            tag = tag.find_next_sibling("span", {"class": "StatisticsInfo__data"})
-            if isinstance(tag, bs4.Tag):
-                return int(tag.text)
-    return 0
-
-
-def _get_count_watch(soup: bs4.BeautifulSoup) -> int:
-    """Get the watch count of an auction from `soup`.
+    @classmethod
+    def fromtree(cls, tree: html.HtmlElement) -> "InfoSelling":
+        return cls(**extraction.fromtree(_FIELDS, tree))
 
-    Parameters
-    ----------
-    soup : bs4.BeautifulSoup
-        A soup of a Yahoo!Auction page.
+    @classmethod
+    def fromhtml(
+        cls,
+        content: bytes | str,
+        parser: parsing.Parser = "lxml",
+        instrumentation: instrument.Instrumentation | None = None
+    ) -> "InfoSelling":
+        """Parse an item page with `parser` backend.
+
+        Parameters
+        ----------
+        content : bytes | str
+            The HTML of a Yahoo!Auction item page.
+        parser : yahoo_auction_auto.parsing.Parser
+            The backend to parse `content`.
+        instrumentation : yahoo_auction_auto.instrument.Instrumentation | None
+            Reports "parse.item" and "parse.field.<name>" spans if given.
+
+        Returns
+        -------
+        yahoo_auction_auto.info.InfoSelling
+        """
+        return cls(**extraction.parse(content, parser, _FIELDS, instrumentation))
 
-    Returns
-    -------
-    int
-        The total count of watch for the auction.
-    """
-    if tag := soup.find("span", {"class": "StatisticsInfo__term--watch"}):
-        if isinstance(tag, bs4.element.Tag):
-            tag = tag.find_next_sibling("span", {"class": "StatisticsInfo__data"})
-            if isinstance(tag, bs4.Tag):
-                return int(tag.text)
-    return 0
+    @classmethod
+    def fromchunks(cls, chunks: t.Iterable[bytes]) -> "InfoSelling":
+        """Parse an item page fed in `chunks` incrementally with lxml.
+
+        `chunks` is read only until every field is complete,
+        so the rest of the page need not be downloaded.
+
+        Parameters
+        ----------
+        chunks : Iterable[bytes]
+            The HTML of a Yahoo!Auction item page in chunks.
+
+        Returns
+        -------
+        yahoo_auction_auto.info.InfoSelling
+        """
+        return cls(**extraction.parse_chunks(chunks, _FIELDS))
+
+
+# Fields in the order of `InfoSelling` fields.
+_FIELDS: dict[str, extraction.Field] = {
+    "aID": extraction.COMMON_FIELDS["aID"],
+    "title": extraction.COMMON_FIELDS["title"],
+    "seller_name": extraction.COMMON_FIELDS["seller_name"],
+    "stock": extraction.detail("個数", extraction.to_int, 0),
+    "start_datetime": extraction.COMMON_FIELDS["start_datetime"],
+    "end_datetime": extraction.COMMON_FIELDS["end_datetime"],
+    "refundable": extraction.detail("返品", extraction.to_refundable, False),
+    "startprice": extraction.COMMON_FIELDS["startprice"],
+    "timeleft": extraction.detail("残り時間", extraction.to_timeleft, "", "Count__number"),
+    "count_bid": extraction.COMMON_FIELDS["count_bid"],
+    "count_access": extraction.COMMON_FIELDS["count_access"],
+    "count_watch": extraction.COMMON_FIELDS["count_watch"],
+}
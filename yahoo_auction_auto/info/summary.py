@@ -0,0 +1,121 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+import dataclasses
+import re
+import typing as t
+
+import bs4
+from lxml import etree, html
+
+from yahoo_auction_auto import parsing
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class InfoSummary:
+    """Summary of an item in a row of a listing page.
+
+    It needs no fetch of the item page. Fields not shown in the row are empty.
+    """
+    aID: str
+    """The auction ID."""
+    url: str
+    """The URL of the item page."""
+    title: str
+    """The title of an auction."""
+    price: str
+    """The current or winning price of an auction."""
+    count_bid: int
+    """The number of bids."""
+    timeleft: str
+    """The timeleft of an auction."""
+
+    @classmethod
+    def fromsoup(cls, link: bs4.Tag) -> "InfoSummary":
+        """Get the summary of the row of the product link `link`."""
+        url = str(link.get("href") or "")
+        row = link.find_parent("tr")
+        cells: dict[str, str] = {}
+        if isinstance(row, bs4.Tag):
+            for cell in row.find_all("td"):
+                for key in cell.get_attribute_list("class"):
+                    cells.setdefault(key, str(cell.text))
+        return cls._fromcells(url, str(link.text), cells)
+
+    @classmethod
+    def fromtree(cls, link: html.HtmlElement) -> "InfoSummary":
+        """Get the summary of the row of the product link `link`."""
+        cells: dict[str, str] = {}
+        for cell in _XPATH_CELLS(link):
+            for key in str(cell.get("class", "")).split():
+                cells.setdefault(key, str(cell.text_content()))
+        return cls._fromcells(str(link.get("href", "")), str(link.text_content()), cells)
+
+    @classmethod
+    def _fromcells(cls, url: str, title: str, cells: dict[str, str]) -> "InfoSummary":
+        return cls(
+            aID=match[0] if (match := _AID_PATTERN.search(url)) else "",
+            url=url,
+            title=title.strip(),
+            price=_normalize(cells.get(_PRICE, "")),
+            count_bid=_to_count_bid(cells.get(_BID, "")),
+            timeleft=_normalize(cells.get(_TIMELEFT, "")),
+        )
+
+
+def fromhtml(
+    content: bytes | str,
+    pattern: str | t.Pattern[str],
+    parser: parsing.Parser = "lxml"
+) -> list[InfoSummary]:
+    """Get the summaries of the rows of product links in a listing page.
+
+    Parameters
+    ----------
+    content : bytes | str
+        The HTML of a Yahoo!Auction listing page.
+    pattern : str | Pattern[str]
+        The regular expression of `data-ylk` of product links.
+    parser : yahoo_auction_auto.parsing.Parser
+        The backend to parse `content`.
+
+    Returns
+    -------
+    list[yahoo_auction_auto.info.InfoSummary]
+        The summaries in the order of the links.
+    """
+    if parsing.check_parser(parser) == "lxml":
+        return fromtree(parsing.fromstring(content), pattern)
+    return fromsoup(bs4.BeautifulSoup(content, "lxml"), pattern)
+
+
+def fromtree(tree: html.HtmlElement, pattern: str | t.Pattern[str]) -> list[InfoSummary]:
+    """Get the summaries of the rows of product links in `tree` of a listing page."""
+    if isinstance(pattern, re.Pattern):
+        pattern = pattern.pattern
+    return [InfoSummary.fromtree(link) for link in _XPATH_LINKS(tree, pattern=pattern) if link.get("href")]
+
+
+def fromsoup(soup: bs4.BeautifulSoup, pattern: str | t.Pattern[str]) -> list[InfoSummary]:
+    """Get the summaries of the rows of product links in `soup` of a listing page."""
+    return [
+        InfoSummary.fromsoup(link)
+        for link in soup.find_all("a", attrs={"data-ylk": re.compile(pattern)})
+        if isinstance(link, bs4.Tag) and link.get("href")
+    ]
+
+
+_PRICE = "ItemTable__price"
+_BID = "ItemTable__bid"
+_TIMELEFT = "ItemTable__timeleft"
+_AID_PATTERN = re.compile(r'(?<=/)\w+$')
+_XPATH_LINKS = etree.XPath("//a[re:test(@data-ylk, $pattern)]", namespaces=parsing.REGEXP_NAMESPACES)
+_XPATH_CELLS = etree.XPath("ancestor::tr[1]/td")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _to_count_bid(text: str) -> int:
+    if match := re.search(r"\d+", text):
+        return int(match[0])
+    return 0
@@ -0,0 +1,213 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+"""Instrumentation of HTTP, parse and browser phases.
+
+Operations are measured in spans, and each finished span is reported to
+the hooks as an `Event`. Operation names are dotted such as
+
+- "http.item", "http.listing", "http.login", "http.cancel", "http.head"
+  with `method`, `url`, `status`, `bytes` and `redirects`
+- "parse.item", "parse.listing", "parse.field.<name>" with `parser`
+- "browser.start", "browser.login", "browser.navigate" with `url`
+- "get_info_selling", "cancel" and "snapshot" for the whole operations
+"""
+import collections
+import contextlib
+import dataclasses
+import logging
+import math
+import threading
+import time
+import typing as t
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class Event:
+    """A finished span."""
+    operation: str
+    """The name of the operation."""
+    duration: float
+    """Time taken in second."""
+    attributes: dict[str, t.Any] = dataclasses.field(default_factory=dict)
+    """Details of the operation such as `status` and `bytes`."""
+    error: BaseException | None = None
+    """The exception raised in the span if any."""
+
+
+Hook = t.Callable[[Event], None]
+
+
+class Instrumentation:
+    """Reporter of spans to hooks.
+
+    Spans cost almost nothing while no hook is added.
+    An exception raised by a hook is logged and does not affect the operation.
+
+    Parameters
+    ----------
+    hooks : Iterable[Hook]
+        Callbacks called with each `Event`.
+    clock : Callable[[], float]
+        The clock in second to measure spans.
+    """
+
+    def __init__(self, hooks: t.Iterable[Hook] = (), clock: t.Callable[[], float] = time.perf_counter) -> None:
+        self._hooks = tuple(hooks)
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    @property
+    def hooks(self) -> tuple[Hook, ...]:
+        return self._hooks
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any hook is added."""
+        return bool(self._hooks)
+
+    def add_hook(self, hook: Hook) -> None:
+        with self._lock:
+            self._hooks = self._hooks + (hook,)
+
+    def remove_hook(self, hook: Hook) -> None:
+        with self._lock:
+            self._hooks = tuple(h for h in self._hooks if h != hook)
+
+    @contextlib.contextmanager
+    def span(self, operation: str, **attributes: t.Any) -> t.Iterator[dict[str, t.Any]]:
+        """Measure the block as `operation`.
+
+        Parameters
+        ----------
+        operation : str
+            The name of the operation.
+        **attributes : Any
+            Initial attributes of the event.
+
+        Yields
+        ------
+        dict[str, Any]
+            The attributes of the event, which the block can add to.
+        """
+        if not self._hooks:
+            yield attributes
+            return
+        start = self._clock()
+        try:
+            yield attributes
+        except BaseException as e:
+            self.emit(Event(operation, self._clock() - start, attributes, e))
+            raise
+        self.emit(Event(operation, self._clock() - start, attributes))
+
+    def emit(self, event: Event) -> None:
+        """Report `event` to the hooks."""
+        for hook in self._hooks:
+            try:
+                hook(event)
+            except Exception:
+                logger.exception("Instrumentation hook %r failed", hook)
+
+
+@dataclasses.dataclass(frozen=True)
+class Summary:
+    """Statistics of an operation."""
+    count: int
+    """The number of events."""
+    errors: int
+    """The number of events with an error."""
+    total: float
+    """Total time in second."""
+    p50: float
+    """The median time in second."""
+    p95: float
+    """The 95th percentile time in second."""
+    p99: float
+    """The 99th percentile time in second."""
+    max: float
+    """The maximum time in second."""
+    bytes: int
+    """Total `bytes` attributes."""
+
+
+@dataclasses.dataclass()
+class _Totals:
+    count: int = 0
+    errors: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    bytes: int = 0
+
+
+class Aggregator:
+    """Hook which aggregates events in memory per operation.
+
+    Percentiles are computed over the latest `max_samples` events of each
+    operation, while counts and totals cover all events.
+
+    Parameters
+    ----------
+    max_samples : int
+        The number of latest durations kept per operation.
+    """
+
+    def __init__(self, max_samples: int = 10000) -> None:
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._samples: dict[str, collections.deque[float]] = {}
+        self._totals: dict[str, _Totals] = {}
+
+    def __call__(self, event: Event) -> None:
+        with self._lock:
+            if (samples := self._samples.get(event.operation)) is None:
+                samples = self._samples[event.operation] = collections.deque(maxlen=self.max_samples)
+                self._totals[event.operation] = _Totals()
+            samples.append(event.duration)
+            totals = self._totals[event.operation]
+            totals.count += 1
+            totals.errors += event.error is not None
+            totals.total += event.duration
+            totals.max = max(totals.max, event.duration)
+            totals.bytes += int(event.attributes.get("bytes") or 0)
+
+    def percentile(self, operation: str, q: float) -> float | None:
+        """Get the `q`th percentile time of `operation` in second, or None if not observed."""
+        with self._lock:
+            if not (samples := self._samples.get(operation)):
+                return None
+            return _percentile(sorted(samples), q)
+
+    def summary(self) -> dict[str, Summary]:
+        """Get the statistics of each operation."""
+        with self._lock:
+            items = [
+                (operation, sorted(samples), dataclasses.replace(self._totals[operation]))
+                for operation, samples in self._samples.items()
+            ]
+        return {
+            operation: Summary(
+                totals.count,
+                totals.errors,
+                totals.total,
+                _percentile(samples, 50),
+                _percentile(samples, 95),
+                _percentile(samples, 99),
+                totals.max,
+                totals.bytes,
+            )
+            for operation, samples, totals in items
+        }
+
+    def reset(self) -> None:
+        """Drop all events."""
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    """Get the `q`th percentile of sorted `samples` by the nearest rank."""
+    rank = math.ceil(q / 100 * len(samples))
+    return samples[min(max(rank, 1), len(samples)) - 1]
@@ -0,0 +1,255 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+import dataclasses
+import heapq
+import itertools
+import logging
+import time
+import typing as t
+
+from yahoo_auction_auto import instrument, sync, yahoo_auction
+from yahoo_auction_auto.info import InfoSelling
+
+
+logger = logging.getLogger(__name__)
+
+EventKind = t.Literal["added", "changed", "ended", "failed"]
+
+
+@dataclasses.dataclass(frozen=True)
+class Event:
+    """Change of an item found by a `Monitor`."""
+    kind: EventKind
+    """"added" on the first fetch, "changed" when fields differ from the last fetch,
+    "ended" when the item is no longer listed and "failed" when a fetch failed."""
+    aID: str
+    """The auction ID of the item."""
+    info: InfoSelling | None = None
+    """The latest information of the item, if any was fetched."""
+    changes: dict[str, tuple[t.Any, t.Any]] = dataclasses.field(default_factory=dict)
+    """Changed fields as `{field: (old, new)}` of a "changed" event."""
+    error: Exception | None = None
+    """The exception raised by a "failed" fetch."""
+
+
+@dataclasses.dataclass()
+class _Watch:
+    info: InfoSelling | None = None
+    fetched: float = 0.0
+    bid_changed: float = -float("inf")
+    due: float = 0.0
+
+
+class Monitor:
+    """Deadline-aware polling of the items currently selling.
+
+    An item is polled at an interval of `ratio` of its time left, bounded
+    by `min_interval` and `max_interval`, so auctions ending soon are polled
+    often and ones ending days later rarely. While its `count_bid` changed
+    within `active_window`, it is polled at most every `active_interval`.
+    The listing is crawled every `listing_interval` to find new and ended
+    items.
+
+    Requests are bounded by a token bucket of `rate` per second up to
+    `burst`. When more items are due than the budget allows, the most
+    overdue are polled first. A crawl of the listing starts once a token
+    is available and is charged a token per request of the listing and
+    the login check, counted by a hook on the instrumentation of `yah`. Polls wait until the tokens
+    spent beyond the budget are refilled.
+
+    An empty listing ends no items unless the login turns out to be
+    expired, as checked by `sync.check_listing`.
+
+    Parameters
+    ----------
+    yah : yahoo_auction_auto.YahooAuction
+        The API to list and fetch items.
+    rate : float
+        Requests per second.
+    burst : int
+        The maximum number of requests sent at once.
+    min_interval : float
+        The minimum interval of polls of an item in second.
+    max_interval : float
+        The maximum interval of polls of an item in second.
+    ratio : float
+        The interval of polls as the ratio to the time left.
+    active_interval : float
+        The maximum interval of polls of an item with recent bids in second.
+    active_window : float
+        Time in second after a change of `count_bid` during which an item is active.
+    listing_interval : float
+        The interval of crawls of the listing in second.
+    clock : Callable[[], float]
+        The clock in epoch second.
+    sleep : Callable[[float], None]
+        The function to sleep in second.
+    """
+
+    def __init__(
+        self,
+        yah: yahoo_auction.YahooAuction,
+        rate: float = 1,
+        burst: int = 8,
+        min_interval: float = 30,
+        max_interval: float = 3600,
+        ratio: float = 0.1,
+        active_interval: float = 60,
+        active_window: float = 600,
+        listing_interval: float = 600,
+        clock: t.Callable[[], float] = time.time,
+        sleep: t.Callable[[float], None] = time.sleep
+    ) -> None:
+        if rate <= 0 or burst < 1:
+            raise ValueError(f"invalid budget: rate={rate}, burst={burst}")
+        self.yah = yah
+        self.rate = rate
+        self.burst = burst
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.ratio = ratio
+        self.active_interval = active_interval
+        self.active_window = active_window
+        self.listing_interval = listing_interval
+        self._clock = clock
+        self._sleep = sleep
+        self._watches: dict[str, _Watch] = {}
+        self._queue: list[tuple[float, int, str]] = []
+        self._counter = itertools.count()
+        self._listed = -float("inf")
+        self._tokens = float(burst)
+        self._refilled = clock()
+        self.requests = 0
+        """The number of requests sent."""
+
+    def __len__(self) -> int:
+        return len(self._watches)
+
+    def interval(self, aID: str) -> float:
+        """Time in second until the next poll of `aID`."""
+        watch = self._watches[aID]
+        now = self._clock()
+        if watch.info is None or (end := sync.end_timestamp(watch.info, watch.fetched)) is None:
+            interval = self.min_interval
+        else:
+            interval = min(max((end - now) * self.ratio, self.min_interval), self.max_interval)
+        if now - watch.bid_changed <= self.active_window:
+            interval = min(interval, max(self.active_interval, self.min_interval))
+        return interval
+
+    def next_due(self) -> float:
+        """The time in epoch second when the next request can be sent."""
+        due = self._listed + self.listing_interval
+        while self._queue:
+            when, _, aID = self._queue[0]
+            if aID in self._watches and self._watches[aID].due == when:
+                due = min(due, when)
+                break
+            heapq.heappop(self._queue)
+        self._refill(self._clock())
+        if self._tokens < 1:
+            due = max(due, self._refilled + (1 - self._tokens) / self.rate)
+        return due
+
+    def step(self) -> list[Event]:
+        """Crawl the listing if due and poll the due items within the budget.
+
+        Returns
+        -------
+        list[Event]
+            The changes found.
+        """
+        events: list[Event] = []
+        now = self._clock()
+        self._refill(now)
+        if now >= self._listed + self.listing_interval and self._withdraw():
+            events.extend(self._crawl(now))
+        aIDs: list[str] = []
+        while self._queue and self._queue[0][0] <= now and self._tokens >= 1:
+            when, _, aID = heapq.heappop(self._queue)
+            if aID in self._watches and self._watches[aID].due == when and aID not in aIDs:
+                self._withdraw()
+                aIDs.append(aID)
+        for aID, result in self.yah.get_info_selling_many(aIDs):
+            if aID not in self._watches:
+                continue
+            if isinstance(result, Exception):
+                events.append(Event("failed", aID, self._watches[aID].info, error=result))
+            elif (event := self._update(aID, result)) is not None:
+                events.append(event)
+            self._schedule(aID, self._clock() + self.interval(aID))
+        return events
+
+    def run(self, stop: t.Callable[[], bool] = lambda: False) -> t.Iterator[Event]:
+        """Poll forever, sleeping until the next request is due.
+
+        Parameters
+        ----------
+        stop : Callable[[], bool]
+            Checked before each step. The monitor stops when it returns true.
+
+        Yields
+        ------
+        Event
+            The changes found.
+        """
+        while not stop():
+            yield from self.step()
+            if (delay := self.next_due() - self._clock()) > 0:
+                self._sleep(delay)
+
+    def _crawl(self, now: float) -> list[Event]:
+        self._listed = now
+        pages: list[instrument.Event] = []
+
+        def count(event: instrument.Event) -> None:
+            if event.operation in ("http.listing", "http.login"):
+                pages.append(event)
+        self.yah.instrumentation.add_hook(count)
+        try:
+            listed = list(dict.fromkeys(self.yah.iter_aIDs_selling()))
+            sync.check_listing(self.yah, listed, len(self._watches))
+        except Exception:
+            logger.warning("Failed to crawl the listing", exc_info=True)
+            return []
+        finally:
+            self.yah.instrumentation.remove_hook(count)
+            self._charge(len(pages) - 1)
+        ended = self._watches.keys() - set(listed)
+        events = [Event("ended", aID, self._watches.pop(aID).info) for aID in sorted(ended)]
+        for aID in listed:
+            if aID not in self._watches:
+                self._watches[aID] = _Watch()
+                self._schedule(aID, now)
+        return events
+
+    def _update(self, aID: str, new: InfoSelling) -> Event | None:
+        watch = self._watches[aID]
+        old, watch.info, watch.fetched = watch.info, new, self._clock()
+        if old is None:
+            return Event("added", aID, new)
+        if not (changes := sync.diff(old, new)):
+            return None
+        if "count_bid" in changes:
+            watch.bid_changed = watch.fetched
+        return Event("changed", aID, new, changes)
+
+    def _schedule(self, aID: str, due: float) -> None:
+        self._watches[aID].due = due
+        heapq.heappush(self._queue, (due, next(self._counter), aID))
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self._tokens + (now - self._refilled) * self.rate, self.burst)
+        self._refilled = now
+
+    def _charge(self, requests: int) -> None:
+        """Spend tokens for `requests` already sent, which may leave the bucket in debt."""
+        if requests > 0:
+            self._tokens -= requests
+            self.requests += requests
+
+    def _withdraw(self) -> bool:
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        self.requests += 1
+        return True
@@ -0,0 +1,55 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+import typing as t
+
+from lxml import etree, html
+
+
+Parser = t.Literal["bs4", "lxml"]
+"""Backend to parse pages.
+
+"lxml" extracts fields from an `lxml.html` tree with precompiled XPath,
+and "bs4" extracts them from a `bs4.BeautifulSoup` tree.
+"""
+
+PARSERS: tuple[Parser, ...] = t.get_args(Parser)
+
+REGEXP_NAMESPACES = {"re": "http://exslt.org/regular-expressions"}
+"""Namespaces to use EXSLT regular expressions in XPath."""
+
+
+def fromstring(content: bytes | str) -> html.HtmlElement:
+    """Parse `content` into an `lxml.html` tree.
+
+    Parameters
+    ----------
+    content : bytes | str
+        An HTML document.
+
+    Returns
+    -------
+    lxml.html.HtmlElement
+        The root element. It is an empty `html` element if `content` is empty.
+    """
+    root = etree.fromstring(content, html.html_parser) if content else None
+    if root is None:
+        return html.Element("html")
+    return root
+
+
+def has_class(name: str) -> str:
+    """Get an XPath predicate which is true if an element has class `name`."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def check_parser(parser: str) -> Parser:
+    """Check `parser` is one of `PARSERS`.
+
+    Raises
+    ------
+    ValueError
+        If `parser` is unknown.
+    """
+    for _parser in PARSERS:
+        if parser == _parser:
+            return _parser
+    raise ValueError(f"Unknown parser: {parser!r}, expected one of {PARSERS}")
@@ -0,0 +1,194 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+import contextlib
+import dataclasses
+import threading
+import time
+import typing as t
+
+
+THROTTLED = frozenset({429, 503})
+"""Status codes which mean the server is throttling."""
+
+
+@dataclasses.dataclass()
+class RateLimiterStats:
+    requests: int = 0
+    """The number of finished requests."""
+    throttled: int = 0
+    """The number of responses with a status in `THROTTLED`."""
+    slow: int = 0
+    """The number of responses slower than `RateLimiter.slow`."""
+    failed: int = 0
+    """The number of requests which raised an exception."""
+    decreases: int = 0
+    """The number of times the concurrency was decreased."""
+    increases: int = 0
+    """The number of times the concurrency was increased."""
+
+
+@dataclasses.dataclass()
+class Permit:
+    """Permission to send a request, to be filled with its outcome."""
+    status: int | None = None
+    """The status code of the response."""
+    retry_after: float | None = None
+    """`Retry-After` of the response in second."""
+
+
+class RateLimiter:
+    """Token bucket rate limiter with AIMD adaptive concurrency.
+
+    A request needs a token and a concurrency slot. Tokens are refilled at
+    `rate` per second up to `burst`. The concurrency limit grows by one after
+    as many healthy responses as the limit, and is multiplied by `decrease`
+    on a throttled, slow or failed request, at most once per `cooldown`,
+    down to `min_concurrency`. `rate` is fixed.
+    `Retry-After` of a throttled response pauses all requests.
+
+    A limiter is thread-safe and can be shared by many `YahooAuction`.
+
+    Parameters
+    ----------
+    rate : float | None
+        Requests per second, which must be positive. Not limited if None.
+    burst : int
+        The maximum number of tokens, at least 1.
+    max_concurrency : int
+        The upper bound of the concurrency limit.
+    min_concurrency : int
+        The lower bound of the concurrency limit.
+    initial_concurrency : int | None
+        The concurrency limit to start from. `max_concurrency` is used if None.
+    slow : float | None
+        Time in second after which a response is treated as slow. Not checked if None.
+    decrease : float
+        The factor to multiply the concurrency limit by on backoff.
+    cooldown : float
+        Time in second after a decrease during which it is not decreased again.
+    clock : Callable[[], float]
+        The monotonic clock in second.
+    """
+
+    def __init__(
+        self,
+        rate: float | None = 10,
+        burst: int = 10,
+        max_concurrency: int = 16,
+        min_concurrency: int = 1,
+        initial_concurrency: int | None = None,
+        slow: float | None = 10,
+        decrease: float = 0.5,
+        cooldown: float = 1,
+        clock: t.Callable[[], float] = time.monotonic
+    ) -> None:
+        if rate is not None and not rate > 0 or burst < 1:
+            raise ValueError(f"invalid budget: rate={rate}, burst={burst}")
+        if not 1 <= min_concurrency <= max_concurrency:
+            raise ValueError(f"invalid concurrency range: {min_concurrency}..{max_concurrency}")
+        if not 0 < decrease < 1:
+            raise ValueError(f"decrease must be between 0 and 1: {decrease}")
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.slow = slow
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._concurrency = float(min(max(initial_concurrency or max_concurrency, min_concurrency), max_concurrency))
+        self._in_flight = 0
+        self._successes = 0
+        self._tokens = float(burst)
+        self._refilled = clock()
+        self._paused_until = -float("inf")
+        self._decreased = -float("inf")
+        self._stats = RateLimiterStats()
+
+    @property
+    def concurrency(self) -> int:
+        """The current concurrency limit."""
+        return int(self._concurrency)
+
+    @property
+    def in_flight(self) -> int:
+        """The number of requests being sent."""
+        return self._in_flight
+
+    @property
+    def throttled(self) -> bool:
+        """Whether requests are paused by `Retry-After` or the concurrency was decreased within `cooldown`."""
+        with self._condition:
+            now = self._clock()
+            return now < self._paused_until or now - self._decreased < self.cooldown
+
+    @property
+    def stats(self) -> RateLimiterStats:
+        """A copy of the statistics of the limiter."""
+        with self._condition:
+            return dataclasses.replace(self._stats)
+
+    @contextlib.contextmanager
+    def acquire(self) -> t.Iterator[Permit]:
+        """Wait for a token and a slot, and send a request in the block.
+
+        The block should set the outcome of the request to the yielded
+        `Permit`. An exception raised in the block is counted as a failure.
+        """
+        self._wait()
+        permit = Permit()
+        start = self._clock()
+        try:
+            yield permit
+        except BaseException:
+            self._release(permit, self._clock() - start, failed=True)
+            raise
+        self._release(permit, self._clock() - start, failed=False)
+
+    def _wait(self) -> None:
+        with self._condition:
+            while True:
+                now = self._clock()
+                self._refill(now)
+                timeout: float | None = None
+                if self._in_flight < self.concurrency:
+                    if now < self._paused_until:
+                        timeout = self._paused_until - now
+                    elif self.rate is None or self._tokens >= 1:
+                        self._tokens -= 1
+                        self._in_flight += 1
+                        return
+                    else:
+                        timeout = (1 - self._tokens) / self.rate
+                self._condition.wait(timeout)
+
+    def _refill(self, now: float) -> None:
+        if self.rate is not None:
+            self._tokens = min(self._tokens + (now - self._refilled) * self.rate, self.burst)
+        self._refilled = now
+
+    def _release(self, permit: Permit, elapsed: float, failed: bool) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            self._stats.requests += 1
+            throttled = permit.status in THROTTLED
+            slow = self.slow is not None and elapsed > self.slow
+            self._stats.throttled += throttled
+            self._stats.slow += slow
+            self._stats.failed += failed
+            now = self._clock()
+            if throttled and permit.retry_after is not None:
+                self._paused_until = max(self._paused_until, now + permit.retry_after)
+            if throttled or slow or failed:
+                self._successes = 0
+                if now - self._decreased >= self.cooldown:
+                    self._decreased = now
+                    self._concurrency = max(self._concurrency * self.decrease, self.min_concurrency)
+                    self._stats.decreases += 1
+            else:
+                self._successes += 1
+                if self._successes >= self.concurrency and self._concurrency < self.max_concurrency:
+                    self._successes = 0
+                    self._concurrency = min(self._concurrency + 1, self.max_concurrency)
+                    self._stats.increases += 1
+            self._condition.notify_all()
@@ -0,0 +1,339 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+import collections
+import concurrent.futures
+import dataclasses
+import random
+import statistics
+import threading
+import time
+import typing as t
+
+import requests
+
+from yahoo_auction_auto import ratelimit
+
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+"""Status codes of responses which are retried."""
+
+
+@dataclasses.dataclass()
+class RetryStats:
+    requests: int = 0
+    """The number of calls of `RetryPolicy.send`."""
+    retries: int = 0
+    """The number of retried requests."""
+    hedges: int = 0
+    """The number of duplicate requests sent by hedging."""
+    hedge_wins: int = 0
+    """The number of duplicate requests whose response was used."""
+    exhausted: int = 0
+    """The number of retries or hedges given up because the budget ran out."""
+
+    @property
+    def hedge_rate(self) -> float:
+        """The ratio of hedged calls to all calls."""
+        return self.hedges / self.requests if self.requests else 0.0
+
+
+class RetryPolicy:
+    """Retries with a budget and hedging for idempotent GET requests.
+
+    A failed request, which raised a connection error or a timeout or was
+    answered with a status in `RETRY_STATUSES`, is retried up to
+    `max_retries` times after a backoff with full jitter.
+
+    With `hedge`, a duplicate is sent when no response arrives within the
+    `hedge_percentile`th percentile of recent latencies. Once enough
+    latencies are known, both requests are sent from background threads
+    and the first response whose status is not retried is returned. The
+    other request is cancelled if it is not sent yet, and its response is
+    closed otherwise. Latencies and the wait before hedging are measured
+    from `started`, which the request calls once its rate limiter lets it
+    through, and no duplicate is sent while the rate limiter is throttled.
+
+    Retries and hedges draw from a budget which is refilled by `budget_ratio`
+    per call up to `budget`, so they are bounded to about `budget_ratio` of
+    calls when the server is unhealthy.
+
+    A policy is thread-safe and can be shared by many `YahooAuction`.
+
+    Parameters
+    ----------
+    max_retries : int
+        The maximum number of retries per call.
+    budget : float
+        The maximum number of retries and hedges which can be spent at once.
+    budget_ratio : float
+        The budget refilled per call.
+    backoff : float
+        The base time of backoff in second, doubled on each retry.
+    max_backoff : float
+        The maximum time of backoff in second.
+    hedge : bool
+        Whether to send duplicate requests for slow responses.
+    hedge_percentile : float
+        The percentile of latencies to wait for before hedging.
+    min_samples : int
+        The number of latencies needed per operation before hedging.
+    window : int
+        The number of recent latencies kept per operation.
+    hedge_workers : int
+        The number of threads to send hedged requests and their duplicates.
+    sleep : Callable[[float], None]
+        The function to sleep in second.
+    random : Callable[[], float]
+        The function to get a random number in [0, 1) for jitter.
+    clock : Callable[[], float]
+        The monotonic clock in second to measure latencies.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 2,
+        budget: float = 10,
+        budget_ratio: float = 0.1,
+        backoff: float = 0.5,
+        max_backoff: float = 10,
+        hedge: bool = False,
+        hedge_percentile: float = 95,
+        min_samples: int = 20,
+        window: int = 1000,
+        hedge_workers: int = 32,
+        sleep: t.Callable[[float], None] = time.sleep,
+        random: t.Callable[[], float] = random.random,
+        clock: t.Callable[[], float] = time.monotonic
+    ) -> None:
+        self.max_retries = max_retries
+        self.budget = budget
+        self.budget_ratio = budget_ratio
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self.window = window
+        self.hedge_workers = hedge_workers
+        self._sleep = sleep
+        self._random = random
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._balance = budget
+        self._latencies: dict[str, collections.deque[float]] = {}
+        self._stats = RetryStats()
+        self._executor: concurrent.futures.ThreadPoolExecutor | None = None
+        self._local = threading.local()
+
+    @property
+    def stats(self) -> RetryStats:
+        """A copy of the statistics of the policy."""
+        with self._lock:
+            return dataclasses.replace(self._stats)
+
+    def close(self) -> None:
+        """Stop the threads for hedged requests.
+
+        They are started again on the next hedged request.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def hedge_delay(self, operation: str) -> float | None:
+        """Time in second to wait before hedging `operation`, or None if too few latencies are known."""
+        with self._lock:
+            latencies = list(self._latencies.get(operation, ()))
+        if len(latencies) < max(self.min_samples, 2):
+            return None
+        return statistics.quantiles(latencies, n=100, method="inclusive")[min(int(self.hedge_percentile), 99) - 1]
+
+    def started(self) -> None:
+        """Mark that the request being sent by `send` on the current thread got past its rate limiter.
+
+        Latencies and the wait before hedging are measured from here, or
+        from the call of the request if it is not called.
+        It does nothing outside `send`.
+        """
+        if (call := getattr(self._local, "call", None)) is not None:
+            call.start = self._clock()
+            call.started.set()
+
+    def send(
+        self,
+        operation: str,
+        request: t.Callable[[], requests.Response],
+        rate_limiter: ratelimit.RateLimiter | None = None
+    ) -> requests.Response:
+        """Send `request` with retries and hedging.
+
+        Parameters
+        ----------
+        operation : str
+            The name of the operation to track latencies by, such as "http.item".
+        request : Callable[[], requests.Response]
+            The function to send the request.
+        rate_limiter : yahoo_auction_auto.RateLimiter | None
+            The limiter of `request`, which should call `started` once the limiter
+            lets it through. No duplicate is sent while it is throttled.
+
+        Returns
+        -------
+        requests.Response
+            The first successful response, or the last response if retries are exhausted.
+        """
+        with self._lock:
+            self._stats.requests += 1
+            self._balance = min(self._balance + self.budget_ratio, self.budget)
+        attempt = 0
+        while True:
+            error: requests.RequestException | None = None
+            response: requests.Response | None = None
+            try:
+                response = self._send(operation, request, rate_limiter)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                return response
+            if attempt >= self.max_retries or not self._withdraw():
+                if response is not None:
+                    return response
+                assert error is not None
+                raise error
+            if response is not None:
+                response.close()
+            with self._lock:
+                self._stats.retries += 1
+            self._sleep(self._random() * min(self.max_backoff, self.backoff * 2 ** attempt))
+            attempt += 1
+
+    def _send(
+        self,
+        operation: str,
+        request: t.Callable[[], requests.Response],
+        rate_limiter: ratelimit.RateLimiter | None
+    ) -> requests.Response:
+        call = _Call(self._clock())
+        if rate_limiter is None:
+            call.started.set()
+        if not self.hedge or (delay := self.hedge_delay(operation)) is None:
+            return self._attempt(operation, request, call)
+        executor = self._get_executor()
+        primary = t.cast(
+            "concurrent.futures.Future[requests.Response | None]",
+            executor.submit(self._attempt, operation, request, call)
+        )
+        futures: set[concurrent.futures.Future[requests.Response | None]] = {
+            primary, executor.submit(self._hedge, request, call, delay, rate_limiter)
+        }
+        response: requests.Response | None = None
+        winner: concurrent.futures.Future[requests.Response | None] | None = None
+        error: requests.RequestException | None = None
+        try:
+            while futures and (response is None or response.status_code in RETRY_STATUSES):
+                done, _ = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in sorted(done, key=lambda future: future is not primary):
+                    futures.remove(future)
+                    try:
+                        result = future.result()
+                    except (requests.ConnectionError, requests.Timeout) as e:
+                        if future is primary:
+                            error = e
+                        continue
+                    except Exception:
+                        if future is primary:
+                            raise
+                        continue
+                    if result is None:
+                        continue
+                    if response is None or (
+                        response.status_code in RETRY_STATUSES and result.status_code not in RETRY_STATUSES
+                    ):
+                        if response is not None:
+                            response.close()
+                        response, winner = result, future
+                    else:
+                        result.close()
+        except BaseException:
+            if response is not None:
+                response.close()
+            raise
+        finally:
+            for future in futures:
+                if not future.cancel():
+                    future.add_done_callback(_close)
+        if response is None:
+            assert error is not None
+            raise error
+        if winner is not primary:
+            with self._lock:
+                self._stats.hedge_wins += 1
+        return response
+
+    def _attempt(
+        self,
+        operation: str,
+        request: t.Callable[[], requests.Response],
+        call: "_Call"
+    ) -> requests.Response:
+        """Send `request` as the first request of `call` and record its latency."""
+        self._local.call = call
+        try:
+            response = request()
+        finally:
+            self._local.call = None
+            call.done.set()
+            call.started.set()
+        self._record(operation, self._clock() - call.start)
+        return response
+
+    def _hedge(
+        self,
+        request: t.Callable[[], requests.Response],
+        call: "_Call",
+        delay: float,
+        rate_limiter: ratelimit.RateLimiter | None
+    ) -> requests.Response | None:
+        """Send a duplicate of `request` if `call` is not done within `delay` after it started."""
+        call.started.wait()
+        if call.done.wait(max(call.start + delay - self._clock(), 0)):
+            return None
+        if rate_limiter is not None and rate_limiter.throttled or not self._withdraw():
+            return None
+        with self._lock:
+            self._stats.hedges += 1
+        return request()
+
+    def _withdraw(self) -> bool:
+        with self._lock:
+            if self._balance < 1:
+                self._stats.exhausted += 1
+                return False
+            self._balance -= 1
+            return True
+
+    def _record(self, operation: str, latency: float) -> None:
+        with self._lock:
+            if (latencies := self._latencies.get(operation)) is None:
+                latencies = self._latencies[operation] = collections.deque(maxlen=self.window)
+            latencies.append(latency)
+
+    def _get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(self.hedge_workers, "hedge")
+            return self._executor
+
+
+@dataclasses.dataclass()
+class _Call:
+    """A request being sent by `RetryPolicy.send`."""
+    start: float
+    started: threading.Event = dataclasses.field(default_factory=threading.Event)
+    done: threading.Event = dataclasses.field(default_factory=threading.Event)
+
+
+def _close(future: "concurrent.futures.Future[requests.Response | None]") -> None:
+    """Close the response of a duplicate request which is not used."""
+    if not future.cancelled() and future.exception() is None and (response := future.result()) is not None:
+        response.close()
@@ -0,0 +1,230 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+import collections
+import concurrent.futures
+import logging
+import queue
+import threading
+import types
+import typing as t
+
+from yahoo_auction_auto import info, yahoo_auction
+
+
+logger = logging.getLogger(__name__)
+
+T = t.TypeVar("T")
+R = t.TypeVar("R")
+
+
+class Scheduler:
+    """Scheduler of tasks across many accounts.
+
+    Each account is a `YahooAuction` with its own cookies, `max_workers`
+    and `rate_limiter`. Tasks are taken from the accounts in round robin,
+    so an account with many items does not starve the others, and at most
+    `max_workers` tasks run at a time in total.
+
+    Parameters
+    ----------
+    accounts : Mapping[str, yahoo_auction_auto.YahooAuction]
+        The APIs keyed by account name.
+    max_workers : int
+        Maximum number of concurrent tasks over all accounts.
+    """
+
+    def __init__(self, accounts: t.Mapping[str, yahoo_auction.YahooAuction], max_workers: int = 32) -> None:
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be positive: {max_workers}")
+        self.accounts = dict(accounts)
+        self.max_workers = max_workers
+
+    def __enter__(self) -> "Scheduler":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: types.TracebackType | None
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the sessions of all accounts."""
+        for yah in self.accounts.values():
+            yah.close()
+
+    def shard(self, index: int, count: int) -> "Scheduler":
+        """Get a scheduler of the accounts in the `index`th of `count` shards.
+
+        The accounts are split by `shard`, so processes given the same
+        accounts with `index` from 0 to `count - 1` share them without
+        overlap. The shard shares the APIs with this scheduler.
+        """
+        names = shard(self.accounts, index, count)
+        return Scheduler({name: self.accounts[name] for name in names}, self.max_workers)
+
+    def map(
+        self,
+        func: t.Callable[[yahoo_auction.YahooAuction, T], R],
+        items: t.Mapping[str, t.Iterable[T]]
+    ) -> t.Generator[tuple[str, T | None, R | Exception], None, None]:
+        """Apply `func` to the items of each account concurrently.
+
+        Items of each account are pulled on a thread of its own, so slow
+        iterators such as listing crawls of different accounts overlap. An
+        item is pulled only while fewer than `max_workers` of the account
+        are pulled and not finished yet.
+
+        Parameters
+        ----------
+        func : Callable[[yahoo_auction_auto.YahooAuction, T], R]
+            The function to apply to the API of an account and an item.
+        items : Mapping[str, Iterable[T]]
+            The items keyed by account name.
+
+        Yields
+        ------
+        account : str
+            The name of an account.
+        item : T | None
+            The item, or None if iterating the items of the account failed.
+            The rest of the items of the account are skipped then.
+        result : R | Exception
+            The result of `func`, or the exception raised.
+        """
+        for name in items:
+            if name not in self.accounts:
+                raise KeyError(f"Unknown account: {name}")
+        events: queue.Queue[tuple[str, str, t.Any]] = queue.Queue()
+        stop = threading.Event()
+        slots = {name: threading.Semaphore(self.accounts[name].max_workers) for name in items}
+        buffers: dict[str, collections.deque[T]] = {name: collections.deque() for name in items}
+        ring = collections.deque(items)
+        producing = set(items)
+        pending: dict[concurrent.futures.Future[R], tuple[str, T]] = {}
+
+        def take() -> str | None:
+            for _ in range(len(ring)):
+                name = ring[0]
+                ring.rotate(-1)
+                if buffers[name]:
+                    return name
+            return None
+
+        with concurrent.futures.ThreadPoolExecutor(self.max_workers) as executor:
+            for name in items:
+                threading.Thread(
+                    target=_produce, args=(name, items[name], slots[name], stop, events), daemon=True
+                ).start()
+            try:
+                while producing or pending or any(buffers.values()):
+                    while len(pending) < self.max_workers and (account := take()) is not None:
+                        item = buffers[account].popleft()
+                        future = executor.submit(func, self.accounts[account], item)
+                        pending[future] = (account, item)
+                        future.add_done_callback(lambda future: events.put(("", "done", future)))
+                    name, kind, value = events.get()
+                    if kind == "item":
+                        buffers[name].append(value)
+                    elif kind == "finished":
+                        producing.discard(name)
+                    elif kind == "failed":
+                        producing.discard(name)
+                        yield name, None, value
+                    elif value in pending:
+                        name, item = pending.pop(value)
+                        slots[name].release()
+                        result: R | Exception
+                        try:
+                            result = value.result()
+                        except Exception as e:
+                            result = e
+                        yield name, item, result
+            finally:
+                stop.set()
+                for future in pending:
+                    future.cancel()
+                for slot in slots.values():
+                    slot.release()
+
+    def each(self, func: t.Callable[[yahoo_auction.YahooAuction], R]) -> dict[str, R | Exception]:
+        """Apply `func` to the API of each account concurrently.
+
+        Returns
+        -------
+        dict[str, R | Exception]
+            The result of `func`, or the exception raised, keyed by account name.
+        """
+        return {
+            name: result
+            for name, _, result in self.map(lambda yah, _: func(yah), {name: [None] for name in self.accounts})
+        }
+
+    def get_info_selling_all(self) -> t.Generator[tuple[str, str | None, info.InfoSelling | Exception], None, None]:
+        """Get information of the items currently selling of all accounts.
+
+        The listing of each account is crawled page by page while its items are fetched.
+
+        Yields
+        ------
+        account : str
+            The name of an account.
+        aID : str | None
+            The auction ID of an item, or None if crawling the listing failed.
+        info : yahoo_auction_auto.info.InfoSelling | Exception
+            The information of the item, or the exception raised.
+        """
+        return self.map(
+            yahoo_auction.YahooAuction.get_info_selling,
+            {name: yah.iter_aIDs_selling() for name, yah in self.accounts.items()}
+        )
+
+
+def shard(names: t.Iterable[str], index: int, count: int) -> list[str]:
+    """Select the names in the `index`th of `count` shards.
+
+    The sorted names are dealt to the shards in turn, so the shards differ
+    in size by one at most and the split depends only on the set of names.
+
+    Parameters
+    ----------
+    names : Iterable[str]
+        The names of accounts.
+    index : int
+        The index of the shard from 0.
+    count : int
+        The number of shards.
+
+    Returns
+    -------
+    list[str]
+        The sorted names in the shard.
+    """
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard: {index}/{count}")
+    return sorted(set(names))[index::count]
+
+
+def _produce(
+    name: str,
+    items: t.Iterable[T],
+    slot: threading.Semaphore,
+    stop: threading.Event,
+    events: "queue.Queue[tuple[str, str, t.Any]]"
+) -> None:
+    iterator = iter(items)
+    while True:
+        slot.acquire()
+        if stop.is_set():
+            return
+        try:
+            item = next(iterator)
+        except StopIteration:
+            events.put((name, "finished", None))
+            return
+        except Exception as e:
+            logger.warning("Failed to iterate items of %s", name, exc_info=True)
+            events.put((name, "failed", e))
+            return
+        events.put((name, "item", item))
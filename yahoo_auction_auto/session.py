@@ -0,0 +1,35 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+import typing as t
+
+import requests
+from requests import adapters
+
+from yahoo_auction_auto import cookie
+
+
+def create_session(cookies: t.Iterable[cookie.Cookie], pool_maxsize: int = 10) -> requests.Session:
+    """Create a keep-alive session with cookies installed.
+
+    Parameters
+    ----------
+    cookies : Iterable[yahoo_auction_auto.cookie.Cookie]
+        Cookies to install.
+    pool_maxsize : int
+        Maximum number of connections kept alive per host.
+
+    Returns
+    -------
+    requests.Session
+    """
+    session = requests.Session()
+    adapter = adapters.HTTPAdapter(pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    for _cookie in cookies:
+        session.cookies.set(
+            _cookie["name"],
+            _cookie["value"],
+            domain=_cookie.get("domain", ""),
+            path=_cookie.get("path", "/")
+        )
+    return session
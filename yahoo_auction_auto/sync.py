@@ -0,0 +1,261 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+import dataclasses
+import datetime
+import json
+import os
+import re
+import sqlite3
+import time
+import types
+import typing as t
+
+from yahoo_auction_auto import info, yahoo_auction
+
+
+JST = datetime.timezone(datetime.timedelta(hours=9), "JST")
+"""Timezone of datetimes on Yahoo!Auction pages."""
+
+
+@dataclasses.dataclass()
+class ChangeSet:
+    """Changes of the items currently selling found by a sync."""
+    added: dict[str, info.InfoSelling] = dataclasses.field(default_factory=dict)
+    """Items newly listed."""
+    removed: dict[str, info.InfoSelling] = dataclasses.field(default_factory=dict)
+    """Items no longer listed, with their last snapshots."""
+    changed: dict[str, dict[str, tuple[t.Any, t.Any]]] = dataclasses.field(default_factory=dict)
+    """Changed fields of refetched items as `{aID: {field: (old, new)}}`."""
+    failed: dict[str, Exception] = dataclasses.field(default_factory=dict)
+    """Items which could not be fetched. Their snapshots are kept."""
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+def diff(old: info.InfoSelling, new: info.InfoSelling) -> dict[str, tuple[t.Any, t.Any]]:
+    """Get the fields which differ between `old` and `new`.
+
+    Returns
+    -------
+    dict[str, tuple[Any, Any]]
+        `{field: (old, new)}` of differing fields.
+    """
+    changes: dict[str, tuple[t.Any, t.Any]] = {}
+    for field in dataclasses.fields(info.InfoSelling):
+        old_value, new_value = getattr(old, field.name), getattr(new, field.name)
+        if old_value != new_value:
+            changes[field.name] = (old_value, new_value)
+    return changes
+
+
+class SnapshotStore:
+    """SQLite store of `InfoSelling` snapshots.
+
+    Parameters
+    ----------
+    path : str | os.PathLike[str]
+        The database file. ":memory:" keeps it in memory.
+    """
+
+    def __init__(self, path: str | os.PathLike[str] = ":memory:") -> None:
+        self._connection = sqlite3.connect(path)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots ("
+                "aID TEXT PRIMARY KEY, "
+                "data TEXT NOT NULL, "
+                "fetched REAL NOT NULL)"
+            )
+
+    def __enter__(self) -> "SnapshotStore":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: types.TracebackType | None
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __len__(self) -> int:
+        (count,), = self._connection.execute("SELECT COUNT(*) FROM snapshots")
+        return int(count)
+
+    def get(self, aID: str) -> tuple[info.InfoSelling, float] | None:
+        """Get the snapshot of `aID` and when it was fetched in epoch second."""
+        for data, fetched in self._connection.execute(
+            "SELECT data, fetched FROM snapshots WHERE aID = ?", (aID,)
+        ):
+            return _loads(data), float(fetched)
+        return None
+
+    def items(self) -> dict[str, tuple[info.InfoSelling, float]]:
+        """Get all snapshots and when they were fetched in epoch second."""
+        return {
+            aID: (_loads(data), float(fetched))
+            for aID, data, fetched in self._connection.execute("SELECT aID, data, fetched FROM snapshots")
+        }
+
+    def put(self, snapshots: t.Iterable[tuple[info.InfoSelling, float]]) -> None:
+        """Store snapshots with when they were fetched in epoch second."""
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO snapshots (aID, data, fetched) VALUES (?, ?, ?)",
+                ((snapshot.aID, _dumps(snapshot), fetched) for snapshot, fetched in snapshots)
+            )
+
+    def delete(self, aIDs: t.Iterable[str]) -> None:
+        """Delete snapshots of `aIDs`."""
+        with self._connection:
+            self._connection.executemany("DELETE FROM snapshots WHERE aID = ?", ((aID,) for aID in aIDs))
+
+
+class Sync:
+    """Incremental sync of the items currently selling into a `SnapshotStore`.
+
+    A run lists the auction IDs and fetches only new items and items whose
+    snapshots are stale.
+
+    Parameters
+    ----------
+    yah : yahoo_auction_auto.YahooAuction
+        The API to list and fetch items.
+    store : SnapshotStore
+        The store of snapshots.
+    max_age : float
+        Time in second after which a snapshot is stale.
+    ending_within : float
+        Time in second before the end of an auction within which
+        its snapshot is always stale.
+    clock : Callable[[], float]
+        The clock in epoch second.
+    """
+
+    def __init__(
+        self,
+        yah: yahoo_auction.YahooAuction,
+        store: SnapshotStore,
+        max_age: float = 3600,
+        ending_within: float = 3600,
+        clock: t.Callable[[], float] = time.time
+    ) -> None:
+        self.yah = yah
+        self.store = store
+        self.max_age = max_age
+        self.ending_within = ending_within
+        self._clock = clock
+
+    def is_stale(self, snapshot: info.InfoSelling, fetched: float) -> bool:
+        """Whether `snapshot` fetched at `fetched` needs to be fetched again.
+
+        The end of the auction is `end_datetime`, or `timeleft` from
+        `fetched` if `end_datetime` is unknown.
+        """
+        now = self._clock()
+        if now - fetched >= self.max_age:
+            return True
+        if (end := end_timestamp(snapshot, fetched)) is None:
+            return True
+        return end - now <= self.ending_within
+
+    def run(self) -> ChangeSet:
+        """List the items and fetch the new and stale ones.
+
+        Snapshots of the items no longer listed are deleted after the
+        fetched ones are stored.
+
+        Returns
+        -------
+        ChangeSet
+            The changes since the last run.
+
+        Raises
+        ------
+        RuntimeError
+            If the listing is empty while the store is not and the cookies
+            turn out to be expired. Nothing is deleted then.
+        """
+        changes = ChangeSet()
+        snapshots = self.store.items()
+        listed = list(dict.fromkeys(self.yah.iter_aIDs_selling()))
+        check_listing(self.yah, listed, len(snapshots))
+        removed = snapshots.keys() - set(listed)
+        changes.removed = {aID: snapshots[aID][0] for aID in removed}
+        targets = [
+            aID for aID in listed
+            if aID not in snapshots or self.is_stale(*snapshots[aID])
+        ]
+        fetched: list[tuple[info.InfoSelling, float]] = []
+        for aID, result in self.yah.get_info_selling_many(targets):
+            if isinstance(result, Exception):
+                changes.failed[aID] = result
+                continue
+            fetched.append((result, self._clock()))
+            if aID not in snapshots:
+                changes.added[aID] = result
+            elif fields := diff(snapshots[aID][0], result):
+                changes.changed[aID] = fields
+        self.store.put(fetched)
+        self.store.delete(removed)
+        return changes
+
+
+def check_listing(yah: yahoo_auction.YahooAuction, listed: t.Collection[str], known: int) -> None:
+    """Check that an empty listing is not caused by expired cookies.
+
+    A listing of an account which was logged out is empty, as is the
+    listing of an account which sold everything. The login is checked
+    only when `listed` is empty while `known` items were listed before.
+
+    Raises
+    ------
+    RuntimeError
+        If `listed` is empty, `known` is not 0 and `yah` is not logged in.
+    """
+    if not listed and known and not yah.check_login():
+        raise RuntimeError(f"The listing is empty while {known} items are known; the login expired")
+
+
+_TIMELEFT_UNITS = {"日": 86400, "時間": 3600, "分": 60, "秒": 1}
+_TIMELEFT_PATTERN = re.compile(r"(\d+)\s*(日|時間|分|秒)")
+
+
+def _timeleft_seconds(timeleft: str) -> float | None:
+    """Get seconds from `timeleft` such as "19時間" or "1日 3時間"."""
+    matches = _TIMELEFT_PATTERN.findall(timeleft)
+    if not matches:
+        return None
+    return float(sum(int(value) * _TIMELEFT_UNITS[unit] for value, unit in matches))
+
+
+def end_timestamp(snapshot: info.InfoSelling, fetched: float) -> float | None:
+    """Get the end of the auction of `snapshot` in epoch second.
+
+    It is `end_datetime` in JST, or `timeleft` from `fetched` if
+    `end_datetime` is unknown. None if neither is known.
+    """
+    if snapshot.end_datetime > datetime.datetime(1970, 1, 1):
+        return snapshot.end_datetime.replace(tzinfo=JST).timestamp()
+    if (seconds := _timeleft_seconds(snapshot.timeleft)) is not None:
+        return fetched + seconds
+    return None
+
+
+def _dumps(snapshot: info.InfoSelling) -> str:
+    data = dataclasses.asdict(snapshot)
+    for key, value in data.items():
+        if isinstance(value, datetime.datetime):
+            data[key] = value.isoformat()
+    return json.dumps(data, ensure_ascii=False)
+
+
+def _loads(data: str) -> info.InfoSelling:
+    values = json.loads(data)
+    for field in dataclasses.fields(info.InfoSelling):
+        if field.type in (datetime.datetime, "datetime.datetime"):
+            values[field.name] = datetime.datetime.fromisoformat(values[field.name])
+    return info.InfoSelling(**values)
@@ -1,6 +1,7 @@
 # Copyright (c) 2022 Shuhei Nitta. All rights reserved.
 
 HOME = "https://yahoo.co.jp"
+LOGIN = "https://login.yahoo.co.jp/"
 MYPAGE = "https://auctions.yahoo.co.jp/user/jp/show/mystatus"
 SELLING = "https://auctions.yahoo.co.jp/openuser/jp/show/mystatus?select=selling"
 CLOSED_WITH_WINNER = "https://auctions.yahoo.co.jp/closeduser/jp/show/mystatus?select=closed&hasWinner=1"
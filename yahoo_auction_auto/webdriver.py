@@ -1,20 +1,60 @@
 # Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+"""Chrome driver.
+
+Selenium and chromedriver are imported on first use of this module's
+attributes, so that importing the package stays fast for HTTP-only use.
+"""
 import contextlib
+import importlib
+import types
 import typing as t
 
-from selenium import webdriver
-import chromedriver_binary  # noqa
+from yahoo_auction_auto import urls
 
+if t.TYPE_CHECKING:
+    from selenium.webdriver import Chrome as Chrome, ChromeOptions as ChromeOptions
+    from selenium.webdriver.common.by import By as By  # noqa: F401
 
-ChromeOptions = webdriver.ChromeOptions
 
+_LAZY_ATTRIBUTES = {
+    "Chrome": "selenium.webdriver",
+    "ChromeOptions": "selenium.webdriver",
+    "By": "selenium.webdriver.common.by",
+}
 
-@contextlib.contextmanager
-def chrome(options: webdriver.ChromeOptions) -> t.Iterator[webdriver.Chrome]:
+
+def __getattr__(name: str) -> t.Any:
+    if (module := _LAZY_ATTRIBUTES.get(name)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(_import(module), name)
+    globals()[name] = value
+    return value
+
+
+def _import(name: str) -> types.ModuleType:
+    importlib.import_module("chromedriver_binary")
+    return importlib.import_module(name)
+
+
+def start_chrome(options: "ChromeOptions") -> "Chrome":
+    """Start Chrome. The caller is responsible to quit it."""
     options.add_experimental_option("excludeSwitches", ["enable-logging", "enable-automation"])
-    driver = webdriver.Chrome(options=options)
+    driver: Chrome = _import("selenium.webdriver").Chrome(options=options)
     driver.implicitly_wait(10)
+    return driver
+
+
+@contextlib.contextmanager
+def chrome(options: "ChromeOptions") -> t.Iterator["Chrome"]:
+    driver = start_chrome(options)
     try:
         yield driver
     finally:
         driver.quit()
+
+
+def login(driver: "Chrome", cookies: t.Iterable[dict[str, t.Any]]) -> None:
+    """Log in Yahoo!Auction with `cookies`."""
+    driver.get(urls.HOME)
+    for cookie in cookies:
+        driver.add_cookie(cookie)
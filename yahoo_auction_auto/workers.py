@@ -0,0 +1,163 @@
+# Copyright (c) 2022 Shuhei Nitta. All rights reserved.
+import collections
+import concurrent.futures
+import typing as t
+
+
+T = t.TypeVar("T")
+R = t.TypeVar("R")
+B = t.TypeVar("B")
+
+
+def bounded_map(
+    func: t.Callable[[T], R],
+    items: t.Iterable[T],
+    max_workers: int,
+    ordered: bool = False
+) -> t.Generator[tuple[T, R | Exception], None, None]:
+    """Apply `func` to `items` concurrently with a bounded worker pool.
+
+    At most `max_workers` items are in flight at a time, so `items` is
+    consumed lazily and may be an unbounded iterator.
+
+    Parameters
+    ----------
+    func : Callable[[T], R]
+        The function to apply.
+    items : Iterable[T]
+        The items to apply `func` to.
+    max_workers : int
+        The maximum number of concurrent calls.
+    ordered : bool
+        Yield results in input order if true, else as each finishes.
+
+    Yields
+    ------
+    item : T
+        The item.
+    result : R | Exception
+        The result of `func(item)`, or the exception raised by it.
+    """
+    if max_workers < 1:
+        raise ValueError(f"max_workers must be positive: {max_workers}")
+    iterator = iter(items)
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        pending: collections.deque[tuple[T, concurrent.futures.Future[R]]] = collections.deque()
+
+        def submit() -> bool:
+            for item in iterator:
+                pending.append((item, executor.submit(func, item)))
+                return True
+            return False
+
+        try:
+            while len(pending) < max_workers and submit():
+                pass
+            while pending:
+                if ordered:
+                    item, future = pending.popleft()
+                    concurrent.futures.wait([future])
+                else:
+                    concurrent.futures.wait(
+                        [future for _, future in pending],
+                        return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    index = next(i for i, (_, future) in enumerate(pending) if future.done())
+                    item, future = pending[index]
+                    del pending[index]
+                submit()
+                result: R | Exception
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = e
+                yield item, result
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+def pipeline(
+    fetch: t.Callable[[T], B],
+    parse: t.Callable[[B], R],
+    items: t.Iterable[T],
+    max_workers: int,
+    executor: concurrent.futures.Executor,
+    max_pending: int | None = None,
+    ordered: bool = False
+) -> t.Generator[tuple[T, R | Exception], None, None]:
+    """Fetch `items` in threads and parse the results in `executor`.
+
+    With a `ProcessPoolExecutor`, parsing runs on other cores while the
+    threads wait for the network, and only the fetched value and the parsed
+    result cross the process boundary, so `parse` and its results must be
+    picklable. When `max_pending` results are being parsed, no more items
+    are fetched until one is done.
+
+    Parameters
+    ----------
+    fetch : Callable[[T], B]
+        The function to fetch an item, such as downloading its page.
+    parse : Callable[[B], R]
+        The function to parse a fetched value.
+    items : Iterable[T]
+        The items to fetch.
+    max_workers : int
+        The maximum number of concurrent fetches.
+    executor : concurrent.futures.Executor
+        The executor to parse in.
+    max_pending : int | None
+        The maximum number of values being parsed. `max_workers` is used if None.
+    ordered : bool
+        Yield results in input order if true, else as each finishes.
+
+    Yields
+    ------
+    item : T
+        The item.
+    result : R | Exception
+        The result of `parse(fetch(item))`, or the exception raised by either.
+    """
+    max_pending = max_pending or max_workers
+    if max_pending < 1:
+        raise ValueError(f"max_pending must be positive: {max_pending}")
+    pending: collections.deque[tuple[T, concurrent.futures.Future[R]]] = collections.deque()
+
+    def finished(block: bool) -> t.Iterator[tuple[T, R | Exception]]:
+        if block:
+            futures = [pending[0][1]] if ordered else [future for _, future in pending]
+            concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+        while pending:
+            if ordered:
+                index = 0 if pending[0][1].done() else -1
+            else:
+                index = next((i for i, (_, future) in enumerate(pending) if future.done()), -1)
+            if index < 0:
+                return
+            item, future = pending[index]
+            del pending[index]
+            result: R | Exception
+            try:
+                result = future.result()
+            except Exception as e:
+                result = e
+            yield item, result
+
+    fetched = bounded_map(fetch, items, max_workers, ordered)
+    try:
+        for item, value in fetched:
+            if isinstance(value, Exception):
+                future: concurrent.futures.Future[R] = concurrent.futures.Future()
+                future.set_exception(value)
+            else:
+                future = executor.submit(parse, value)
+            pending.append((item, future))
+            yield from finished(block=False)
+            while len(pending) >= max_pending:
+                yield from finished(block=True)
+        while pending:
+            yield from finished(block=True)
+    finally:
+        fetched.close()
+        for _, future in pending:
+            future.cancel()
@@ -1,14 +1,53 @@
 # Copyright (c) 2022 Shuhei Nitta. All rights reserved.
 import re
 import time
+import datetime
+import logging
+import contextlib
+import concurrent.futures
+import types
+import threading
 import dataclasses
+import functools
 import typing as t
 
-from selenium.webdriver.common import by
 import requests
 import bs4
+from lxml import etree, html
+from urllib import parse
 
-from yahoo_auction_auto import urls, info, webdriver, cookie
+from yahoo_auction_auto import (
+    urls, info, webdriver, cookie, workers, session, parsing, cache, httpcache, driverpool, instrument,
+    ratelimit, retry
+)
+
+
+logger = logging.getLogger(__name__)
+
+T = t.TypeVar("T")
+Info = t.TypeVar("Info", info.InfoSelling, info.InfoClosedWithWinner, info.InfoClosedWithoutWinner)
+
+
+@dataclasses.dataclass(frozen=True)
+class Snapshot:
+    """Auction IDs of an account by listing category at a time.
+
+    An auction ID is in one category only. An item which closed during the
+    crawl is in its closed category.
+    """
+    timestamp: datetime.datetime
+    """When the crawl started, in UTC."""
+    selling: list[str]
+    """Auction IDs of items currently selling."""
+    closed_with_winner: list[str]
+    """Auction IDs of items closed with winner."""
+    closed_without_winner: list[str]
+    """Auction IDs of items closed with no winner."""
+
+    @property
+    def aIDs(self) -> list[str]:
+        """Auction IDs of all categories."""
+        return self.selling + self.closed_with_winner + self.closed_without_winner
 
 
 @dataclasses.dataclass()
@@ -20,6 +59,59 @@ class YahooAuction:
     """Time to wait for a response in second."""
     chrome_args: t.Iterable[str] = dataclasses.field(default_factory=list)
     """Arguments for Chrome."""
+    max_workers: int = 8
+    """Maximum number of concurrent requests for bulk methods."""
+    pool_maxsize: int = 10
+    """Maximum number of connections kept alive per host."""
+    parser: parsing.Parser = "lxml"
+    """Backend to parse pages. "bs4" is slower but kept for fallback."""
+    listing_ttl: float | None = None
+    """Time to cache the URLs of listings in second. Not cached if None."""
+    login_ttl: float = 60
+    """Time to cache the result of `is_login` in second."""
+    http_cache: httpcache.HTTPCache | None = None
+    """Cache of item pages. Not cached if None."""
+    cancel_backend: t.Literal["http", "browser"] = "http"
+    """How to cancel sales. "http" posts the cancel form and falls back to "browser" if it did not take effect."""
+    driver_pool_size: int = 2
+    """The number of Chrome drivers for bulk browser operations."""
+    driver_max_uses: int = 20
+    """The number of uses after which a pooled Chrome driver is replaced."""
+    instrumentation: instrument.Instrumentation = dataclasses.field(
+        default_factory=instrument.Instrumentation, repr=False, compare=False
+    )
+    """Reporter of HTTP, parse and browser spans."""
+    rate_limiter: ratelimit.RateLimiter | None = None
+    """Limiter of all requests, which can be shared by instances. Not limited if None."""
+    retry_policy: retry.RetryPolicy | None = None
+    """Retries and hedging of item and listing pages. Not retried if None."""
+    stream_items: bool = False
+    """Whether `get_info_selling` parses an item page while downloading it and closes the connection
+    once all fields are read. Used with the "lxml" parser without `http_cache` and `parse_executor`."""
+    stream_chunk_size: int = 8192
+    """The size of chunks of item pages to parse in `stream_items` mode."""
+    parse_executor: concurrent.futures.Executor | None = dataclasses.field(default=None, repr=False, compare=False)
+    """Executor to parse item pages in bulk methods, such as `ProcessPoolExecutor`.
+    Parsed in the threads fetching them if None."""
+    _session: requests.Session | None = dataclasses.field(default=None, init=False, repr=False, compare=False)
+    _lock: threading.Lock = dataclasses.field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+    _listing_cache: cache.TTLCache[str, list[str]] = dataclasses.field(
+        default_factory=cache.TTLCache, init=False, repr=False, compare=False
+    )
+    _login_cache: cache.TTLCache[str, bool] = dataclasses.field(
+        default_factory=cache.TTLCache, init=False, repr=False, compare=False
+    )
+
+    def __enter__(self) -> "YahooAuction":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: types.TracebackType | None
+    ) -> None:
+        self.close()
 
     @property
     def cookies_for_requests(self) -> dict[str, str]:
@@ -27,7 +119,73 @@ class YahooAuction:
         return {cookie["name"]: cookie["value"] for cookie in self.cookies}
 
     @property
-    def chrome_options(self) -> webdriver.ChromeOptions:
+    def session(self) -> requests.Session:
+        """Keep-alive session shared by all requests of this instance.
+
+        It is created on first access with `cookies` installed, and can be
+        shared across threads.
+        """
+        with self._lock:
+            if self._session is None:
+                self._session = session.create_session(self.cookies, self.pool_maxsize)
+            return self._session
+
+    def close(self) -> None:
+        """Close the session and its pooled connections, and the threads of `retry_policy`."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+        if self.retry_policy is not None:
+            self.retry_policy.close()
+
+    def warmup(self, connections: int | None = None) -> None:
+        """Open connections to Yahoo!Auction in advance.
+
+        Parameters
+        ----------
+        connections : int | None
+            The number of connections to open per host.
+            `YahooAuction.pool_maxsize` is used if None.
+        """
+        connections = min(connections or self.pool_maxsize, self.pool_maxsize)
+        targets = [url for url in (urls.MYPAGE, urls.get_auction_url("")) for _ in range(connections)]
+        for _ in workers.bounded_map(self._head, targets, len(targets)):
+            pass
+
+    def _head(self, url: str) -> requests.Response:
+        return self._request("http.head", "HEAD", url)
+
+    def _get(self, operation: str, url: str, **kwargs: t.Any) -> requests.Response:
+        """Send an idempotent GET request with `retry_policy`."""
+        if self.retry_policy is None:
+            return self._request(operation, "GET", url, **kwargs)
+        return self.retry_policy.send(
+            operation, lambda: self._request(operation, "GET", url, **kwargs), self.rate_limiter
+        )
+
+    def _request(self, operation: str, method: str, url: str, **kwargs: t.Any) -> requests.Response:
+        """Send a request in a span of `operation` under `rate_limiter`.
+
+        Every request of this instance goes through here.
+        """
+        with contextlib.ExitStack() as stack:
+            permit = None if self.rate_limiter is None else stack.enter_context(self.rate_limiter.acquire())
+            if self.retry_policy is not None:
+                self.retry_policy.started()
+            attributes = stack.enter_context(self.instrumentation.span(operation, method=method, url=url))
+            response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            attributes["status"] = response.status_code
+            attributes["redirects"] = len(response.history)
+            if not kwargs.get("stream"):
+                attributes["bytes"] = len(response.content)
+            if permit is not None:
+                permit.status = response.status_code
+                permit.retry_after = _retry_after(response)
+            return response
+
+    @property
+    def chrome_options(self) -> "webdriver.ChromeOptions":
         options = webdriver.ChromeOptions()
         for arg in self.chrome_args:
             options.add_argument(arg)
@@ -35,54 +193,194 @@ class YahooAuction:
 
     @property
     def is_login(self) -> bool:
-        """Whether its cookies is valid to log in."""
-        url = urls.MYPAGE
+        """Whether its cookies is valid to log in.
+
+        Only the status of MYPAGE is read, without following a redirect to
+        the login page or downloading the body. The result is cached for
+        `login_ttl` seconds.
+        """
+        return self._login_cache.get_or_set(urls.MYPAGE, self._check_login, self.login_ttl)
+
+    def check_login(self) -> bool:
+        """Whether its cookies is valid to log in, checked again regardless of the cached `is_login`.
+
+        The result is cached for `is_login`.
+        """
+        self._login_cache.invalidate(urls.MYPAGE)
+        return self.is_login
+
+    def _check_login(self) -> bool:
         try:
-            response = requests.get(
-                url,
-                cookies=self.cookies_for_requests,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
+            with self._request("http.login", "GET", urls.MYPAGE, allow_redirects=False, stream=True) as response:
+                response.raise_for_status()
+                return not response.is_redirect
         except Exception:
             return False
-        return bool(response.url == url)
 
     @property
     def urls_selling(self) -> list[str]:
         """URLs of items currently selling on Yahoo!Auction."""
-        pattern = r"^rsec:itm;slk:tc;"
-        return _get_urls(self.cookies_for_requests, urls.SELLING, pattern)
+        return self._get_listing("selling", self.iter_urls_selling)
 
     @property
     def aIDs_selling(self) -> list[str]:
         """Auction IDs of items currently selling on Yahoo!Auction."""
-        pattern = re.compile(r'(?<=/)\w+$')
-        return [match[0] for match in map(pattern.search, self.urls_selling) if match]
+        return list(_to_aIDs(self.urls_selling))
 
     @property
     def urls_closed_with_winner(self) -> list[str]:
         """URLs of items closed with winner on Yahoo!Auction."""
-        pattern = r"^rsec:itm;slk:ttlc;"
-        return _get_urls(self.cookies_for_requests, urls.CLOSED_WITH_WINNER, pattern)
+        return self._get_listing("closed_with_winner", self.iter_urls_closed_with_winner)
 
     @property
     def aIDs_closed_with_winner(self) -> list[str]:
         """Auction IDs of items closed with winner on Yahoo!Auction."""
-        pattern = re.compile(r'(?<=/)\w+$')
-        return [match[0] for match in map(pattern.search, self.urls_closed_with_winner) if match]
+        return list(_to_aIDs(self.urls_closed_with_winner))
 
     @property
     def urls_closed_without_winner(self) -> list[str]:
         """URLs of items closed with no winner on Yahoo!Auction."""
-        pattern = r'^rsec:itm;slk:ttlc;'
-        return _get_urls(self.cookies_for_requests, urls.CLOSED_WITHOUT_WINNER, pattern)
+        return self._get_listing("closed_without_winner", self.iter_urls_closed_without_winner)
 
     @property
     def aIDs_closed_without_winner(self) -> list[str]:
         """Auction IDs of items closed with no winner on Yahoo!Auction."""
-        pattern = re.compile(r'(?<=/)\w+$')
-        return [match[0] for match in map(pattern.search, self.urls_closed_without_winner) if match]
+        return list(_to_aIDs(self.urls_closed_without_winner))
+
+    @property
+    def listing_cache_stats(self) -> cache.CacheStats:
+        """Statistics of the cache of listings."""
+        return self._listing_cache.stats
+
+    def refresh(self) -> None:
+        """Drop the cached listings so that the next access crawls them again."""
+        self._listing_cache.invalidate()
+
+    def _get_listing(self, name: str, iter_urls: t.Callable[[], t.Iterator[str]]) -> list[str]:
+        if self.listing_ttl is None:
+            return list(iter_urls())
+        return list(self._listing_cache.get_or_set(name, lambda: list(iter_urls()), self.listing_ttl))
+
+    def snapshot(self) -> Snapshot:
+        """Crawl the listings of all categories concurrently over the session.
+
+        The listings are always crawled, even if `listing_ttl` is set, so
+        that all categories are of the same time.
+
+        Returns
+        -------
+        Snapshot
+            The auction IDs by category.
+        """
+        timestamp = datetime.datetime.now(datetime.timezone.utc)
+        iterators = {
+            "closed_with_winner": self.iter_aIDs_closed_with_winner,
+            "closed_without_winner": self.iter_aIDs_closed_without_winner,
+            "selling": self.iter_aIDs_selling,
+        }
+        with self.instrumentation.span("snapshot"):
+            with concurrent.futures.ThreadPoolExecutor(len(iterators)) as executor:
+                futures = {name: executor.submit(list, iterate()) for name, iterate in iterators.items()}
+            seen: set[str] = set()
+            listings: dict[str, list[str]] = {}
+            # Closed categories go first so that an item closed during the crawl is not taken as selling.
+            for name, future in futures.items():
+                listings[name] = [aID for aID in dict.fromkeys(future.result()) if aID not in seen]
+                seen.update(listings[name])
+        return Snapshot(timestamp, **listings)
+
+    def iter_urls_selling(self) -> t.Iterator[str]:
+        """Iterate URLs of items currently selling page by page."""
+        return self._iter_urls(urls.SELLING, _SELLING_PATTERN)
+
+    def iter_aIDs_selling(self) -> t.Iterator[str]:
+        """Iterate auction IDs of items currently selling page by page."""
+        return _to_aIDs(self.iter_urls_selling())
+
+    def iter_urls_closed_with_winner(self) -> t.Iterator[str]:
+        """Iterate URLs of items closed with winner page by page."""
+        return self._iter_urls(urls.CLOSED_WITH_WINNER, _CLOSED_PATTERN)
+
+    def iter_aIDs_closed_with_winner(self) -> t.Iterator[str]:
+        """Iterate auction IDs of items closed with winner page by page."""
+        return _to_aIDs(self.iter_urls_closed_with_winner())
+
+    def iter_urls_closed_without_winner(self) -> t.Iterator[str]:
+        """Iterate URLs of items closed with no winner page by page."""
+        return self._iter_urls(urls.CLOSED_WITHOUT_WINNER, _CLOSED_PATTERN)
+
+    def iter_aIDs_closed_without_winner(self) -> t.Iterator[str]:
+        """Iterate auction IDs of items closed with no winner page by page."""
+        return _to_aIDs(self.iter_urls_closed_without_winner())
+
+    def iter_summaries_selling(self) -> t.Iterator[info.InfoSummary]:
+        """Iterate summaries of items currently selling from the rows of the listing page by page."""
+        return self._iter_summaries(urls.SELLING, _SELLING_PATTERN)
+
+    def iter_summaries_closed_with_winner(self) -> t.Iterator[info.InfoSummary]:
+        """Iterate summaries of items closed with winner from the rows of the listing page by page."""
+        return self._iter_summaries(urls.CLOSED_WITH_WINNER, _CLOSED_PATTERN)
+
+    def iter_summaries_closed_without_winner(self) -> t.Iterator[info.InfoSummary]:
+        """Iterate summaries of items closed with no winner from the rows of the listing page by page."""
+        return self._iter_summaries(urls.CLOSED_WITHOUT_WINNER, _CLOSED_PATTERN)
+
+    def _iter_urls(self, src_url: str, pattern: str | t.Pattern[str]) -> t.Iterator[str]:
+        """Iterate product urls from `src_url` and its following pages.
+
+        Parameters
+        ----------
+        src_url : str
+            URL of the first listing page.
+        pattern : str | Pattern[str]
+            The regular expression of `data-ylk` of product links.
+
+        Yields
+        ------
+        str
+            URL of a product.
+        """
+        return self._iter_listing(src_url, lambda content: _parse_listing(content, pattern, self.parser))
+
+    def _iter_summaries(self, src_url: str, pattern: str | t.Pattern[str]) -> t.Iterator[info.InfoSummary]:
+        """Iterate summaries of the rows of product links from `src_url` and its following pages."""
+        return self._iter_listing(src_url, lambda content: _parse_summaries(content, pattern, self.parser))
+
+    def _iter_listing(
+        self,
+        src_url: str,
+        parse: t.Callable[[bytes], tuple[list[T], str | None]]
+    ) -> t.Iterator[T]:
+        """Iterate records parsed by `parse` from `src_url` and its following pages.
+
+        Records are yielded as each page is parsed, and the next page is
+        fetched while the records of the current page are consumed.
+        The iteration stops if the next page links back to a page already fetched.
+        """
+        seen = {src_url}
+        with concurrent.futures.ThreadPoolExecutor(1) as executor:
+            future: concurrent.futures.Future[bytes] | None = executor.submit(self._get_listing_page, src_url)
+            try:
+                while future is not None:
+                    content = future.result()
+                    with self.instrumentation.span("parse.listing", parser=self.parser, bytes=len(content)):
+                        records, next_page = parse(content)
+                    if next_page in seen:
+                        logger.warning("The next page of %s loops back to %s", src_url, next_page)
+                        next_page = None
+                    future = None
+                    if next_page:
+                        seen.add(next_page)
+                        future = executor.submit(self._get_listing_page, next_page)
+                    yield from records
+            finally:
+                if future is not None:
+                    future.cancel()
+
+    def _get_listing_page(self, url: str) -> bytes:
+        response = self._get("http.listing", url)
+        response.raise_for_status()
+        return response.content
 
     def submit(self) -> None:
         """Submit an item on Yahoo!Auction.
@@ -91,24 +389,144 @@ class YahooAuction:
         """
         raise NotImplementedError()
 
-    def cancel(self, aID: str) -> None:
+    def cancel(self, aID: str, driver_pool: driverpool.DriverPool | None = None) -> None:
         """Cancel a sale of an item.
 
+        The cached listings are dropped since the cancellation changes them.
+        Over HTTP, Chrome is used instead only if the item is known not to be
+        cancelled, so that an item is never cancelled twice.
+
         Parameters
         ----------
         aID : str
             The auction ID of the item to cancel.
+        driver_pool : yahoo_auction_auto.driverpool.DriverPool | None
+            The pool to borrow a driver from if Chrome is used.
+            A new Chrome is started if None.
         """
-        with webdriver.chrome(self.chrome_options) as driver:
-            driver.get(urls.HOME)
-            url = driver.current_url
-            for _cookie in self.cookies:
-                driver.add_cookie(_cookie)
-            driver.get(urls.get_cancel_url(aID))
-            cancel_element = driver.find_element(by.By.NAME, "confirm")
-            cancel_element.click()
-            while url == driver.current_url:
-                time.sleep(0.5)
+        try:
+            with self.instrumentation.span("cancel", aID=aID) as attributes:
+                if self.cancel_backend == "http":
+                    try:
+                        self._cancel_http(aID)
+                        attributes["backend"] = "http"
+                        return
+                    except _CancelNotDone:
+                        logger.warning("Failed to cancel %s over HTTP, falling back to Chrome", aID, exc_info=True)
+                attributes["backend"] = "browser"
+                if driver_pool is None:
+                    with contextlib.ExitStack() as stack:
+                        with self.instrumentation.span("browser.start"):
+                            driver = stack.enter_context(webdriver.chrome(self.chrome_options))
+                        with self.instrumentation.span("browser.login", url=urls.HOME):
+                            webdriver.login(driver, self.cookies)
+                        self._cancel(driver, aID)
+                else:
+                    with driver_pool.acquire() as driver:
+                        self._cancel(driver, aID)
+        finally:
+            self.refresh()
+
+    def cancel_many(
+        self,
+        aIDs: t.Iterable[str],
+        driver_pool: driverpool.DriverPool | None = None
+    ) -> dict[str, Exception | None]:
+        """Cancel sales of items concurrently on a pool of drivers.
+
+        A failure on an item does not abort the others.
+
+        Parameters
+        ----------
+        aIDs : Iterable[str]
+            The auction IDs of the items to cancel.
+        driver_pool : yahoo_auction_auto.driverpool.DriverPool | None
+            The pool to borrow drivers from if Chrome is used. A pool of
+            `driver_pool_size` drivers is created and closed in this call if None.
+
+        Returns
+        -------
+        dict[str, Exception | None]
+            None for each cancelled item, or the exception raised while cancelling it.
+        """
+        with contextlib.ExitStack() as stack:
+            if driver_pool is None:
+                driver_pool = stack.enter_context(self.create_driver_pool())
+            pool = driver_pool
+            max_workers = self.max_workers if self.cancel_backend == "http" else pool.size
+            results = dict(workers.bounded_map(lambda aID: self.cancel(aID, pool), aIDs, max_workers))
+        return results
+
+    def create_driver_pool(self) -> driverpool.DriverPool:
+        """Create a pool of drivers logged in with `cookies`."""
+        return driverpool.DriverPool(
+            self.cookies,
+            self.chrome_args,
+            self.driver_pool_size,
+            self.driver_max_uses,
+            self.instrumentation
+        )
+
+    def _cancel_http(self, aID: str) -> None:
+        """Cancel a sale of an item by posting the cancel form without a browser.
+
+        If posting the form fails, the cancel page is fetched again, since
+        the item may be cancelled even if the response was lost.
+
+        Raises
+        ------
+        _CancelNotDone
+            If the cancel form is not found, or the cancellation is not
+            confirmed and the cancel form is still offered, so the item can
+            be cancelled in another way.
+        RuntimeError
+            If the cancellation is not confirmed and the cancel form is gone,
+            so whether the item was cancelled is unknown.
+        """
+        try:
+            response = self._request("http.cancel", "GET", urls.get_cancel_url(aID))
+            response.raise_for_status()
+            form = _get_cancel_form(parsing.fromstring(response.content))
+        except Exception as e:
+            raise _CancelNotDone(f"Failed to get the cancel form of {aID}") from e
+        if form is None:
+            raise _CancelNotDone(f"Cancel form of {aID} is not found")
+        data = list(form.form_values())
+        data.append(("confirm", form.xpath(".//*[@name='confirm']")[0].get("value", "")))
+        action = parse.urljoin(response.url, form.get("action") or response.url)
+        try:
+            if (form.get("method") or "get").lower() == "post":
+                response = self._request("http.cancel", "POST", action, data=data)
+            else:
+                response = self._request("http.cancel", "GET", action, params=data)
+            response.raise_for_status()
+            if response.url.startswith(urls.LOGIN):
+                raise RuntimeError(f"Cancellation of {aID} was redirected to the login page")
+            tree = parsing.fromstring(response.content)
+            if _get_cancel_form(tree) is not None or _CANCEL_COMPLETED not in tree.text_content():
+                raise RuntimeError(f"Cancellation of {aID} is not confirmed")
+        except Exception as e:
+            if self._has_cancel_form(aID):
+                raise _CancelNotDone(f"Cancellation of {aID} did not take effect") from e
+            raise RuntimeError(f"Cancellation of {aID} is not confirmed, and it may have taken effect") from e
+
+    def _has_cancel_form(self, aID: str) -> bool:
+        """Whether the cancel page of `aID` still offers the cancel form."""
+        response = self._request("http.cancel", "GET", urls.get_cancel_url(aID))
+        response.raise_for_status()
+        return _get_cancel_form(parsing.fromstring(response.content)) is not None
+
+    def _cancel(self, driver: "webdriver.Chrome", aID: str) -> None:
+        with self.instrumentation.span("browser.navigate", url=urls.get_cancel_url(aID)) as attributes:
+            driver.get(attributes["url"])
+        url = driver.current_url
+        cancel_element = driver.find_element(webdriver.By.NAME, "confirm")
+        cancel_element.click()
+        deadline = time.monotonic() + self.timeout
+        while url == driver.current_url:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Cancellation of {aID} did not complete in {self.timeout} seconds")
+            time.sleep(0.5)
 
     def resubmit(self, aID: str) -> None:
         """Resubmit an item.
@@ -135,16 +553,42 @@ class YahooAuction:
         yahoo_auction_aucto.info.InfoSelling
             The information of the product.
         """
-        url = urls.get_auction_url(aID)
-        response = requests.get(
-            url,
-            cookies=self.cookies_for_requests,
-            timeout=self.timeout
-        )
-        soup = bs4.BeautifulSoup(response.content, "lxml")
-        return info.InfoSelling.fromsoup(soup)
+        if self.stream_items and self.parser == "lxml" and self.http_cache is None:
+            with self.instrumentation.span("get_info_selling", aID=aID, stream=True) as attributes:
+                return self._stream_item_page(urls.get_auction_url(aID), info.InfoSelling.fromchunks, attributes)
+        return self._get_info("get_info_selling", aID, info.InfoSelling.fromhtml)
+
+    def get_info_selling_many(
+        self,
+        aIDs: t.Iterable[str],
+        max_workers: int | None = None,
+        ordered: bool = False
+    ) -> t.Iterator[tuple[str, info.InfoSelling | Exception]]:
+        """Get information of items currently selling concurrently.
+
+        A failure on an item is yielded as its exception
+        and does not abort the others.
+
+        Parameters
+        ----------
+        aIDs : Iterable[str]
+            The auction IDs of items.
+        max_workers : int | None
+            Maximum number of concurrent requests.
+            `YahooAuction.max_workers` is used if None.
+        ordered : bool
+            Yield results in the order of `aIDs` if true, else as each finishes.
+
+        Yields
+        ------
+        aID : str
+            The auction ID of an item.
+        info : yahoo_auction_auto.info.InfoSelling | Exception
+            The information of the item, or the exception raised while getting it.
+        """
+        yield from self._get_info_many(self.get_info_selling, info.InfoSelling.fromhtml, aIDs, max_workers, ordered)
 
-    def get_info_closed_with_winner(self) -> info.InfoClosedWithWinner:
+    def get_info_closed_with_winner(self, aID: str) -> info.InfoClosedWithWinner:
         """Get information of an item closed with a winner.
 
         Parameters
@@ -156,12 +600,47 @@ class YahooAuction:
         -------
         yahoo_auction_aucto.info.InfoClosedWithWinner
             The information of the product.
+        """
+        return self._get_info("get_info_closed_with_winner", aID, info.InfoClosedWithWinner.fromhtml)
 
-        Not Impremented yet.
+    def get_info_closed_with_winner_many(
+        self,
+        aIDs: t.Iterable[str] | None = None,
+        max_workers: int | None = None,
+        ordered: bool = False
+    ) -> t.Iterator[tuple[str, info.InfoClosedWithWinner | Exception]]:
+        """Get information of items closed with a winner concurrently.
+
+        A failure on an item is yielded as its exception
+        and does not abort the others.
+
+        Parameters
+        ----------
+        aIDs : Iterable[str] | None
+            The auction IDs of items. All items closed with a winner are
+            crawled page by page while they are fetched if None.
+        max_workers : int | None
+            Maximum number of concurrent requests.
+            `YahooAuction.max_workers` is used if None.
+        ordered : bool
+            Yield results in the order of `aIDs` if true, else as each finishes.
+
+        Yields
+        ------
+        aID : str
+            The auction ID of an item.
+        info : yahoo_auction_auto.info.InfoClosedWithWinner | Exception
+            The information of the item, or the exception raised while getting it.
         """
-        raise NotImplementedError()
+        yield from self._get_info_many(
+            self.get_info_closed_with_winner,
+            info.InfoClosedWithWinner.fromhtml,
+            self.iter_aIDs_closed_with_winner() if aIDs is None else aIDs,
+            max_workers,
+            ordered
+        )
 
-    def get_info_closed_without_winner(self) -> info.InfoClosedWithoutWinner:
+    def get_info_closed_without_winner(self, aID: str) -> info.InfoClosedWithoutWinner:
         """Get information of an item closed without a winner.
 
         Parameters
@@ -173,30 +652,187 @@ class YahooAuction:
         -------
         yahoo_auction_aucto.info.InfoClosedWithoutWinner
             The information of the product.
+        """
+        return self._get_info("get_info_closed_without_winner", aID, info.InfoClosedWithoutWinner.fromhtml)
 
-        Not Impremented yet.
+    def get_info_closed_without_winner_many(
+        self,
+        aIDs: t.Iterable[str] | None = None,
+        max_workers: int | None = None,
+        ordered: bool = False
+    ) -> t.Iterator[tuple[str, info.InfoClosedWithoutWinner | Exception]]:
+        """Get information of items closed without a winner concurrently.
+
+        A failure on an item is yielded as its exception
+        and does not abort the others.
+
+        Parameters
+        ----------
+        aIDs : Iterable[str] | None
+            The auction IDs of items. All items closed without a winner are
+            crawled page by page while they are fetched if None.
+        max_workers : int | None
+            Maximum number of concurrent requests.
+            `YahooAuction.max_workers` is used if None.
+        ordered : bool
+            Yield results in the order of `aIDs` if true, else as each finishes.
+
+        Yields
+        ------
+        aID : str
+            The auction ID of an item.
+        info : yahoo_auction_auto.info.InfoClosedWithoutWinner | Exception
+            The information of the item, or the exception raised while getting it.
         """
-        raise NotImplementedError()
+        yield from self._get_info_many(
+            self.get_info_closed_without_winner,
+            info.InfoClosedWithoutWinner.fromhtml,
+            self.iter_aIDs_closed_without_winner() if aIDs is None else aIDs,
+            max_workers,
+            ordered
+        )
+
+    def _get_info(
+        self,
+        operation: str,
+        aID: str,
+        fromhtml: t.Callable[[bytes, parsing.Parser, instrument.Instrumentation], Info]
+    ) -> Info:
+        """Fetch the item page of `aID` and parse it by `fromhtml` in a span of `operation`."""
+        with self.instrumentation.span(operation, aID=aID):
+            content = self._get_item_page(urls.get_auction_url(aID))
+            return fromhtml(content, self.parser, self.instrumentation)
+
+    def _get_info_many(
+        self,
+        get_info: t.Callable[[str], Info],
+        fromhtml: t.Callable[[bytes, parsing.Parser, instrument.Instrumentation], Info],
+        aIDs: t.Iterable[str],
+        max_workers: int | None,
+        ordered: bool
+    ) -> t.Iterator[tuple[str, Info | Exception]]:
+        """Get information of `aIDs` by `get_info` concurrently, or fetch them and parse by `fromhtml`
+        in `parse_executor` if given."""
+        max_workers = max_workers or self.max_workers
+        if self.parse_executor is None:
+            return workers.bounded_map(get_info, aIDs, max_workers, ordered)
+        # Spans of parsing are not reported from the executor, which may be another process.
+        return workers.pipeline(
+            lambda aID: self._get_item_page(urls.get_auction_url(aID)),
+            functools.partial(_parse_info, fromhtml, self.parser),
+            aIDs,
+            max_workers,
+            self.parse_executor,
+            ordered=ordered
+        )
+
+    def _stream_item_page(
+        self,
+        url: str,
+        fromchunks: t.Callable[[t.Iterable[bytes]], Info],
+        attributes: dict[str, t.Any]
+    ) -> Info:
+        """Parse the item page of `url` by `fromchunks` while downloading it.
+
+        The rest of the body is dropped with the connection when `fromchunks` returns.
+        The body is transferred compressed as the session accepts gzip and deflate.
+        """
+        with self._get("http.item", url, stream=True) as response:
+            response.raise_for_status()
+            result = fromchunks(response.iter_content(self.stream_chunk_size))
+            attributes["bytes"] = response.raw.tell()
+            return result
+
+    def _get_item_page(self, url: str) -> bytes:
+        if self.http_cache is not None:
+            return self.http_cache.fetch(
+                url, lambda url, headers: self._get("http.item", url, headers=headers)
+            )
+        response = self._get("http.item", url)
+        response.raise_for_status()
+        return response.content
+
+
+_SELLING_PATTERN = r"^rsec:itm;slk:tc;"
+_CLOSED_PATTERN = r"^rsec:itm;slk:ttlc;"
+_AID_PATTERN = re.compile(r'(?<=/)\w+$')
+
+
+def _retry_after(response: requests.Response) -> float | None:
+    """Get `Retry-After` of `response` in second if given in second."""
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
 
 
-def _get_urls(cookies: dict[str, str], src_url: str, pattern: str | t.Pattern[str]) -> list[str]:
-    """Get product urls from `src_url`.
+def _parse_info(
+    fromhtml: t.Callable[[bytes, parsing.Parser, instrument.Instrumentation], Info],
+    parser: parsing.Parser,
+    content: bytes
+) -> Info:
+    """Parse an item page by `fromhtml`, which can be called in another process."""
+    return fromhtml(content, parser, instrument.Instrumentation())
 
-    Recursive.
+
+def _to_aIDs(urls: t.Iterable[str]) -> t.Iterator[str]:
+    """Get auction IDs from product urls."""
+    return (match[0] for match in map(_AID_PATTERN.search, urls) if match)
+
+
+def _parse_listing(
+    content: bytes | str,
+    pattern: str | t.Pattern[str],
+    parser: parsing.Parser = "lxml"
+) -> tuple[list[str], str | None]:
+    """Get product urls and the next page url from a listing page.
+
+    Parameters
+    ----------
+    content : bytes | str
+        The HTML of a Yahoo!Auction listing page.
+    pattern : str | Pattern[str]
+        The regular expression of `data-ylk` of product links.
+    parser : yahoo_auction_auto.parsing.Parser
+        The backend to parse `content`.
+
+    Returns
+    -------
+    urls : list[str]
+        URLs of products.
+    next_page : str | None
+        URL of next page if exists, else None.
     """
-    response = requests.get(src_url, cookies=cookies)
-    response.raise_for_status()
-    soup = bs4.BeautifulSoup(response.content, "lxml")
+    if parsing.check_parser(parser) == "lxml":
+        tree = parsing.fromstring(content)
+        return _get_links_tree(tree, pattern), _get_next_page_tree(tree)
+    soup = bs4.BeautifulSoup(content, "lxml")
+    return _get_links(soup, pattern), _get_next_page(soup)
+
+
+def _parse_summaries(
+    content: bytes | str,
+    pattern: str | t.Pattern[str],
+    parser: parsing.Parser = "lxml"
+) -> tuple[list[info.InfoSummary], str | None]:
+    """Get summaries of the rows of product links and the next page url from a listing page."""
+    if parsing.check_parser(parser) == "lxml":
+        tree = parsing.fromstring(content)
+        return info.summary.fromtree(tree, pattern), _get_next_page_tree(tree)
+    soup = bs4.BeautifulSoup(content, "lxml")
+    return info.summary.fromsoup(soup, pattern), _get_next_page(soup)
+
+
+def _get_links(soup: bs4.BeautifulSoup, pattern: str | t.Pattern[str]) -> list[str]:
+    """Get urls of links whose `data-ylk` matches `pattern` from `soup`."""
     urls: list[str] = []
-    for tag in soup.find_all("a", attrs={"data-ylk": pattern}):
+    for tag in soup.find_all("a", attrs={"data-ylk": re.compile(pattern)}):
         if isinstance(tag, bs4.Tag):
             if url := tag.get("href", None):
                 if isinstance(url, str):
                     urls.append(url)
                 elif isinstance(url, list):
                     urls.extend(url)
-    if next_page := _get_next_page(soup):
-        urls.extend(_get_urls(cookies, next_page, pattern))
     return urls
 
 
@@ -213,7 +849,7 @@ def _get_next_page(soup: bs4.BeautifulSoup) -> t.Optional[str]:
     str | None
         URL of next page if exists, else None.
     """
-    pattern = r'^rsec:pagination;slk:next;'
+    pattern = re.compile(r'^rsec:pagination;slk:next;')
     if next_page_tag := soup.find("a", attrs={"data-ylk": pattern}):
         if isinstance(next_page_tag, bs4.Tag):
             href = next_page_tag.get("href", None)
@@ -222,3 +858,48 @@ def _get_next_page(soup: bs4.BeautifulSoup) -> t.Optional[str]:
             else:
                 return href
     return None
+
+
+class _CancelNotDone(RuntimeError):
+    """A cancellation over HTTP which surely did not take effect."""
+
+
+_CANCEL_COMPLETED = "取り消しました"
+"""Text of the page shown when a cancellation is completed."""
+_XPATH_CANCEL_FORM = etree.XPath("//form[.//*[@name='confirm']]")
+
+
+def _get_cancel_form(tree: html.HtmlElement) -> html.FormElement | None:
+    """Get the form with `confirm` button from `tree` of a cancel page."""
+    for form in _XPATH_CANCEL_FORM(tree):
+        return form
+    return None
+
+
+_XPATH_LINKS = etree.XPath("//a[re:test(@data-ylk, $pattern)]/@href", namespaces=parsing.REGEXP_NAMESPACES)
+_XPATH_NEXT_PAGE = etree.XPath("(//a[starts-with(@data-ylk, 'rsec:pagination;slk:next;')])[1]/@href")
+
+
+def _get_links_tree(tree: html.HtmlElement, pattern: str | t.Pattern[str]) -> list[str]:
+    """Get urls of links whose `data-ylk` matches `pattern` from `tree`."""
+    if isinstance(pattern, re.Pattern):
+        pattern = pattern.pattern
+    return [str(url) for url in _XPATH_LINKS(tree, pattern=pattern) if url]
+
+
+def _get_next_page_tree(tree: html.HtmlElement) -> t.Optional[str]:
+    """Get the next page url from `tree`.
+
+    Parameters
+    ----------
+    tree : lxml.html.HtmlElement
+        The tree of a Yahoo!Auction page.
+
+    Returns
+    -------
+    str | None
+        URL of next page if exists, else None.
+    """
+    for href in _XPATH_NEXT_PAGE(tree):
+        return str(href)
+    return None